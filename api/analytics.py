@@ -0,0 +1,209 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from api.archive import iter_archive
+from api.db_sqlite import (
+    PROB_BUCKETS,
+    ROLLUP_GRAINS,
+    SCORE_BIN_WIDTH,
+    fetch_probability_buckets,
+    fetch_rollup_hist,
+    fetch_rollups,
+    fetch_score_rating_counts,
+)
+
+SCORE_MIN = 300
+SCORE_MAX = 900
+RATINGS = ["Poor", "Average", "Good", "Excellent", "Undefined"]
+DEFAULT_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+
+
+# -----------------------------------
+# Binning helpers
+# -----------------------------------
+def score_edges(bins: int = 6, edges: Optional[Sequence[int]] = None) -> List[int]:
+    """Explicit edges, or `bins` equal-width bins over the 300-900 score range."""
+    if edges:
+        edges = sorted(int(e) for e in edges)
+        if len(edges) < 2 or len(set(edges)) != len(edges):
+            raise ValueError("score_edges needs at least two distinct values")
+        return edges
+    if bins < 1:
+        raise ValueError("bins must be >= 1")
+    return [int(round(e)) for e in np.linspace(SCORE_MIN, SCORE_MAX, bins + 1)]
+
+
+def score_histogram(score_counts: Dict[int, int], edges: List[int]) -> List[Dict[str, Any]]:
+    """Bins are right-closed, first bin includes its lower edge (like pd.cut include_lowest)."""
+    counts = np.zeros(len(edges) - 1, dtype=np.int64)
+    for score, n in score_counts.items():
+        if score < edges[0] or score > edges[-1]:
+            continue
+        i = max(int(np.searchsorted(edges, score, side="left")) - 1, 0)
+        counts[i] += n
+    return [
+        {"bin": f"{lo}-{hi}", "lower": lo, "upper": hi, "count": int(c)}
+        for lo, hi, c in zip(edges[:-1], edges[1:], counts)
+    ]
+
+
+def bucket_quantiles(counts: np.ndarray, quantiles: Sequence[float]) -> Dict[str, Optional[float]]:
+    """Quantiles of [0, 1] values from equal-width bucket counts (linear within a bucket)."""
+    total = int(counts.sum())
+    if total == 0:
+        return {str(q): None for q in quantiles}
+
+    width = 1.0 / len(counts)
+    cum = np.cumsum(counts)
+    out = {}
+    for q in quantiles:
+        target = float(q) * total
+        i = min(int(np.searchsorted(cum, target, side="left")), len(counts) - 1)
+        before = float(cum[i - 1]) if i > 0 else 0.0
+        frac = (target - before) / counts[i] if counts[i] else 0.0
+        out[str(q)] = round(min(max((i + frac) * width, 0.0), 1.0), 6)
+    return out
+
+
+# -----------------------------------
+# Rollup planning
+# -----------------------------------
+def _as_utc(ts: Optional[Union[str, datetime]]) -> Optional[datetime]:
+    if ts is None:
+        return None
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts)
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def _key(grain: str, ts: Optional[datetime]) -> Optional[str]:
+    return None if ts is None else ts.isoformat()[: ROLLUP_GRAINS[grain]]
+
+
+def rollup_parts(
+    since: Optional[Union[str, datetime]] = None,
+    until: Optional[Union[str, datetime]] = None,
+) -> Optional[List[tuple]]:
+    """
+    Split [since, until) into (grain, lo, hi) bucket ranges: whole days from
+    the daily rollup, the ragged ends from the hourly one. None when a bound
+    is not on an hour boundary (the raw table has to answer that).
+    """
+    s, u = _as_utc(since), _as_utc(until)
+    if any(t is not None and (t.minute or t.second or t.microsecond) for t in (s, u)):
+        return None
+    if s is not None and u is not None and s >= u:
+        return []
+
+    day_lo = s if s is None or s.hour == 0 else s.replace(hour=0) + timedelta(days=1)
+    day_hi = u if u is None else u.replace(hour=0)
+    if day_lo is not None and day_hi is not None and day_lo >= day_hi:
+        return [("hour", _key("hour", s), _key("hour", u))]
+
+    parts = []
+    if s is not None and s < day_lo:
+        parts.append(("hour", _key("hour", s), _key("hour", day_lo)))
+    parts.append(("day", _key("day", day_lo), _key("day", day_hi)))
+    if u is not None and day_hi < u:
+        parts.append(("hour", _key("hour", day_hi), _key("hour", u)))
+    return parts
+
+
+def _from_rollups(parts: List[tuple]) -> tuple:
+    rating_counts: Dict[str, int] = {}
+    score_counts: Dict[int, int] = {}
+    prob_counts = np.zeros(PROB_BUCKETS, dtype=np.int64)
+    for grain, lo, hi in parts:
+        hist = fetch_rollup_hist(grain, lo, hi)
+        for rating, n in hist["rating"].items():
+            rating_counts[rating] = rating_counts.get(rating, 0) + n
+        for score, n in hist["score"].items():
+            score_counts[int(score)] = score_counts.get(int(score), 0) + n
+        for bucket, n in hist["prob"].items():
+            prob_counts[int(bucket)] += n
+    return rating_counts, score_counts, prob_counts
+
+
+def _from_raw(since: Any, until: Any) -> tuple:
+    rating_counts: Dict[str, int] = {}
+    score_counts: Dict[int, int] = {}
+    for row in fetch_score_rating_counts(since, until):
+        rating_counts[row["rating"]] = rating_counts.get(row["rating"], 0) + int(row["n"])
+        score = int(row["credit_score"])
+        score_counts[score] = score_counts.get(score, 0) + int(row["n"])
+    prob_counts = fetch_probability_buckets(since, until)
+
+    # rows moved out by the retention job (only partitions in range are opened)
+    for df in iter_archive(since, until, columns=["rating", "credit_score", "default_probability"]):
+        for rating, n in df["rating"].value_counts().items():
+            rating_counts[rating] = rating_counts.get(rating, 0) + int(n)
+        for score, n in df["credit_score"].value_counts().items():
+            score_counts[int(score)] = score_counts.get(int(score), 0) + int(n)
+        buckets = (df["default_probability"].to_numpy() * PROB_BUCKETS).astype(np.int64)
+        prob_counts += np.bincount(np.clip(buckets, 0, PROB_BUCKETS - 1), minlength=PROB_BUCKETS)
+    return rating_counts, score_counts, prob_counts
+
+
+# -----------------------------------
+# Dashboard summary
+# -----------------------------------
+def compute_analytics(
+    since: Optional[Union[str, datetime]] = None,
+    until: Optional[Union[str, datetime]] = None,
+    bins: int = 6,
+    edges: Optional[Sequence[int]] = None,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+) -> Dict[str, Any]:
+    """
+    Rating counts, score histogram and probability quantiles over [since, until).
+
+    Hour-aligned ranges with score edges on 10-point boundaries (starting at
+    or below 300) are answered from the rollup tables; anything else is aggregated from the raw table
+    in SQL (GROUP BY rating/score and a fixed probability histogram). Either
+    way the response size does not grow with traffic.
+    """
+    if any(not 0.0 <= float(q) <= 1.0 for q in quantiles):
+        raise ValueError("quantiles must be between 0 and 1")
+    edges = score_edges(bins, edges)
+
+    parts = rollup_parts(since, until)
+    # rollup score key k holds (k - 10, k]: the first bin's closed lower edge
+    # can only be told apart from the scores just below it at SCORE_MIN
+    use_rollups = (
+        parts is not None
+        and all(e % SCORE_BIN_WIDTH == 0 for e in edges)
+        and edges[0] <= SCORE_MIN
+    )
+    if use_rollups:
+        found_ratings, score_counts, prob_counts = _from_rollups(parts)
+    else:
+        found_ratings, score_counts, prob_counts = _from_raw(since, until)
+    rating_counts = {r: 0 for r in RATINGS}
+    rating_counts.update(found_ratings)
+
+    return {
+        "since": since.isoformat() if isinstance(since, datetime) else since,
+        "until": until.isoformat() if isinstance(until, datetime) else until,
+        "source": "rollup" if use_rollups else "raw",
+        "count": int(sum(score_counts.values())),
+        "rating_counts": rating_counts,
+        "score_histogram": score_histogram(score_counts, edges),
+        "probability_quantiles": bucket_quantiles(prob_counts, quantiles),
+        "probability_resolution": 1.0 / PROB_BUCKETS,
+    }
+
+
+def compute_trend(
+    grain: str = "day",
+    since: Optional[Union[str, datetime]] = None,
+    until: Optional[Union[str, datetime]] = None,
+    limit: int = 1000,
+) -> List[Dict[str, Any]]:
+    """Per-bucket count, probability mean/std and rating counts, read only from rollups."""
+    if grain not in ROLLUP_GRAINS:
+        raise ValueError(f"grain must be one of {sorted(ROLLUP_GRAINS)}")
+    return fetch_rollups(grain, _key(grain, _as_utc(since)), _key(grain, _as_utc(until)), limit=limit)
@@ -0,0 +1,205 @@
+import importlib.util
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Union
+
+from api.db_sqlite import (
+    ARCHIVE_COLUMNS,
+    BASE_DIR,
+    PREDICTION_COLUMNS,
+    delete_predictions,
+    fetch_predictions_before,
+    fetch_predictions_range,
+    utc_iso,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# pyarrow is optional and only imported once the archive is actually used
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+JOB_NAME = "prediction-retention"
+
+logger = logging.getLogger(__name__)
+
+
+# -----------------------------------
+# Archive Location / Layout
+# -----------------------------------
+# data/archive/date=YYYY-MM-DD/part-<first id>-<last id>.parquet
+ARCHIVE_DIR = BASE_DIR / "data" / "archive"
+COMPRESSION = "zstd"
+
+_ARROW_TYPES = {"INTEGER": "int64", "REAL": "float64", "TEXT": "string"}
+
+
+def _arrow():
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError("pyarrow is required for the prediction archive (pip install pyarrow)")
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    return pa, ds, pq
+
+
+def _schema(pa: Any) -> Any:
+    # partitions written before input_json was archived read it as null
+    return pa.schema([(name, _ARROW_TYPES[decl]) for name, decl in ARCHIVE_COLUMNS.items()])
+
+
+def _partition_files(archive_dir: Path) -> List[Path]:
+    return sorted(archive_dir.glob("date=*/*.parquet")) if archive_dir.exists() else []
+
+
+def has_archive(archive_dir: Optional[Path] = None) -> bool:
+    return bool(_partition_files(Path(archive_dir or ARCHIVE_DIR)))
+
+
+# -----------------------------------
+# Writing
+# -----------------------------------
+def write_partition(df: "pd.DataFrame", date: str, archive_dir: Optional[Path] = None) -> Path:
+    """Write one day's rows as a compressed Parquet file (atomic rename)."""
+    pa, _, pq = _arrow()
+    archive_dir = Path(archive_dir or ARCHIVE_DIR)
+    out_dir = archive_dir / f"date={date}"
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # named after the id range, so re-running an interrupted batch overwrites it
+    out = out_dir / f"part-{int(df['id'].min())}-{int(df['id'].max())}.parquet"
+    tmp = out.with_suffix(".parquet.tmp")
+    table = pa.Table.from_pandas(df[list(ARCHIVE_COLUMNS)], schema=_schema(pa), preserve_index=False)
+    pq.write_table(table, tmp, compression=COMPRESSION)
+    os.replace(tmp, out)
+    return out
+
+
+def archive_predictions(
+    cutoff: Union[str, datetime],
+    batch_rows: int = 50_000,
+    archive_dir: Optional[Path] = None,
+    vacuum_pages: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Move every prediction created before `cutoff` into the archive.
+
+    Works in batches of `batch_rows`: files are written first, then the rows
+    are deleted and their pages released, so space comes back a batch at a time
+    and a crash never loses rows.
+    """
+    _arrow()
+    archived, files = 0, 0
+    while True:
+        df = fetch_predictions_before(cutoff, limit=batch_rows)
+        if df.empty:
+            break
+        for date, part in df.groupby(df["created_at"].str[:10], sort=True):
+            write_partition(part, date, archive_dir)
+            files += 1
+        delete_predictions(df["id"].tolist(), vacuum_pages=vacuum_pages)
+        archived += len(df)
+    return {"archived": archived, "files": files}
+
+
+def run_retention(
+    max_age_days: float,
+    batch_rows: int = 50_000,
+    archive_dir: Optional[Path] = None,
+) -> Optional[Dict[str, Any]]:
+    """Retention job: archive predictions older than `max_age_days`."""
+    if not PARQUET_AVAILABLE:
+        logger.warning("pyarrow not installed, skipping prediction retention")
+        return None
+
+    start = time.perf_counter()
+    cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+    result = archive_predictions(cutoff, batch_rows=batch_rows, archive_dir=archive_dir)
+    if not result["archived"]:
+        return None
+    return {**result, "cutoff": cutoff.isoformat(), "duration_ms": (time.perf_counter() - start) * 1000}
+
+
+# -----------------------------------
+# Reading (lazy, column-projected)
+# -----------------------------------
+def iter_archive(
+    since: Optional[Union[str, datetime]] = None,
+    until: Optional[Union[str, datetime]] = None,
+    columns: Optional[List[str]] = None,
+    archive_dir: Optional[Path] = None,
+    batch_size: int = 65_536,
+) -> Iterator["pd.DataFrame"]:
+    """
+    Archived predictions in [since, until) as DataFrame batches.
+
+    Only partitions whose date overlaps the range are opened and only
+    `columns` are read from them (PREDICTION_COLUMNS by default; ask for
+    "input_json" to get the raw requests).
+    """
+    archive_dir = Path(archive_dir or ARCHIVE_DIR)
+    if not _partition_files(archive_dir):
+        return
+    pa, ds, _ = _arrow()
+
+    columns = list(columns or PREDICTION_COLUMNS)
+    dataset = ds.dataset(
+        archive_dir,
+        format="parquet",
+        schema=_schema(pa).append(pa.field("date", pa.string())),
+        partitioning=ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive"),
+    )
+
+    expr = None
+    if since is not None:
+        since = utc_iso(since)
+        expr = (ds.field("date") >= since[:10]) & (ds.field("created_at") >= since)
+    if until is not None:
+        until = utc_iso(until)
+        bound = (ds.field("date") <= until[:10]) & (ds.field("created_at") < until)
+        expr = bound if expr is None else expr & bound
+
+    for batch in dataset.to_batches(columns=columns, filter=expr, batch_size=batch_size):
+        if batch.num_rows:
+            yield batch.to_pandas()
+
+
+def read_archive(
+    since: Optional[Union[str, datetime]] = None,
+    until: Optional[Union[str, datetime]] = None,
+    columns: Optional[List[str]] = None,
+    archive_dir: Optional[Path] = None,
+) -> "pd.DataFrame":
+    import pandas as pd
+
+    columns = list(columns or PREDICTION_COLUMNS)
+    frames = list(iter_archive(since, until, columns, archive_dir))
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_predictions(
+    since: Optional[Union[str, datetime]] = None,
+    until: Optional[Union[str, datetime]] = None,
+    columns: Optional[List[str]] = None,
+    archive_dir: Optional[Path] = None,
+) -> "pd.DataFrame":
+    """Archived + live predictions in [since, until), oldest first (for drift / replay)."""
+    columns = list(columns or PREDICTION_COLUMNS)
+    # id is read too, so a batch caught between archive write and delete is not counted twice
+    read_cols = ["created_at", "id"] + [c for c in columns if c not in ("created_at", "id")]
+
+    live = fetch_predictions_range(since, until, read_cols)
+    old = read_archive(since, until, read_cols, archive_dir)
+    if old.empty:
+        df = live
+    else:
+        import pandas as pd
+
+        df = pd.concat([old, live], ignore_index=True).drop_duplicates("id", keep="last")
+    return df.sort_values(["created_at", "id"], kind="stable")[columns].reset_index(drop=True)
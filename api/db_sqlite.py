@@ -1,7 +1,20 @@
+import base64
 import json
 import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Literal, Optional, Union, get_args, get_origin
+
+import numpy as np
+
+from api.drift_monitor import DRIFT_COLUMNS, encode_drift_rows
+from api.schemas import PredictRequest
+
+if TYPE_CHECKING:
+    import pandas as pd  # imported on first use: not needed to serve predictions
 
 # -----------------------------------
 # Database Location
@@ -9,23 +22,193 @@ from typing import Any, Dict, List
 BASE_DIR = Path(__file__).resolve().parents[1]
 DB_PATH = BASE_DIR / "data" / "predictions.db"
 
+# drift accumulators keep a snapshot of their running totals every N predictions
+DRIFT_SNAPSHOT_EVERY = 100
+# largest `last_n` fetch_drift_window accepts; older snapshots are deleted
+DRIFT_MAX_WINDOW = 10_000
+
+
+def _sql_type(annotation: Any) -> str:
+    if get_origin(annotation) is Literal:
+        return "TEXT"
+    return "INTEGER" if annotation is int else "REAL"
+
+
+# one typed column per request field, plus the engineered ratio
+INPUT_COLUMNS: Dict[str, str] = {
+    name: _sql_type(field.annotation) for name, field in PredictRequest.model_fields.items()
+}
+INPUT_COLUMNS["loan_to_income"] = "REAL"
+
+# everything a replayed prediction needs (read these by default)
+PREDICTION_COLUMNS: Dict[str, str] = {
+    "id": "INTEGER",
+    "prediction_uid": "TEXT",
+    "created_at": "TEXT",
+    "default_probability": "REAL",
+    "credit_score": "INTEGER",
+    "rating": "TEXT",
+    **INPUT_COLUMNS,
+}
+
+# what the archive keeps: also the raw request, the audit copy of each input
+# (and the only one for legacy rows whose typed columns are NULL)
+ARCHIVE_COLUMNS: Dict[str, str] = {**PREDICTION_COLUMNS, "input_json": "TEXT"}
+
 
 # -----------------------------------
 # Connection Helper
 # -----------------------------------
-def get_conn() -> sqlite3.Connection:
+# WAL lets readers run while the single writer commits; NORMAL sync is
+# durable across app crashes (only an OS crash can lose the last commits).
+PRAGMAS = {
+    # only takes effect on a new database (before its first table); lets the
+    # retention job hand freed pages back to the OS a few at a time. Setting
+    # it takes the write lock, so readers skip it (see get_conn)
+    "auto_vacuum": "INCREMENTAL",
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -32_000,  # KiB (negative = size, not pages)
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5_000,  # ms, for writers in other worker processes
+}
+
+# sqlite3 keeps this many prepared statements per connection, keyed by SQL text
+STATEMENT_CACHE_SIZE = 256
+
+
+class _Connection(sqlite3.Connection):
+    # a Python subclass, so _Connections can hold readers in a WeakSet
+    pass
+
+
+def get_conn(writer: bool = True) -> sqlite3.Connection:
+    """
+    Open a new tuned connection (scripts / one-off use; the API reuses
+    connections). `writer=False` leaves out auto_vacuum, which would wait
+    for an open write transaction instead of reading the WAL snapshot.
+    """
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    conn = sqlite3.connect(
+        DB_PATH,
+        check_same_thread=False,
+        timeout=PRAGMAS["busy_timeout"] / 1000,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        factory=_Connection,
+    )
     conn.row_factory = sqlite3.Row
+    for name, value in PRAGMAS.items():
+        if name == "auto_vacuum" and not writer:
+            continue
+        conn.execute(f"PRAGMA {name}={value}")
     return conn
 
 
+class _Connections:
+    """
+    Long-lived connections for one database file: a single writer shared
+    by all threads (serialized by a lock) and one reader per thread.
+
+    A reader is only referenced by its thread's local storage (the set here
+    is weak), so it is closed when the thread exits, e.g. an idle AnyIO
+    threadpool worker, instead of staying open until shutdown.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._write_lock = threading.Lock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._local = threading.local()
+        self._readers: "weakref.WeakSet[sqlite3.Connection]" = weakref.WeakSet()
+        self._readers_lock = threading.Lock()
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = get_conn()
+            with self._writer:  # commit on success, rollback on error
+                yield self._writer
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = get_conn(writer=False)
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.add(conn)
+        yield conn
+
+    def close(self) -> None:
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        with self._readers_lock:
+            for conn in list(self._readers):
+                conn.close()
+            self._readers.clear()
+        self._local = threading.local()
+
+
+_connections: Optional[_Connections] = None
+_connections_lock = threading.Lock()
+
+
+def _pool() -> _Connections:
+    global _connections
+    with _connections_lock:
+        if _connections is None or _connections.path != DB_PATH:
+            if _connections is not None:
+                _connections.close()
+            _connections = _Connections(DB_PATH)
+        return _connections
+
+
+def write_conn():
+    """Context manager: the shared writer connection, committed on exit."""
+    return _pool().write()
+
+
+def read_conn():
+    """Context manager: this thread's reader connection."""
+    return _pool().read()
+
+
+def close_connections() -> None:
+    global _connections
+    with _connections_lock:
+        if _connections is not None:
+            _connections.close()
+            _connections = None
+
+
+def _add_missing_columns(conn: sqlite3.Connection, table: str, columns: Dict[str, str]) -> None:
+    # lightweight migration for databases created by older versions
+    existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+    for name, decl in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
+
+# probability histograms (analytics quantiles) use fixed-width buckets
+PROB_BUCKETS = 100
+
+# columns /logs reads, stored in its indexes so pages never touch the table
+_LOG_INDEX_TAIL = "credit_score, default_probability, prediction_uid"
+
+# stored in PRAGMA user_version once init_db has run the data migrations
+# (typed-column backfill); bump it when adding one
+SCHEMA_VERSION = 1
+
+
 # -----------------------------------
 # Initialize Tables
 # -----------------------------------
 def init_db() -> None:
-    conn = get_conn()
-    try:
+    with write_conn() as conn:
         # Predictions table
         conn.execute(
             """
@@ -35,10 +218,24 @@ def init_db() -> None:
                 input_json TEXT NOT NULL,
                 default_probability REAL NOT NULL,
                 credit_score INTEGER NOT NULL,
-                rating TEXT NOT NULL
+                rating TEXT NOT NULL,
+                prediction_uid TEXT
             )
             """
         )
+        _add_missing_columns(conn, "predictions", {"prediction_uid": "TEXT", **INPUT_COLUMNS})
+        conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_predictions_uid ON predictions (prediction_uid)"
+        )
+        # covering indexes for /logs: newest-first keyset scans by time, optionally per rating
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_predictions_created "
+            f"ON predictions (created_at, id, rating, {_LOG_INDEX_TAIL})"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_predictions_rating "
+            f"ON predictions (rating, created_at, id, {_LOG_INDEX_TAIL})"
+        )
 
         # Drift reports table
         conn.execute(
@@ -49,91 +246,423 @@ def init_db() -> None:
                 model_version TEXT NOT NULL,
                 z_threshold REAL NOT NULL,
                 drifted_features_count INTEGER NOT NULL,
-                report_json TEXT NOT NULL
+                report_json TEXT NOT NULL,
+                window_size INTEGER,
+                duration_ms REAL
             )
             """
         )
+        _add_missing_columns(conn, "drift_reports", {"window_size": "INTEGER", "duration_ms": "REAL"})
 
-        conn.commit()
-    finally:
-        conn.close()
+        # One row per background job: lease holder + when it last ran
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS job_leases (
+                name TEXT PRIMARY KEY,
+                owner TEXT,
+                expires_at REAL NOT NULL DEFAULT 0,
+                last_run_at REAL NOT NULL DEFAULT 0,
+                last_run_count INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+
+        # Running drift totals over all predictions (single row) + periodic snapshots
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS drift_accumulator (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                n_predictions INTEGER NOT NULL,
+                columns_json TEXT NOT NULL,
+                sums BLOB NOT NULL,
+                sumsqs BLOB NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS drift_snapshots (
+                n_predictions INTEGER PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                columns_json TEXT NOT NULL,
+                sums BLOB NOT NULL,
+                sumsqs BLOB NOT NULL
+            )
+            """
+        )
+
+        # Hourly / daily prediction metrics, kept current on every insert
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS prediction_rollups (
+                grain TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                n INTEGER NOT NULL,
+                sum_p REAL NOT NULL,
+                sumsq_p REAL NOT NULL,
+                PRIMARY KEY (grain, bucket)
+            ) WITHOUT ROWID
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS prediction_rollup_hist (
+                grain TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                key NOT NULL,
+                n INTEGER NOT NULL,
+                PRIMARY KEY (grain, bucket, kind, key)
+            ) WITHOUT ROWID
+            """
+        )
+
+    with read_conn() as conn:
+        schema_version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if schema_version < SCHEMA_VERSION:
+        # one-time migrations; a database at SCHEMA_VERSION skips the scans
+        backfill_input_columns()
+        with write_conn() as conn:
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    if _load_accumulator_from(read_conn) is None and _has_history():
+        rebuild_drift_accumulator()
+
+    with read_conn() as conn:
+        has_rollups = conn.execute("SELECT 1 FROM prediction_rollups LIMIT 1").fetchone() is not None
+    if not has_rollups and _has_history():
+        rebuild_rollups()
+
+
+def _has_history() -> bool:
+    from api.archive import has_archive  # api.archive imports this module
+
+    return get_prediction_count() > 0 or has_archive()
+
+
+def _archived_batches(
+    conn: sqlite3.Connection, columns: List[str], archive_dir: Optional[Path] = None
+) -> Iterator["pd.DataFrame"]:
+    """
+    Archived predictions for the rebuilds, oldest partition first, sorted by
+    id. Rows still in `predictions` too (retention stopped between writing
+    a batch and deleting it) are skipped; the live table counts them.
+    """
+    from api.archive import iter_archive
+
+    for df in iter_archive(columns=["id", *[c for c in columns if c != "id"]], archive_dir=archive_dir):
+        df = df.sort_values("id", kind="stable")
+        lo, hi = int(df["id"].iloc[0]), int(df["id"].iloc[-1])
+        live = [r[0] for r in conn.execute("SELECT id FROM predictions WHERE id BETWEEN ? AND ?", (lo, hi))]
+        if live:
+            df = df[~df["id"].isin(live)]
+        if len(df):
+            yield df
+
+
+def _complete_input_sql() -> str:
+    """SQL condition: input_json holds every request field (categoricals within their Literal values)."""
+    checks = []
+    for name, field in PredictRequest.model_fields.items():
+        value = f"json_extract(input_json, '$.{name}')"
+        if get_origin(field.annotation) is Literal:
+            allowed = ", ".join(f"'{v}'" for v in get_args(field.annotation))
+            checks.append(f"{value} IN ({allowed})")
+        else:
+            checks.append(f"{value} IS NOT NULL")
+    return " AND ".join(checks)
+
+
+def backfill_input_columns(chunk_size: int = 10_000) -> int:
+    """
+    Copy fields out of `input_json` into the typed columns for older rows.
+    Rows whose `input_json` is not valid JSON are left NULL (json_extract
+    would raise on them). `loan_to_income` is only set when every field is
+    present, so a NULL there marks a row the drift statistics must skip.
+    """
+    extract = ", ".join(f"{c} = json_extract(input_json, '$.{c}')" for c in PredictRequest.model_fields)
+    total = 0
+    last_id = 0
+    while True:
+        # small transactions so a large backfill never blocks writers for long
+        with write_conn() as conn:
+            ids = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT id FROM predictions WHERE id > ? AND loan_to_income IS NULL ORDER BY id LIMIT ?",
+                    (last_id, int(chunk_size)),
+                )
+            ]
+            if not ids:
+                return total
+            cur = conn.execute(
+                f"""
+                UPDATE predictions
+                SET {extract},
+                    loan_to_income = CASE WHEN {_complete_input_sql()} THEN
+                        CASE
+                            WHEN json_extract(input_json, '$.income') > 0
+                            THEN CAST(json_extract(input_json, '$.loan_amount') AS REAL)
+                                 / json_extract(input_json, '$.income')
+                            ELSE 0.0
+                        END
+                    END
+                WHERE id BETWEEN ? AND ? AND loan_to_income IS NULL AND json_valid(input_json)
+                """,
+                (ids[0], ids[-1]),
+            )
+        last_id = ids[-1]
+        total += cur.rowcount
 
 
 # -----------------------------------
 # Prediction Logging
 # -----------------------------------
+_INSERT_PREDICTION_SQL = f"""
+    INSERT INTO predictions
+    (created_at, input_json, default_probability, credit_score, rating, prediction_uid,
+     {", ".join(INPUT_COLUMNS)})
+    VALUES ({", ".join("?" * (6 + len(INPUT_COLUMNS)))})
+"""
+
+
+def _prediction_values(
+    created_at: str,
+    payload: Dict[str, Any],
+    default_probability: float,
+    credit_score: int,
+    rating: str,
+    prediction_id: Optional[str],
+) -> tuple:
+    income = float(payload["income"])
+    loan_to_income = (float(payload["loan_amount"]) / income) if income > 0 else 0.0
+    return (
+        created_at,
+        json.dumps(payload),  # kept as the audit copy of the request
+        float(default_probability),
+        int(credit_score),
+        str(rating),
+        prediction_id,
+        *(payload[c] for c in PredictRequest.model_fields),
+        loan_to_income,
+    )
+
+
 def insert_prediction(
     created_at: str,
     payload: Dict[str, Any],
     default_probability: float,
     credit_score: int,
     rating: str,
+    prediction_id: Optional[str] = None,
 ) -> int:
-    conn = get_conn()
-    try:
+    with write_conn() as conn:
         cur = conn.execute(
-            """
-            INSERT INTO predictions 
-            (created_at, input_json, default_probability, credit_score, rating)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (
-                created_at,
-                json.dumps(payload),
-                float(default_probability),
-                int(credit_score),
-                str(rating),
-            ),
+            _INSERT_PREDICTION_SQL,
+            _prediction_values(created_at, payload, default_probability, credit_score, rating, prediction_id),
         )
-        conn.commit()
+        _accumulate_drift(conn, [payload], created_at)
+        _accumulate_rollups(conn, [(created_at, float(default_probability), int(credit_score), str(rating))])
         return int(cur.lastrowid)
-    finally:
-        conn.close()
 
 
-def fetch_logs(limit: int = 20) -> List[Dict[str, Any]]:
-    conn = get_conn()
+def insert_predictions(rows: List[Dict[str, Any]]) -> int:
+    """
+    Log many predictions with one executemany and one commit.
+    Each row has the same keys as `insert_prediction` arguments.
+    Returns the number of rows written.
+    """
+    with write_conn() as conn:
+        conn.executemany(
+            _INSERT_PREDICTION_SQL,
+            [
+                _prediction_values(
+                    row["created_at"],
+                    row["payload"],
+                    row["default_probability"],
+                    row["credit_score"],
+                    row["rating"],
+                    row.get("prediction_id"),
+                )
+                for row in rows
+            ],
+        )
+        if rows:
+            _accumulate_drift(conn, [row["payload"] for row in rows], rows[-1]["created_at"])
+            _accumulate_rollups(
+                conn,
+                [
+                    (row["created_at"], float(row["default_probability"]), int(row["credit_score"]), str(row["rating"]))
+                    for row in rows
+                ],
+            )
+        return len(rows)
+
+
+def utc_iso(ts: Union[str, datetime]) -> str:
+    # created_at is stored as UTC isoformat, so bounds must use the same form
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts)
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc).isoformat()
+
+
+def encode_log_cursor(created_at: str, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at}|{row_id}".encode()).decode()
+
+
+def decode_log_cursor(cursor: str) -> tuple:
     try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+        return created_at, int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def fetch_logs_page(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    since: Optional[Union[str, datetime]] = None,
+    until: Optional[Union[str, datetime]] = None,
+    rating: Optional[str] = None,
+    min_score: Optional[int] = None,
+    max_score: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    One page of logs, newest first.
+
+    Keyset pagination on (created_at, id): `cursor` is the `next_cursor` of the
+    previous page, so every page is an index range scan whatever its depth.
+    `since` is inclusive, `until` exclusive.
+    """
+    where: List[str] = []
+    params: List[Any] = []
+    if cursor:
+        where.append("(created_at, id) < (?, ?)")
+        params += decode_log_cursor(cursor)
+    if since is not None:
+        where.append("created_at >= ?")
+        params.append(utc_iso(since))
+    if until is not None:
+        where.append("created_at < ?")
+        params.append(utc_iso(until))
+    if rating is not None:
+        where.append("rating = ?")
+        params.append(rating)
+    if min_score is not None:
+        where.append("credit_score >= ?")
+        params.append(int(min_score))
+    if max_score is not None:
+        where.append("credit_score <= ?")
+        params.append(int(max_score))
+
+    index = "idx_predictions_rating" if rating is not None else "idx_predictions_created"
+    with read_conn() as conn:
         cur = conn.execute(
-            """
-            SELECT id, created_at, default_probability, credit_score, rating
-            FROM predictions
-            ORDER BY id DESC
+            f"""
+            SELECT id, prediction_uid, created_at, default_probability, credit_score, rating
+            FROM predictions INDEXED BY {index}
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY created_at DESC, id DESC
             LIMIT ?
             """,
-            (int(limit),),
+            (*params, int(limit)),
         )
         rows = cur.fetchall()
-        return [
-            {
-                "prediction_id": f"sqlite-{row['id']}",
-                "timestamp": row["created_at"],
-                "default_probability": row["default_probability"],
-                "credit_score": row["credit_score"],
-                "rating": row["rating"],
-            }
-            for row in rows
-        ]
-    finally:
-        conn.close()
+
+    items = [
+        {
+            "prediction_id": row["prediction_uid"] or f"sqlite-{row['id']}",
+            "timestamp": row["created_at"],
+            "default_probability": row["default_probability"],
+            "credit_score": row["credit_score"],
+            "rating": row["rating"],
+        }
+        for row in rows
+    ]
+    next_cursor = None
+    if rows and len(rows) == int(limit):
+        next_cursor = encode_log_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def fetch_logs(limit: int = 20, **filters: Any) -> List[Dict[str, Any]]:
+    return fetch_logs_page(limit=limit, **filters)["items"]
+
+
+def _time_range(since: Optional[Union[str, datetime]], until: Optional[Union[str, datetime]]) -> tuple:
+    where, params = [], []
+    if since is not None:
+        where.append("created_at >= ?")
+        params.append(utc_iso(since))
+    if until is not None:
+        where.append("created_at < ?")
+        params.append(utc_iso(until))
+    return ("WHERE " + " AND ".join(where) if where else ""), params
+
+
+def fetch_score_rating_counts(
+    since: Optional[Union[str, datetime]] = None,
+    until: Optional[Union[str, datetime]] = None,
+) -> List[Dict[str, Any]]:
+    """Prediction counts grouped by (rating, credit_score) in [since, until)."""
+    where, params = _time_range(since, until)
+    with read_conn() as conn:
+        cur = conn.execute(
+            f"""
+            SELECT rating, credit_score, COUNT(*) AS n
+            FROM predictions INDEXED BY idx_predictions_created
+            {where}
+            GROUP BY rating, credit_score
+            """,
+            params,
+        )
+        return [dict(row) for row in cur.fetchall()]
+
+
+def fetch_probability_buckets(
+    since: Optional[Union[str, datetime]] = None,
+    until: Optional[Union[str, datetime]] = None,
+) -> np.ndarray:
+    """Counts of default_probability in PROB_BUCKETS equal-width buckets over [0, 1]."""
+    where, params = _time_range(since, until)
+    with read_conn() as conn:
+        cur = conn.execute(
+            f"""
+            SELECT MIN(CAST(default_probability * {PROB_BUCKETS} AS INTEGER), {PROB_BUCKETS - 1}) AS bucket,
+                   COUNT(*) AS n
+            FROM predictions INDEXED BY idx_predictions_created
+            {where}
+            GROUP BY bucket
+            """,
+            params,
+        )
+        rows = cur.fetchall()
+    counts = np.zeros(PROB_BUCKETS, dtype=np.int64)
+    for row in rows:
+        counts[max(int(row["bucket"]), 0)] += int(row["n"])
+    return counts
 
 
 def get_prediction_count() -> int:
-    conn = get_conn()
-    try:
+    with read_conn() as conn:
         cur = conn.execute("SELECT COUNT(*) as cnt FROM predictions")
         row = cur.fetchone()
         return int(row["cnt"])
-    finally:
-        conn.close()
 
 
-def fetch_prediction_inputs(limit: int = 100) -> List[Dict[str, Any]]:
-    conn = get_conn()
-    try:
+def fetch_prediction_inputs(limit: int = 100, columns: Optional[List[str]] = None) -> "pd.DataFrame":
+    """Latest logged inputs (newest first) straight from the typed columns."""
+    columns = list(columns or INPUT_COLUMNS)
+    unknown = set(columns) - set(INPUT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown input columns: {sorted(unknown)}")
+
+    with read_conn() as conn:
         cur = conn.execute(
-            """
-            SELECT input_json
+            f"""
+            SELECT {", ".join(columns)}
             FROM predictions
             ORDER BY id DESC
             LIMIT ?
@@ -141,9 +670,430 @@ def fetch_prediction_inputs(limit: int = 100) -> List[Dict[str, Any]]:
             (int(limit),),
         )
         rows = cur.fetchall()
-        return [json.loads(row["input_json"]) for row in rows]
-    finally:
-        conn.close()
+    import pandas as pd
+
+    return pd.DataFrame.from_records(rows, columns=columns)
+
+
+def _check_columns(columns: Optional[List[str]]) -> List[str]:
+    columns = list(columns or PREDICTION_COLUMNS)
+    unknown = set(columns) - set(ARCHIVE_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown prediction columns: {sorted(unknown)}")
+    return columns
+
+
+def fetch_predictions_range(
+    since: Optional[Union[str, datetime]] = None,
+    until: Optional[Union[str, datetime]] = None,
+    columns: Optional[List[str]] = None,
+) -> "pd.DataFrame":
+    """Live (not yet archived) predictions in [since, until), oldest first."""
+    columns = _check_columns(columns)
+    where, params = _time_range(since, until)
+    with read_conn() as conn:
+        cur = conn.execute(
+            f"""
+            SELECT {", ".join(columns)}
+            FROM predictions
+            {where}
+            ORDER BY created_at, id
+            """,
+            params,
+        )
+        rows = cur.fetchall()
+    import pandas as pd
+
+    return pd.DataFrame.from_records(rows, columns=columns)
+
+
+def fetch_predictions_before(cutoff: Union[str, datetime], limit: int = 50_000) -> "pd.DataFrame":
+    """The oldest `limit` predictions created before `cutoff` (all ARCHIVE_COLUMNS)."""
+    columns = list(ARCHIVE_COLUMNS)
+    with read_conn() as conn:
+        cur = conn.execute(
+            f"""
+            SELECT {", ".join(columns)}
+            FROM predictions
+            WHERE created_at < ?
+            ORDER BY created_at, id
+            LIMIT ?
+            """,
+            (utc_iso(cutoff), int(limit)),
+        )
+        rows = cur.fetchall()
+    import pandas as pd
+
+    return pd.DataFrame.from_records(rows, columns=columns)
+
+
+def delete_predictions(ids: List[int], vacuum_pages: Optional[int] = None) -> int:
+    """
+    Delete rows by id, then release up to `vacuum_pages` freed pages (all when
+    None) if the database uses incremental auto_vacuum. Rollups and drift
+    accumulators are cumulative and keep counting the deleted rows.
+    """
+    with write_conn() as conn:
+        cur = conn.executemany("DELETE FROM predictions WHERE id = ?", [(int(i),) for i in ids])
+        deleted = cur.rowcount
+    reclaim_space(vacuum_pages)
+    return deleted
+
+
+def reclaim_space(pages: Optional[int] = None) -> int:
+    """Run one incremental_vacuum step; returns the free pages left."""
+    with write_conn() as conn:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:  # INCREMENTAL
+            # executescript steps the pragma to completion (execute frees a single page)
+            conn.executescript("PRAGMA incremental_vacuum" + (f"({int(pages)})" if pages else "") + ";")
+        return int(conn.execute("PRAGMA freelist_count").fetchone()[0])
+
+
+# -----------------------------------
+# Incremental Drift Accumulators
+# -----------------------------------
+# Cumulative per-feature count / sum / sum of squares over every logged
+# prediction, updated in the same transaction as the INSERT. Stats for the
+# last N predictions are `current totals - snapshot at (total - N)`, so a
+# drift check never has to re-read or re-parse logged inputs.
+_COLUMNS_JSON = json.dumps(DRIFT_COLUMNS)
+
+
+def _load_accumulator(conn: sqlite3.Connection) -> Optional[tuple]:
+    row = conn.execute(
+        "SELECT n_predictions, columns_json, sums, sumsqs FROM drift_accumulator WHERE id = 1"
+    ).fetchone()
+    if row is None or row["columns_json"] != _COLUMNS_JSON:
+        return None
+    return (
+        int(row["n_predictions"]),
+        np.frombuffer(row["sums"], dtype=np.float64),
+        np.frombuffer(row["sumsqs"], dtype=np.float64),
+    )
+
+
+def _load_accumulator_from(conn_factory) -> Optional[tuple]:
+    with conn_factory() as conn:
+        return _load_accumulator(conn)
+
+
+def _accumulate_drift(conn: sqlite3.Connection, payloads: List[Dict[str, Any]], created_at: str) -> None:
+    X = encode_drift_rows(payloads)
+    state = _load_accumulator(conn)
+    if state is None:
+        n0, sums, sumsqs = 0, np.zeros(X.shape[1]), np.zeros(X.shape[1])
+    else:
+        n0, sums, sumsqs = state
+
+    cum_sums = sums + np.cumsum(X, axis=0)
+    cum_sumsqs = sumsqs + np.cumsum(X * X, axis=0)
+    n1 = n0 + len(X)
+
+    # exact totals at every snapshot boundary this batch crosses
+    first = (n0 // DRIFT_SNAPSHOT_EVERY + 1) * DRIFT_SNAPSHOT_EVERY
+    conn.executemany(
+        """
+        INSERT OR REPLACE INTO drift_snapshots
+        (n_predictions, created_at, columns_json, sums, sumsqs)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        [
+            (n, created_at, _COLUMNS_JSON, cum_sums[n - n0 - 1].tobytes(), cum_sumsqs[n - n0 - 1].tobytes())
+            for n in range(first, n1 + 1, DRIFT_SNAPSHOT_EVERY)
+        ],
+    )
+    # a window of DRIFT_MAX_WINDOW ending now or later starts after this point
+    conn.execute(
+        "DELETE FROM drift_snapshots WHERE n_predictions <= ?",
+        (n1 - DRIFT_MAX_WINDOW - DRIFT_SNAPSHOT_EVERY,),
+    )
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO drift_accumulator (id, n_predictions, columns_json, sums, sumsqs)
+        VALUES (1, ?, ?, ?, ?)
+        """,
+        (n1, _COLUMNS_JSON, cum_sums[-1].tobytes(), cum_sumsqs[-1].tobytes()),
+    )
+
+
+def get_accumulated_count() -> int:
+    """Predictions folded into the drift accumulator (O(1), unlike COUNT(*))."""
+    state = _load_accumulator_from(read_conn)
+    return 0 if state is None else state[0]
+
+
+def fetch_drift_window(last_n: int = 100) -> Optional[Dict[str, Any]]:
+    """
+    Per-feature count/mean/std over (at least) the last `last_n` predictions.
+    The window starts at the latest snapshot at or before `total - last_n`,
+    so it holds between `last_n` and `last_n + DRIFT_SNAPSHOT_EVERY - 1`
+    rows (the returned `count`): "last 100" covers 100-199 predictions.
+    `last_n` may be at most DRIFT_MAX_WINDOW (older snapshots are pruned).
+    """
+    if last_n > DRIFT_MAX_WINDOW:
+        raise ValueError(f"last_n must be at most {DRIFT_MAX_WINDOW}")
+    with read_conn() as conn:
+        conn.execute("BEGIN")  # one consistent view of both tables
+        try:
+            state = _load_accumulator(conn)
+            if state is None or state[0] == 0:
+                return None
+            n1, sums1, sumsqs1 = state
+
+            start = n1 - int(last_n)
+            base = None
+            if start > 0:
+                base = conn.execute(
+                    """
+                    SELECT n_predictions, sums, sumsqs FROM drift_snapshots
+                    WHERE n_predictions <= ? AND columns_json = ?
+                    ORDER BY n_predictions DESC LIMIT 1
+                    """,
+                    (start, _COLUMNS_JSON),
+                ).fetchone()
+        finally:
+            conn.rollback()
+
+    n0, sums0, sumsqs0 = 0, 0.0, 0.0
+    if base is not None:
+        n0 = int(base["n_predictions"])
+        sums0 = np.frombuffer(base["sums"], dtype=np.float64)
+        sumsqs0 = np.frombuffer(base["sumsqs"], dtype=np.float64)
+
+    count = n1 - n0
+    mean = (sums1 - sums0) / count
+    var = np.maximum((sumsqs1 - sumsqs0) / count - mean**2, 0.0)
+    return {
+        "count": count,
+        "end": n1,
+        "mean": dict(zip(DRIFT_COLUMNS, mean.tolist())),
+        "std": dict(zip(DRIFT_COLUMNS, np.sqrt(var).tolist())),
+    }
+
+
+def rebuild_drift_accumulator(chunk_size: int = 10_000, archive_dir: Optional[Path] = None) -> int:
+    """
+    Recompute accumulator + snapshots from logged inputs (one-time backfill):
+    archived predictions first, then the live table, so the count and the
+    totals match an accumulator that was never rebuilt. Legacy rows whose
+    input_json could not be parsed fully (a typed column NULL) are left out.
+    """
+    fields = list(PredictRequest.model_fields)
+    with write_conn() as conn:
+        conn.execute("DELETE FROM drift_accumulator")
+        conn.execute("DELETE FROM drift_snapshots")
+
+        total = 0
+        for df in _archived_batches(conn, ["created_at", *fields], archive_dir):
+            _accumulate_drift(conn, df[fields].to_dict("records"), str(df["created_at"].iloc[-1]))
+            total += len(df)
+
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                f"""
+                SELECT id, created_at, {", ".join(PredictRequest.model_fields)} FROM predictions
+                WHERE id > ? AND {" AND ".join(f"{c} IS NOT NULL" for c in INPUT_COLUMNS)}
+                ORDER BY id LIMIT ?
+                """,
+                (last_id, int(chunk_size)),
+            ).fetchall()
+            if not rows:
+                break
+            _accumulate_drift(conn, rows, rows[-1]["created_at"])
+            last_id = rows[-1]["id"]
+            total += len(rows)
+    return total
+
+
+# -----------------------------------
+# Metric Rollups
+# -----------------------------------
+# Per hour / per day: count, sum and sum of squares of default_probability,
+# plus histograms of rating, credit score (10-point bins) and probability
+# (PROB_BUCKETS bins). Upserted in the same transaction as the INSERT, so
+# trend and analytics queries read a few rows per bucket instead of the raw
+# table. Buckets are prefixes of created_at, which is always UTC isoformat.
+ROLLUP_GRAINS = {"hour": 13, "day": 10}
+SCORE_BIN_WIDTH = 10
+
+
+def score_bin(score: int) -> int:
+    # right-closed bins: key k holds scores in (k - 10, k]
+    return -(-int(score) // SCORE_BIN_WIDTH) * SCORE_BIN_WIDTH
+
+
+def prob_bucket(p: float) -> int:
+    return max(min(int(p * PROB_BUCKETS), PROB_BUCKETS - 1), 0)
+
+
+def _accumulate_rollups(conn: sqlite3.Connection, rows: List[tuple]) -> None:
+    """rows: (created_at, default_probability, credit_score, rating)"""
+    totals: Dict[tuple, List[float]] = {}
+    hist: Dict[tuple, int] = {}
+    for created_at, p, score, rating in rows:
+        keys = (("rating", rating), ("score", score_bin(score)), ("prob", prob_bucket(p)))
+        for grain, width in ROLLUP_GRAINS.items():
+            bucket = created_at[:width]
+            t = totals.setdefault((grain, bucket), [0, 0.0, 0.0])
+            t[0] += 1
+            t[1] += p
+            t[2] += p * p
+            for kind, key in keys:
+                hkey = (grain, bucket, kind, key)
+                hist[hkey] = hist.get(hkey, 0) + 1
+
+    conn.executemany(
+        """
+        INSERT INTO prediction_rollups (grain, bucket, n, sum_p, sumsq_p)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (grain, bucket) DO UPDATE SET
+            n = n + excluded.n,
+            sum_p = sum_p + excluded.sum_p,
+            sumsq_p = sumsq_p + excluded.sumsq_p
+        """,
+        [(grain, bucket, n, sp, ssp) for (grain, bucket), (n, sp, ssp) in totals.items()],
+    )
+    conn.executemany(
+        """
+        INSERT INTO prediction_rollup_hist (grain, bucket, kind, key, n)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (grain, bucket, kind, key) DO UPDATE SET n = n + excluded.n
+        """,
+        [(*k, n) for k, n in hist.items()],
+    )
+
+
+def rebuild_rollups(archive_dir: Optional[Path] = None) -> int:
+    """Recompute every rollup from the live and the archived predictions (backfill)."""
+    with write_conn() as conn:
+        conn.execute("DELETE FROM prediction_rollups")
+        conn.execute("DELETE FROM prediction_rollup_hist")
+        for grain, width in ROLLUP_GRAINS.items():
+            bucket = f"substr(created_at, 1, {width})"
+            conn.execute(
+                f"""
+                INSERT INTO prediction_rollups (grain, bucket, n, sum_p, sumsq_p)
+                SELECT ?, {bucket}, COUNT(*), SUM(default_probability),
+                       SUM(default_probability * default_probability)
+                FROM predictions GROUP BY {bucket}
+                """,
+                (grain,),
+            )
+            for kind, key in [
+                ("rating", "rating"),
+                ("score", f"((credit_score + {SCORE_BIN_WIDTH - 1}) / {SCORE_BIN_WIDTH}) * {SCORE_BIN_WIDTH}"),
+                (
+                    "prob",
+                    f"MAX(MIN(CAST(default_probability * {PROB_BUCKETS} AS INTEGER), {PROB_BUCKETS - 1}), 0)",
+                ),
+            ]:
+                conn.execute(
+                    f"""
+                    INSERT INTO prediction_rollup_hist (grain, bucket, kind, key, n)
+                    SELECT ?, {bucket}, ?, {key}, COUNT(*)
+                    FROM predictions GROUP BY {bucket}, {key}
+                    """,
+                    (grain, kind),
+                )
+        for df in _archived_batches(conn, ["created_at", "default_probability", "credit_score", "rating"], archive_dir):
+            _accumulate_rollups(
+                conn,
+                list(
+                    zip(
+                        df["created_at"].tolist(),
+                        df["default_probability"].tolist(),
+                        df["credit_score"].tolist(),
+                        df["rating"].tolist(),
+                    )
+                ),
+            )
+        row = conn.execute("SELECT COALESCE(SUM(n), 0) FROM prediction_rollups WHERE grain = 'day'").fetchone()
+    return int(row[0])
+
+
+def _bucket_range(grain: str, lo: Optional[str], hi: Optional[str]) -> tuple:
+    if grain not in ROLLUP_GRAINS:
+        raise ValueError(f"Unknown rollup grain: {grain!r}")
+    where, params = ["grain = ?"], [grain]
+    if lo is not None:
+        where.append("bucket >= ?")
+        params.append(lo)
+    if hi is not None:
+        where.append("bucket < ?")
+        params.append(hi)
+    return " AND ".join(where), params
+
+
+def fetch_rollup_hist(grain: str, lo: Optional[str] = None, hi: Optional[str] = None) -> Dict[str, Dict[Any, int]]:
+    """Histogram counts summed over buckets in [lo, hi): {"rating": {...}, "score": {...}, "prob": {...}}."""
+    where, params = _bucket_range(grain, lo, hi)
+    with read_conn() as conn:
+        cur = conn.execute(
+            f"""
+            SELECT kind, key, SUM(n) AS n
+            FROM prediction_rollup_hist
+            WHERE {where}
+            GROUP BY kind, key
+            """,
+            params,
+        )
+        rows = cur.fetchall()
+    out: Dict[str, Dict[Any, int]] = {"rating": {}, "score": {}, "prob": {}}
+    for row in rows:
+        out[row["kind"]][row["key"]] = int(row["n"])
+    return out
+
+
+def fetch_rollups(
+    grain: str = "day",
+    lo: Optional[str] = None,
+    hi: Optional[str] = None,
+    limit: int = 1000,
+) -> List[Dict[str, Any]]:
+    """Latest `limit` buckets in [lo, hi), oldest first, with probability mean/std and rating counts."""
+    where, params = _bucket_range(grain, lo, hi)
+    with read_conn() as conn:
+        buckets = conn.execute(
+            f"""
+            SELECT bucket, n, sum_p, sumsq_p
+            FROM prediction_rollups
+            WHERE {where}
+            ORDER BY bucket DESC
+            LIMIT ?
+            """,
+            (*params, int(limit)),
+        ).fetchall()
+        if not buckets:
+            return []
+        ratings = conn.execute(
+            f"""
+            SELECT bucket, key, n
+            FROM prediction_rollup_hist
+            WHERE {where} AND kind = 'rating' AND bucket >= ?
+            """,
+            (*params, buckets[-1]["bucket"]),
+        ).fetchall()
+
+    by_bucket: Dict[str, Dict[str, int]] = {}
+    for row in ratings:
+        by_bucket.setdefault(row["bucket"], {})[row["key"]] = int(row["n"])
+
+    out = []
+    for row in reversed(buckets):
+        n = int(row["n"])
+        mean = row["sum_p"] / n
+        var = max(row["sumsq_p"] / n - mean * mean, 0.0)
+        out.append(
+            {
+                "bucket": row["bucket"],
+                "count": n,
+                "mean_probability": mean,
+                "std_probability": float(np.sqrt(var)),
+                "rating_counts": by_bucket.get(row["bucket"], {}),
+            }
+        )
+    return out
 
 
 # -----------------------------------
@@ -155,14 +1105,16 @@ def insert_drift_report(
     z_threshold: float,
     drifted_features_count: int,
     report: Dict[str, Any],
+    window_size: Optional[int] = None,
+    duration_ms: Optional[float] = None,
 ) -> int:
-    conn = get_conn()
-    try:
+    with write_conn() as conn:
         cur = conn.execute(
             """
             INSERT INTO drift_reports
-            (created_at, model_version, z_threshold, drifted_features_count, report_json)
-            VALUES (?, ?, ?, ?, ?)
+            (created_at, model_version, z_threshold, drifted_features_count, report_json,
+             window_size, duration_ms)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 created_at,
@@ -170,20 +1122,19 @@ def insert_drift_report(
                 float(z_threshold),
                 int(drifted_features_count),
                 json.dumps(report),
+                window_size,
+                duration_ms,
             ),
         )
-        conn.commit()
         return int(cur.lastrowid)
-    finally:
-        conn.close()
 
 
 def fetch_drift_reports(limit: int = 10) -> List[Dict[str, Any]]:
-    conn = get_conn()
-    try:
+    with read_conn() as conn:
         cur = conn.execute(
             """
-            SELECT id, created_at, model_version, z_threshold, drifted_features_count, report_json
+            SELECT id, created_at, model_version, z_threshold, drifted_features_count, report_json,
+                   window_size, duration_ms
             FROM drift_reports
             ORDER BY id DESC
             LIMIT ?
@@ -199,9 +1150,55 @@ def fetch_drift_reports(limit: int = 10) -> List[Dict[str, Any]]:
                 "model_version": row["model_version"],
                 "z_threshold": row["z_threshold"],
                 "drifted_features_count": row["drifted_features_count"],
+                "window_size": row["window_size"],
+                "duration_ms": row["duration_ms"],
                 "report": json.loads(row["report_json"]),
             }
             for row in rows
         ]
-    finally:
-        conn.close()
+
+
+# -----------------------------------
+# Job Leases (one runner across worker processes)
+# -----------------------------------
+def try_acquire_lease(name: str, owner: str, ttl_s: float, now: float) -> bool:
+    """Take the named lease if it is free, expired, or already ours."""
+    with write_conn() as conn:
+        conn.execute("INSERT OR IGNORE INTO job_leases (name) VALUES (?)", (name,))
+        cur = conn.execute(
+            """
+            UPDATE job_leases SET owner = ?, expires_at = ?
+            WHERE name = ? AND (owner IS NULL OR owner = ? OR expires_at < ?)
+            """,
+            (owner, now + float(ttl_s), name, owner, now),
+        )
+        return cur.rowcount == 1
+
+
+def release_lease(name: str, owner: str, ran_at: Optional[float] = None, run_count: Optional[int] = None) -> None:
+    with write_conn() as conn:
+        if ran_at is None:
+            conn.execute(
+                "UPDATE job_leases SET owner = NULL, expires_at = 0 WHERE name = ? AND owner = ?",
+                (name, owner),
+            )
+        else:
+            conn.execute(
+                """
+                UPDATE job_leases
+                SET owner = NULL, expires_at = 0, last_run_at = ?, last_run_count = ?
+                WHERE name = ? AND owner = ?
+                """,
+                (float(ran_at), int(run_count or 0), name, owner),
+            )
+
+
+def get_job_state(name: str) -> Dict[str, Any]:
+    with read_conn() as conn:
+        row = conn.execute(
+            "SELECT owner, expires_at, last_run_at, last_run_count FROM job_leases WHERE name = ?",
+            (name,),
+        ).fetchone()
+    if row is None:
+        return {"owner": None, "expires_at": 0.0, "last_run_at": 0.0, "last_run_count": 0}
+    return dict(row)
@@ -1,11 +1,45 @@
 import json
 from pathlib import Path
-from typing import Dict, Any
-import pandas as pd
+from typing import TYPE_CHECKING, Dict, Any, List, Literal, get_args, get_origin
+import numpy as np
+
+from api.schemas import PredictRequest
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _drift_columns() -> List[str]:
+    # same names pd.get_dummies(DataFrame(payloads)) produces
+    numeric, dummies = [], []
+    for name, field in PredictRequest.model_fields.items():
+        if get_origin(field.annotation) is Literal:
+            dummies += [f"{name}_{value}" for value in sorted(get_args(field.annotation))]
+        else:
+            numeric.append(name)
+    return numeric + dummies
+
+
+DRIFT_COLUMNS = _drift_columns()
+_DRIFT_INDEX = {c: i for i, c in enumerate(DRIFT_COLUMNS)}
+_NUMERIC = [c for c in PredictRequest.model_fields if c in _DRIFT_INDEX]
+_CATEGORICAL = [c for c in PredictRequest.model_fields if c not in _DRIFT_INDEX]
+
+
+def encode_drift_rows(payloads: List[Dict[str, Any]]) -> np.ndarray:
+    """One row per payload over DRIFT_COLUMNS (numeric fields + one-hot categories)."""
+    X = np.zeros((len(payloads), len(DRIFT_COLUMNS)))
+    for i, payload in enumerate(payloads):
+        row = X[i]
+        for j, c in enumerate(_NUMERIC):
+            row[j] = float(payload[c])
+        for c in _CATEGORICAL:
+            row[_DRIFT_INDEX[f"{c}_{payload[c]}"]] = 1.0
+    return X
 
 
 def save_baseline_stats(
-    X_train_encoded: pd.DataFrame,
+    X_train_encoded: "pd.DataFrame",
     out_path: str | Path = "artifacts/drift_baseline.json",
     min_std: float = 1e-8,
 ) -> Path:
@@ -30,24 +64,19 @@ def load_baseline_stats(path: str | Path) -> Dict[str, Any]:
     return json.loads(Path(path).read_text())
 
 
-def zscore_drift(
-    X_new_encoded: pd.DataFrame,
+def zscore_drift_from_means(
+    new_means: Dict[str, float],
     baseline: Dict[str, Any],
     z_threshold: float = 3.0,
-) -> pd.DataFrame:
+) -> "pd.DataFrame":
+    """Same report as `zscore_drift`, from precomputed window means (missing -> 0)."""
     features = baseline["features"]
-    cols = list(features.keys())
-
-    # ensure same columns as baseline
-    X_new = X_new_encoded.reindex(columns=cols, fill_value=0)
 
     rows = []
-    for col in cols:
-        mu_train = float(features[col]["mean"])
-        std_train = float(features[col]["std"])
-
-        s_new = X_new[col].dropna()
-        mu_new = float(s_new.mean()) if len(s_new) else 0.0
+    for col, stats in features.items():
+        mu_train = float(stats["mean"])
+        std_train = float(stats["std"])
+        mu_new = float(new_means.get(col, 0.0))
 
         z = (mu_new - mu_train) / std_train
         rows.append(
@@ -61,6 +90,26 @@ def zscore_drift(
             }
         )
 
+    import pandas as pd
+
     df = pd.DataFrame(rows)
     df = df.sort_values("z_score", key=lambda s: s.abs(), ascending=False).reset_index(drop=True)
     return df
+
+
+def zscore_drift(
+    X_new_encoded: "pd.DataFrame",
+    baseline: Dict[str, Any],
+    z_threshold: float = 3.0,
+) -> "pd.DataFrame":
+    cols = list(baseline["features"].keys())
+
+    # ensure same columns as baseline
+    X_new = X_new_encoded.reindex(columns=cols, fill_value=0)
+
+    new_means = {}
+    for col in cols:
+        s_new = X_new[col].dropna()
+        new_means[col] = float(s_new.mean()) if len(s_new) else 0.0
+
+    return zscore_drift_from_means(new_means, baseline, z_threshold=z_threshold)
@@ -0,0 +1,203 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# -----------------------------------
+# Raw feature layout (one slot per engineered feature)
+# -----------------------------------
+RAW_COLUMNS = [
+    "age",
+    "loan_tenure_months",
+    "number_of_open_accounts",
+    "credit_utilization_ratio",
+    "loan_to_income",
+    "delinquency_ratio",
+    "avg_dpd_per_delinquency",
+    "residence_type_Owned",
+    "residence_type_Rented",
+    "loan_purpose_Education",
+    "loan_purpose_Home",
+    "loan_purpose_Personal",
+    "loan_type_Unsecured",
+]
+
+# extra always-zero slot used for training columns the API never fills
+_ZERO_SLOT = len(RAW_COLUMNS)
+
+
+def _raw_values(payload: Dict[str, Any]) -> tuple:
+    income = float(payload["income"])
+    loan_amount = float(payload["loan_amount"])
+    residence = payload["residence_type"]
+    purpose = payload["loan_purpose"]
+
+    return (
+        float(payload["age"]),
+        float(payload["loan_tenure_months"]),
+        float(payload["num_open_accounts"]),
+        float(payload["credit_utilization_ratio"]),
+        (loan_amount / income) if income > 0 else 0.0,
+        float(payload["delinquency_ratio"]),
+        float(payload["avg_dpd_per_delinquency"]),
+        float(residence == "Owned"),
+        float(residence == "Rented"),
+        float(purpose == "Education"),
+        float(purpose == "Home"),
+        float(purpose == "Personal"),
+        float(payload["loan_type"] == "Unsecured"),
+        0.0,
+    )
+
+
+class FeatureEncoder:
+    """
+    Turns request payloads into the model's feature matrix without pandas.
+
+    Built once per model artifact: every output column knows which raw slot
+    it reads and the scaler's per-column parameters, so encoding is a row
+    fill plus a few vectorized array ops. Output matches the old
+    DataFrame + scaler.transform path exactly.
+    """
+
+    def __init__(
+        self,
+        features: List[str],
+        src: np.ndarray,
+        sub: np.ndarray,
+        div: np.ndarray,
+        mul: np.ndarray,
+        add: np.ndarray,
+        clip: Optional[tuple] = None,
+        clip_mask: Optional[np.ndarray] = None,
+        scaler: Any = None,
+        cols_to_scale: Optional[List[str]] = None,
+    ):
+        self.features = list(features)
+        self.n_features = len(self.features)
+        self.src = np.asarray(src, dtype=np.intp)
+        self.sub = np.asarray(sub, dtype=np.float64)
+        self.div = np.asarray(div, dtype=np.float64)
+        self.mul = np.asarray(mul, dtype=np.float64)
+        self.add = np.asarray(add, dtype=np.float64)
+        self.clip = clip
+        self.clip_mask = clip_mask
+
+        # only set when the scaler has no closed form we can compile
+        self.scaler = scaler
+        self.cols_to_scale = list(cols_to_scale or [])
+
+    @property
+    def is_affine(self) -> bool:
+        """True when each output column is `(raw - sub) / div * mul + add`."""
+        return self.scaler is None and self.clip is None
+
+    # -----------------------------------
+    # Build from a loaded artifact
+    # -----------------------------------
+    @classmethod
+    def from_model_data(cls, md: Dict[str, Any]) -> "FeatureEncoder":
+        features = [str(c) for c in md["features"]]
+        cols_to_scale = [str(c) for c in md["cols_to_scale"]]
+        scaler = md["scaler"]
+
+        n = len(features)
+        src = np.array(
+            [RAW_COLUMNS.index(c) if c in RAW_COLUMNS else _ZERO_SLOT for c in features],
+            dtype=np.intp,
+        )
+        sub = np.zeros(n)
+        div = np.ones(n)
+        mul = np.ones(n)
+        add = np.zeros(n)
+        clip = None
+        clip_mask = None
+
+        scaler_name = type(scaler).__name__
+        scaled = [(j, cols_to_scale.index(c)) for j, c in enumerate(features) if c in cols_to_scale]
+        out_idx = np.array([j for j, _ in scaled], dtype=np.intp)
+        scl_idx = np.array([k for _, k in scaled], dtype=np.intp)
+
+        if scaler_name == "MinMaxScaler":
+            mul[out_idx] = scaler.scale_[scl_idx]
+            add[out_idx] = scaler.min_[scl_idx]
+            if getattr(scaler, "clip", False):
+                clip = tuple(float(v) for v in scaler.feature_range)
+                clip_mask = np.zeros(n, dtype=bool)
+                clip_mask[out_idx] = True
+        elif scaler_name == "StandardScaler":
+            if scaler.with_mean:
+                sub[out_idx] = scaler.mean_[scl_idx]
+            if scaler.with_std:
+                div[out_idx] = scaler.scale_[scl_idx]
+        else:
+            # unknown scaler: keep exact behaviour via scaler.transform
+            return cls(features, src, sub, div, mul, add, scaler=scaler, cols_to_scale=cols_to_scale)
+
+        return cls(features, src, sub, div, mul, add, clip=clip, clip_mask=clip_mask)
+
+    # -----------------------------------
+    # Plain-array form (stored in compiled artifacts)
+    # -----------------------------------
+    def to_dict(self) -> Dict[str, Any]:
+        if self.scaler is not None:
+            raise ValueError("Encoder uses scaler.transform and cannot be exported without sklearn")
+        return {
+            "features": self.features,
+            "src": self.src,
+            "sub": self.sub,
+            "div": self.div,
+            "mul": self.mul,
+            "add": self.add,
+            "clip": self.clip,
+            "clip_mask": self.clip_mask,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "FeatureEncoder":
+        return cls(**d)
+
+    # -----------------------------------
+    # Encoding
+    # -----------------------------------
+    def raw_matrix(self, payloads: List[Dict[str, Any]], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Fill one raw row per payload (plus the trailing zero slot)."""
+        n = len(payloads)
+        if out is None:
+            out = np.empty((n, len(RAW_COLUMNS) + 1), dtype=np.float64)
+        for i, payload in enumerate(payloads):
+            out[i] = _raw_values(payload)
+        return out
+
+    def transform_raw(self, raw: np.ndarray) -> np.ndarray:
+        if self.scaler is not None:
+            return self._transform_with_scaler(raw)
+
+        X = raw[:, self.src]
+        X -= self.sub
+        X /= self.div
+        X *= self.mul
+        X += self.add
+        if self.clip is not None:
+            X[:, self.clip_mask] = np.clip(X[:, self.clip_mask], self.clip[0], self.clip[1])
+        return X
+
+    def encode_many(self, payloads: List[Dict[str, Any]], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Encode a batch into an (n_rows, n_features) float64 matrix."""
+        return self.transform_raw(self.raw_matrix(payloads, out=out))
+
+    def encode(self, payload: Dict[str, Any]) -> np.ndarray:
+        """Encode one payload into a (1, n_features) float64 matrix."""
+        return self.encode_many([payload])
+
+    def _transform_with_scaler(self, raw: np.ndarray) -> np.ndarray:
+        import pandas as pd
+
+        src_for = {c: (RAW_COLUMNS.index(c) if c in RAW_COLUMNS else _ZERO_SLOT) for c in self.cols_to_scale}
+        df = pd.DataFrame({c: raw[:, k] for c, k in src_for.items()}, columns=self.cols_to_scale)
+        scaled = np.asarray(self.scaler.transform(df), dtype=np.float64)
+
+        X = raw[:, self.src]
+        for j, c in enumerate(self.features):
+            if c in src_for:
+                X[:, j] = scaled[:, self.cols_to_scale.index(c)]
+        return X
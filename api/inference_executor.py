@@ -0,0 +1,111 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class Overloaded(Exception):
+    """Raised instead of queueing when the executor already has `max_pending` jobs."""
+
+    def __init__(self, retry_after_s: float):
+        super().__init__("Inference queue is full")
+        self.retry_after_s = retry_after_s
+
+
+class InferenceExecutor:
+    """
+    Dedicated, bounded thread pool for CPU work of the async endpoints.
+
+    Keeps model calls off the event loop and out of the shared AnyIO
+    threadpool, so /logs, /stats, ... keep answering under load. At most
+    `max_pending` jobs (running + waiting) are admitted; beyond that a job
+    is rejected right away with Overloaded, which keeps queueing delay and
+    tail latency bounded instead of letting the backlog grow.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 64, retry_after_s: float = 1.0):
+        self.max_workers = max(int(max_workers), 1)
+        self.max_pending = max(int(max_pending), self.max_workers)
+        self.retry_after_s = float(retry_after_s)
+
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        self.pending = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.max_queue_depth = 0
+
+    # -----------------------------------
+    # Lifecycle
+    # -----------------------------------
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+            return self._pool
+
+    def stop(self) -> None:
+        """Finish admitted jobs and release the threads (a later submit starts a new pool)."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    # -----------------------------------
+    # Submitting work
+    # -----------------------------------
+    def _admit(self) -> None:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise Overloaded(self.retry_after_s)
+            self.pending += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.pending - self.active)
+
+    def _call(self, fn: Callable[..., Any], args: tuple) -> Any:
+        with self._lock:
+            self.active += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self.pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Admit and schedule `fn(*args)`; raises Overloaded when full."""
+        self._admit()
+        try:
+            future = self._get_pool().submit(self._call, fn, args)
+        except Exception:
+            with self._lock:
+                self.pending -= 1
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "active": self.active,
+                "queue_depth": self.pending - self.active,
+                "max_queue_depth": self.max_queue_depth,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
@@ -0,0 +1,150 @@
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from api.db_sqlite import get_accumulated_count, get_job_state, release_lease, try_acquire_lease
+from api.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+# -----------------------------------
+# Scheduler
+# -----------------------------------
+class JobScheduler:
+    """
+    Runs a periodic maintenance job (drift checks, retention) in a
+    background thread, off the request path.
+
+    Triggers: every `every_n` logged predictions and/or every `interval_s`
+    seconds (0 disables a trigger). A lease row in SQLite makes sure only
+    one process runs the job at a time, and the row also remembers when
+    the job last ran, so workers never repeat each other's run.
+    """
+
+    def __init__(
+        self,
+        job: Callable[[], Optional[Dict[str, Any]]],
+        name: str,
+        every_n: int = 100,
+        interval_s: float = 0.0,
+        poll_s: float = 1.0,
+        lease_s: float = 300.0,
+    ):
+        self.job = job
+        self.every_n = int(every_n)
+        self.interval_s = float(interval_s)
+        self.poll_s = float(poll_s)
+        self.lease_s = float(lease_s)
+        self.name = name
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self.runs = 0
+        self.failures = 0
+        self.skipped_locked = 0
+        self.last_duration_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running or (self.every_n <= 0 and self.interval_s <= 0):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"{self.name}-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self.running,
+                "every_n": self.every_n,
+                "interval_s": self.interval_s,
+                "runs": self.runs,
+                "failures": self.failures,
+                "skipped_locked": self.skipped_locked,
+                "last_duration_ms": self.last_duration_ms,
+                "last_error": self.last_error,
+            }
+
+    # -----------------------------------
+    # Scheduling
+    # -----------------------------------
+    def _is_due(self, count: int, now: float) -> bool:
+        state = get_job_state(self.name)
+        last_count = int(state["last_run_count"])
+        if self.every_n > 0 and count >= self.every_n:
+            # count < last_count: the accumulator was rebuilt with fewer rows;
+            # run now instead of waiting for the count to catch up
+            if count // self.every_n > last_count // self.every_n or count < last_count:
+                return True
+        if self.interval_s > 0 and count > 0:
+            if now - float(state["last_run_at"]) >= self.interval_s:
+                return True
+        return False
+
+    def run_once(self) -> bool:
+        """Run the job if a trigger fired and the lease is free. Returns True if it ran."""
+        now = time.time()
+        with metrics.timer("count_query"):
+            count = get_accumulated_count()
+        if not self._is_due(count, now):
+            return False
+
+        if not try_acquire_lease(self.name, self.owner, self.lease_s, now):
+            with self._lock:
+                self.skipped_locked += 1
+            metrics.inc("job_runs_total", job=self.name, outcome="skipped_locked")
+            return False
+
+        ran = False
+        try:
+            # another worker may have finished the same run just before us
+            if self._is_due(count, now):
+                start = time.perf_counter()
+                result = self.job()
+                seconds = time.perf_counter() - start
+                with self._lock:
+                    self.runs += 1
+                    self.last_duration_ms = seconds * 1000
+                    self.last_error = None
+                ran = True
+                metrics.observe_stage(self.name, seconds)
+                metrics.inc("job_runs_total", job=self.name, outcome="ok" if result else "no_data")
+                if result:
+                    logger.info("%s done at prediction #%d: %s", self.name, count, result)
+        except Exception as e:
+            with self._lock:
+                self.failures += 1
+                self.last_error = str(e)
+            metrics.inc("job_runs_total", job=self.name, outcome="failed")
+            logger.error("%s failed: %s", self.name, e)
+            # still mark the run so a broken baseline is not retried every poll
+            ran = True
+        finally:
+            release_lease(self.name, self.owner, ran_at=now if ran else None, run_count=count)
+        return ran
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_s):
+            try:
+                self.run_once()
+            except Exception as e:  # e.g. database briefly unavailable
+                logger.error("%s scheduler tick failed: %s", self.name, e)
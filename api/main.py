@@ -1,110 +1,399 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
+from collections import Counter
+import asyncio
+import hmac
+import logging
+import math
+import queue
+import time
 from datetime import datetime, timezone
-import pandas as pd
+from functools import partial
+from typing import AsyncIterator, List, Literal, Optional
 
 from api.schemas import PredictRequest, PredictResponse
-from api.predictor import predict
-from api.model_loader import get_model_data
+from api.predictor import predict_batch, warm_up
+from api.model_loader import LoadedModel
+from api.model_registry import get_model_info, get_registry
+from api.prediction_logger import PredictionLogger, new_prediction_id
+from api.micro_batcher import MicroBatcher
+from api.inference_executor import InferenceExecutor, Overloaded
+from api.prediction_cache import PredictionCache, payload_key
+from api.ndjson_stream import NDJSONStreamingResponse, iter_ndjson_lines, ndjson, parse_request_line
+from api.drift_scheduler import JOB_NAME as DRIFT_JOB_NAME, run_drift_check
+from api.archive import JOB_NAME as RETENTION_JOB_NAME, run_retention
+from api.job_scheduler import JobScheduler
+from api.analytics import DEFAULT_QUANTILES, compute_analytics, compute_trend
+from api.metrics import MetricsMiddleware, metrics
+from api.profiler import Profiler
+from api.settings import settings
 
 from api.db_sqlite import (
     init_db,
-    insert_prediction,
-    fetch_logs,
-    get_prediction_count,
-    fetch_prediction_inputs,
-    insert_drift_report,
+    close_connections,
+    insert_predictions,
+    fetch_logs_page,
     fetch_drift_reports,
 )
 
-from api.drift_monitor import load_baseline_stats, zscore_drift
+# the api.* loggers only; uvicorn and third-party libraries keep their own config
+_api_logger = logging.getLogger("api")
+if not _api_logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    _api_logger.addHandler(_handler)
+_api_logger.setLevel(settings.LOG_LEVEL)
+logger = logging.getLogger(__name__)
+
+prediction_logger = PredictionLogger(
+    max_queue=settings.PREDICTION_LOG_QUEUE_SIZE,
+    batch_size=settings.PREDICTION_LOG_BATCH_SIZE,
+    flush_interval=settings.PREDICTION_LOG_FLUSH_INTERVAL_S,
+)
+
+inference_executor = InferenceExecutor(
+    max_workers=settings.INFERENCE_WORKERS,
+    max_pending=settings.INFERENCE_MAX_PENDING,
+    retry_after_s=settings.INFERENCE_RETRY_AFTER_S,
+)
+
+prediction_cache = PredictionCache(
+    max_entries=settings.PREDICTION_CACHE_SIZE,
+    ttl_s=settings.PREDICTION_CACHE_TTL_S,
+)
+
+profiler = Profiler()
+
+micro_batcher = MicroBatcher(
+    max_batch=settings.PREDICT_BATCH_MAX_ROWS,
+    max_wait_ms=settings.PREDICT_BATCH_MAX_WAIT_MS,
+    max_queue=settings.PREDICT_BATCH_QUEUE_SIZE,
+    wrap=profiler.wrap,
+)
+
+drift_scheduler = JobScheduler(
+    job=partial(
+        run_drift_check,
+        window=settings.DRIFT_WINDOW,
+        z_threshold=settings.DRIFT_Z_THRESHOLD,
+        baseline_path=settings.DRIFT_BASELINE_PATH,
+    ),
+    name=DRIFT_JOB_NAME,
+    every_n=settings.DRIFT_EVERY_N_PREDICTIONS,
+    interval_s=settings.DRIFT_INTERVAL_S,
+    poll_s=settings.DRIFT_POLL_S,
+    lease_s=settings.DRIFT_LEASE_S,
+)
+
+retention_scheduler = JobScheduler(
+    job=partial(
+        run_retention,
+        max_age_days=settings.RETENTION_DAYS,
+        batch_rows=settings.RETENTION_BATCH_ROWS,
+    ),
+    name=RETENTION_JOB_NAME,
+    every_n=0,
+    interval_s=settings.RETENTION_INTERVAL_S,
+    poll_s=settings.RETENTION_POLL_S,
+    lease_s=settings.RETENTION_LEASE_S,
+)
+
+
+# /predict-stream waits this long before retrying a chunk the executor rejected
+STREAM_RETRY_S = 0.05
+
+# set by the lifespan hook; /ready reports it
+startup_state = {"ready": False, "warmup_ms": None, "error": None}
+
+
+def _warm_up_model() -> None:
+    try:
+        model = get_registry().active
+        ms = warm_up(model, rows=settings.MODEL_WARMUP_ROWS)
+        startup_state.update(warmup_ms=ms, error=None)
+        logger.info("Model %s warmed up in %.0f ms", model.version, ms)
+    except Exception as e:
+        startup_state["error"] = str(e)
+        logger.error("Model warm-up failed: %s", e)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    startup_state.update(ready=False, warmup_ms=None, error=None)
     init_db()
+    if settings.MODEL_WARMUP:
+        _warm_up_model()
+    startup_state["ready"] = startup_state["error"] is None
+    if settings.PREDICTION_LOG_ASYNC:
+        prediction_logger.start()
+    if settings.PREDICT_BATCHING:
+        micro_batcher.start()
+    drift_scheduler.start()
+    if settings.RETENTION_DAYS > 0:
+        retention_scheduler.start()
     yield
+    startup_state["ready"] = False
+    # answer requests already waiting for a batch before the logger stops
+    micro_batcher.stop()
+    inference_executor.stop()
+    retention_scheduler.stop()
+    drift_scheduler.stop()
+    # write out whatever is still queued before the process exits
+    prediction_logger.stop()
+    close_connections()
 
 
 app = FastAPI(title="Credit Risk API", version="1.0.0", lifespan=lifespan)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
 
 
 @app.get("/health")
 def health():
+    # liveness: the process is up (model may still be loading)
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def ready(response: Response):
+    # readiness: model loaded and warmed up, safe to route traffic here
+    if not startup_state["ready"]:
+        response.status_code = 503
+        return {"status": "error" if startup_state["error"] else "starting", "error": startup_state["error"]}
+    return {
+        "status": "ready",
+        "model_version": get_registry().active_version,
+        "warmup_ms": startup_state["warmup_ms"],
+    }
+
+
+@app.get("/stats")
+def stats():
+    return {
+        "prediction_logger": prediction_logger.stats(),
+        "micro_batcher": micro_batcher.stats(),
+        "inference": inference_executor.stats(),
+        "prediction_cache": prediction_cache.stats(),
+        "drift_scheduler": drift_scheduler.stats(),
+        "retention_scheduler": retention_scheduler.stats(),
+        "models": get_registry().stats(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    """Prometheus text format: stage / endpoint latency histograms, counters, queue gauges."""
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (METRICS_ENABLED=false)")
+    inference = inference_executor.stats()
+    logger_stats = prediction_logger.stats()
+    cache = prediction_cache.stats()
+    gauges = {
+        "inference_active": ("Model calls running on the inference executor", inference["active"]),
+        "inference_queue_depth": ("Model calls waiting for an inference thread", inference["queue_depth"]),
+        "prediction_log_queue_depth": ("Prediction rows waiting to be written", logger_stats["queue_depth"]),
+    }
+    counters = {
+        "inference_rejected_total": ("Requests rejected with 503", inference["rejected"]),
+        "prediction_log_dropped_total": ("Prediction rows dropped (log queue full)", logger_stats["dropped"]),
+        "prediction_cache_hits_total": ("Prediction cache hits", cache["hits"]),
+        "prediction_cache_misses_total": ("Prediction cache misses", cache["misses"]),
+    }
+    return PlainTextResponse(metrics.render(gauges, counters), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/model-info")
 def model_info():
-    md = get_model_data()
+    info = get_model_info()
     return {
-        "model_type": type(md["model"]).__name__,
-        "scaler_type": type(md["scaler"]).__name__,
-        "n_features": len(md["features"]),
-        "artifact_path": "artifacts/model_data_v1.joblib",
-        "cols_scaled": list(md["cols_to_scale"]),
-        "model_version": "v1",
+        "model_type": info["model_type"],
+        "scaler_type": info["scaler_type"],
+        "n_features": info["n_features"],
+        "artifact_path": info["artifact_path"],
+        "cols_scaled": info["cols_to_scale"],
+        "model_version": info["model_version"],
+        "scorer": info["scorer"],
     }
 
 
-@app.post("/predict", response_model=PredictResponse)
-def predict_endpoint(req: PredictRequest):
-    payload = req.model_dump()
-    p, score, rating = predict(payload)
+@app.get("/models")
+def models():
+    return get_registry().versions()
 
-    ts = datetime.now(timezone.utc).isoformat()
 
-    row_id = insert_prediction(
-        created_at=ts,
-        payload=payload,
-        default_probability=float(p),
-        credit_score=int(score),
-        rating=str(rating),
-    )
-    
-    
+def _require_admin(token: Optional[str]) -> None:
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN not set)")
+    if not token or not hmac.compare_digest(token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@app.post("/admin/models/{version}/activate")
+def activate_model(version: str, x_admin_token: Optional[str] = Header(None)):
+    """Load `version` and make it the served model (no restart, in-flight requests unaffected)."""
+    _require_admin(x_admin_token)
+    registry = get_registry()
+    previous = registry.active_version
+    try:
+        # load and warm the new version before any request can reach it
+        warm_up(registry.get(version), rows=settings.MODEL_WARMUP_ROWS)
+        model = registry.activate(version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    # keys carry the version already; this just frees the old version's entries
+    prediction_cache.clear()
+    logger.info("Active model %s -> %s", previous, model.version)
+    return {"previous_version": previous, "model_version": model.version, "scorer": model.scorer.name}
+
+
+@app.post("/admin/profile")
+async def profile(
+    mode: Literal["cprofile", "sampling"] = "sampling",
+    seconds: float = Query(10.0, gt=0, le=settings.PROFILE_MAX_SECONDS),
+    requests: Optional[int] = Query(None, ge=1),
+    memory: bool = False,
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+    top: int = Query(30, ge=1, le=500),
+    download: bool = False,
+    x_admin_token: Optional[str] = Header(None),
+):
+    """
+    Profile the live API for `seconds`, or until `requests` predictions
+    were served (whichever comes first), then answer with the top
+    functions (JSON) or, with `download`, the raw profile: a pstats file
+    (cprofile) or collapsed stacks for flame graphs (sampling).
+    `memory` adds a tracemalloc diff of allocations made during the run
+    (JSON report only).
+    """
+    _require_admin(x_admin_token)
+    if download and memory:
+        raise HTTPException(status_code=400, detail="memory=true is only in the JSON report; drop download=true")
+    try:
+        session = profiler.start(mode=mode, requests=requests, memory=memory, interval_s=interval_ms / 1000)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    try:
+        await session.wait(seconds)
+    finally:
+        # the loop-thread profile is switched off here; waiting for in-flight
+        # model calls and merging the profiles happens off the event loop
+        profiler.detach()
+        await run_in_threadpool(session.finish)
+    logger.info("Profiled %s requests for %.1f s (%s)", session.requests_seen, session.seconds, mode)
+
+    if download:
+        body, media_type, filename = session.dump()
+        return Response(body, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+    return session.report(top=top)
+
 
-    # ✅ AUTO DRIFT CHECK every 100 predictions
-    total = get_prediction_count()
-    if total % 100 == 0 and total >= 100:
+async def _log_predictions(rows: List[dict]) -> None:
+    # write-behind when the logger thread runs (normal server); inline otherwise
+    if prediction_logger.running:
+        prediction_logger.submit_many(rows)
+    else:
+        await run_in_threadpool(_insert_predictions_timed, rows)
+
+
+def _insert_predictions_timed(rows: List[dict]) -> None:
+    with metrics.timer("sqlite_write"):
+        insert_predictions(rows)
+
+
+def _count_ratings(endpoint: str, results: list) -> None:
+    if metrics.enabled:
+        for rating, n in Counter(str(r[2]) for r in results).items():
+            metrics.inc("predictions_total", n, endpoint=endpoint, rating=rating)
+
+
+async def _run_model(payloads: List[dict], model: LoadedModel) -> list:
+    """
+    Model call off the event loop: through the micro-batcher for single rows
+    when it runs, on the bounded inference executor otherwise. Raises
+    Overloaded right away when the queue is full instead of growing the backlog.
+    """
+    if len(payloads) == 1 and micro_batcher.running:
         try:
-            baseline = load_baseline_stats("artifacts/drift_baseline.json")
-            inputs = fetch_prediction_inputs(limit=100)
-
-            if inputs:
-                df_new = pd.DataFrame(inputs)
-
-                # IMPORTANT: Make sure your payload keys match training features logic
-                # We will align columns to baseline schema after encoding
-                df_new_encoded = pd.get_dummies(df_new)
-
-                drift_df = zscore_drift(df_new_encoded, baseline, z_threshold=3.0)
-                drifted_count = int(drift_df["drift_flag"].sum())
-
-                report_payload = {
-                    "summary": {
-                        "total_features": int(drift_df.shape[0]),
-                        "drifted_features": drifted_count,
-                        "z_threshold": 3.0,
-                    },
-                    "top_20": drift_df.head(20).to_dict(orient="records"),
-                }
-
-                insert_drift_report(
-                    created_at=ts,
-                    model_version="v1",
-                    z_threshold=3.0,
-                    drifted_features_count=drifted_count,
-                    report=report_payload,
-                )
+            return [await asyncio.wrap_future(micro_batcher.submit(payloads[0], model))]
+        except queue.Full:
+            raise Overloaded(settings.INFERENCE_RETRY_AFTER_S)
+    return await inference_executor.run(profiler.wrap(predict_batch), payloads, model)
+
+
+async def _score(payloads: List[dict]) -> list:
+    """Cached results for payloads seen before (same model version), the model for the rest."""
+    # resolved once, so an /admin/models activate mid-request cannot score with
+    # one version and cache under the other
+    model = get_registry().active
+    if not prediction_cache.enabled:
+        return await _run_model(payloads, model)
+
+    with metrics.timer("cache_lookup"):
+        keys = [payload_key(p, model.version) for p in payloads]
+        results = [prediction_cache.get(k) for k in keys]
+    missing = [i for i, r in enumerate(results) if r is None]
+    if missing:
+        scored = await _run_model([payloads[i] for i in missing], model)
+        for i, result in zip(missing, scored):
+            results[i] = result
+            prediction_cache.put(keys[i], result)
+    return results
 
-                print(f"✅ Drift check saved at prediction #{total}")
 
-        except Exception as e:
-            print("❌ Drift check failed:", e)
+async def _score_or_503(payloads: List[dict]) -> list:
+    try:
+        return await _score(payloads)
+    except Overloaded as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Server overloaded, retry later",
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after_s)))},
+        )
+
+
+def _prediction_rows(payloads: List[dict], results: list, ts: str) -> List[dict]:
+    return [
+        {
+            "prediction_id": new_prediction_id(),
+            "created_at": ts,
+            "payload": payload,
+            "default_probability": float(p),
+            "credit_score": int(score),
+            "rating": str(rating),
+        }
+        for payload, (p, score, rating) in zip(payloads, results)
+    ]
+
+
+@app.post("/predict", response_model=PredictResponse)
+async def predict_endpoint(req: PredictRequest):
+    # FastAPI read and validated the body before calling us
+    metrics.observe_since_request_start("validation")
+    payload = req.model_dump()
+    p, score, rating = (await _score_or_503([payload]))[0]
+    _count_ratings("/predict", [(p, score, rating)])
+    profiler.request_done()
+
+    ts = datetime.now(timezone.utc).isoformat()
+    prediction_id = new_prediction_id()
+
+    await _log_predictions(
+        [
+            {
+                "prediction_id": prediction_id,
+                "created_at": ts,
+                "payload": payload,
+                "default_probability": float(p),
+                "credit_score": int(score),
+                "rating": str(rating),
+            }
+        ]
+    )
 
     return {
-        "prediction_id": f"sqlite-{row_id}",
+        "prediction_id": prediction_id,
         "default_probability": float(p),
         "credit_score": int(score),
         "rating": str(rating),
@@ -112,9 +401,168 @@ def predict_endpoint(req: PredictRequest):
     }
 
 
+@app.post("/predict-batch", response_model=List[PredictResponse])
+async def predict_batch_endpoint(reqs: List[PredictRequest]):
+    metrics.observe_since_request_start("validation")
+    payloads = [req.model_dump() for req in reqs]
+    results = await _score_or_503(payloads) if payloads else []
+    _count_ratings("/predict-batch", results)
+    profiler.request_done()
+
+    ts = datetime.now(timezone.utc).isoformat()
+
+    rows = _prediction_rows(payloads, results, ts)
+    if rows:
+        await _log_predictions(rows)
+
+    return [
+        {
+            "prediction_id": row["prediction_id"],
+            "default_probability": row["default_probability"],
+            "credit_score": row["credit_score"],
+            "rating": row["rating"],
+            "timestamp": ts,
+        }
+        for row in rows
+    ]
+
+
+async def _stream_chunk(pending: List[tuple]) -> bytes:
+    """
+    Score + log the valid lines of one chunk; result and error lines in input
+    order. If the executor stays full for STREAM_OVERLOAD_TIMEOUT_S, the
+    chunk's valid lines get an inline "overloaded" error instead.
+    """
+    payloads = [item for _, item in pending if isinstance(item, dict)]
+    results = []
+    deadline = time.monotonic() + settings.STREAM_OVERLOAD_TIMEOUT_S
+    while payloads:
+        try:
+            results = await _score(payloads)
+            break
+        except Overloaded:
+            if time.monotonic() >= deadline:
+                msg = f"Server overloaded for {settings.STREAM_OVERLOAD_TIMEOUT_S:g} s, retry these lines"
+                errors = [{"type": "overloaded", "msg": msg}]
+                pending = [(lineno, errors if isinstance(item, dict) else item) for lineno, item in pending]
+                payloads = []
+                break
+            # back-pressure: stop reading the upload until there is capacity again
+            await asyncio.sleep(STREAM_RETRY_S)
+    _count_ratings("/predict-stream", results)
+
+    ts = datetime.now(timezone.utc).isoformat()
+    rows = iter(_prediction_rows(payloads, results, ts))
+    out = []
+    logged = []
+    for lineno, item in pending:
+        if isinstance(item, dict):
+            row = next(rows)
+            logged.append(row)
+            out.append(
+                ndjson(
+                    {
+                        "line": lineno,
+                        "prediction_id": row["prediction_id"],
+                        "default_probability": row["default_probability"],
+                        "credit_score": row["credit_score"],
+                        "rating": row["rating"],
+                        "timestamp": ts,
+                    }
+                )
+            )
+        else:
+            out.append(ndjson({"line": lineno, "errors": item}))
+    if logged:
+        await _log_predictions(logged)
+    return b"".join(out)
+
+
+async def _stream_predictions(body: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    pending: List[tuple] = []
+    async for lineno, line in iter_ndjson_lines(body, settings.STREAM_MAX_LINE_BYTES):
+        if line is None:
+            msg = f"Line exceeds {settings.STREAM_MAX_LINE_BYTES} bytes"
+            pending.append((lineno, [{"type": "line_too_long", "msg": msg}]))
+        elif line.strip():
+            payload, errors = parse_request_line(line)
+            pending.append((lineno, payload if errors is None else errors))
+        if len(pending) >= settings.STREAM_CHUNK_ROWS:
+            yield await _stream_chunk(pending)
+            pending = []
+    if pending:
+        yield await _stream_chunk(pending)
+
+
+@app.post("/predict-stream")
+async def predict_stream(request: Request):
+    """
+    NDJSON in, NDJSON out: one PredictRequest per line. Lines are scored in
+    chunks of STREAM_CHUNK_ROWS as the upload arrives and results stream back
+    per chunk. Invalid lines get an inline {"line", "errors"} entry.
+    """
+    return NDJSONStreamingResponse(_stream_predictions(request.stream()))
+
+
 @app.get("/logs")
-def logs(limit: int = 20):
-    return fetch_logs(limit=limit)
+def logs(
+    response: Response,
+    limit: int = Query(20, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    rating: Optional[Literal["Poor", "Average", "Good", "Excellent", "Undefined"]] = None,
+    min_score: Optional[int] = Query(None, ge=300, le=900),
+    max_score: Optional[int] = Query(None, ge=300, le=900),
+):
+    """Newest logs first; pass the X-Next-Cursor header back as `cursor` for the next page."""
+    try:
+        page = fetch_logs_page(
+            limit=limit,
+            cursor=cursor,
+            since=since,
+            until=until,
+            rating=rating,
+            min_score=min_score,
+            max_score=max_score,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return page["items"]
+
+@app.get("/analytics")
+def analytics(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    score_bins: int = Query(6, ge=1, le=60),
+    score_edges: Optional[List[int]] = Query(None),
+    quantiles: List[float] = Query(list(DEFAULT_QUANTILES)),
+):
+    """Dashboard aggregates over [since, until), computed in SQL."""
+    try:
+        return compute_analytics(
+            since=since,
+            until=until,
+            bins=score_bins,
+            edges=score_edges,
+            quantiles=quantiles,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/analytics/trend")
+def analytics_trend(
+    grain: Literal["hour", "day"] = "day",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+):
+    """Per-hour / per-day metrics from the rollup tables, oldest first."""
+    return compute_trend(grain=grain, since=since, until=until, limit=limit)
+
 
 @app.get("/drift-reports")
 def drift_reports(limit: int = 5):
@@ -0,0 +1,245 @@
+import bisect
+import contextlib
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.settings import settings
+
+NAMESPACE = "credit_api"
+
+# seconds; covers a cached hit (~50 us) up to a slow drift run
+LATENCY_BUCKETS_S = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# rows per micro-batch (powers of two up to a large PREDICT_BATCH_MAX_ROWS)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+# name -> (type, help); every metric recorded must be declared here
+FAMILIES = {
+    "stage_duration_seconds": ("histogram", "Time spent in one processing stage"),
+    "request_duration_seconds": ("histogram", "HTTP request latency by endpoint"),
+    "micro_batch_size": ("histogram", "Rows scored per micro-batch"),
+    "micro_batch_queue_delay_seconds": ("histogram", "Time a row waited in the micro-batcher queue"),
+    "predictions_total": ("counter", "Predictions served, by endpoint and rating"),
+    "job_runs_total": ("counter", "Background job (drift check, retention) runs by outcome"),
+}
+
+# histogram families not measured in seconds (the rest use the Metrics buckets)
+FAMILY_BUCKETS: Dict[str, Tuple[float, ...]] = {"micro_batch_size": BATCH_SIZE_BUCKETS}
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+# perf_counter() when the current request reached the app (set by MetricsMiddleware)
+request_started: ContextVar[Optional[float]] = ContextVar("request_started", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus `le` semantics)."""
+
+    def __init__(self, bounds: Iterable[float] = LATENCY_BUCKETS_S):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        out, total = [], 0
+        for bound, n in zip(self.bounds + (float("inf"),), self.counts):
+            total += n
+            out.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return out
+
+
+class _StageTimer:
+    __slots__ = ("metrics", "stage", "start")
+
+    def __init__(self, metrics: "Metrics", stage: str):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self) -> "_StageTimer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.metrics.observe_stage(self.stage, time.perf_counter() - self.start)
+
+
+_NO_TIMER = contextlib.nullcontext()
+
+
+class Metrics:
+    """
+    Process-local histograms and counters, rendered in the Prometheus text
+    format. With `enabled=False` every call returns right away and `timer()`
+    hands back a shared no-op context manager, so the instrumented hot path
+    pays one attribute check per stage.
+    """
+
+    def __init__(self, enabled: bool = True, buckets: Iterable[float] = LATENCY_BUCKETS_S):
+        self.enabled = bool(enabled)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, LabelSet], Histogram] = {}
+        self._counters: Dict[Tuple[str, LabelSet], float] = {}
+        # stage -> its stage_duration_seconds histogram (skips building the label key per call)
+        self._stages: Dict[str, Histogram] = {}
+
+    # -----------------------------------
+    # Recording
+    # -----------------------------------
+    def _histogram(self, name: str, labels: LabelSet) -> Histogram:
+        # caller holds the lock
+        hist = self._histograms.get((name, labels))
+        if hist is None:
+            hist = self._histograms[(name, labels)] = Histogram(FAMILY_BUCKETS.get(name, self.buckets))
+        return hist
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._histogram(name, tuple(labels.items())).observe(value)
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = (name, tuple(labels.items()))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            hist = self._stages.get(stage)
+            if hist is None:
+                hist = self._stages[stage] = self._histogram("stage_duration_seconds", (("stage", stage),))
+            hist.observe(seconds)
+
+    def timer(self, stage: str):
+        """`with metrics.timer("inference"): ...` records the block's duration."""
+        return _StageTimer(self, stage) if self.enabled else _NO_TIMER
+
+    def observe_since_request_start(self, stage: str) -> None:
+        """Time from the request reaching the app until now (e.g. body parsing + validation)."""
+        started = request_started.get()
+        if self.enabled and started is not None:
+            self.observe_stage(stage, time.perf_counter() - started)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._stages.clear()
+
+    # -----------------------------------
+    # Exposition
+    # -----------------------------------
+    def render(
+        self,
+        gauges: Optional[Dict[str, Tuple[str, float]]] = None,
+        counters: Optional[Dict[str, Tuple[str, float]]] = None,
+    ) -> str:
+        """
+        Prometheus text format (version 0.0.4). `gauges` and `counters` map
+        extra metric names to (help, value), read at scrape time: gauges for
+        values that go up and down (queue depths), counters for running
+        totals kept elsewhere (rejections, cache hits; names end in _total).
+        """
+        with self._lock:
+            histograms = [(k, h.cumulative(), h.sum, h.count) for k, h in self._histograms.items()]
+            recorded = list(self._counters.items())
+
+        lines: List[str] = []
+        for family, (kind, help_text) in FAMILIES.items():
+            name = f"{NAMESPACE}_{family}"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            if kind == "histogram":
+                for (fam, labels), buckets, total, count in sorted(histograms):
+                    if fam != family:
+                        continue
+                    for le, n in buckets:
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {n}")
+                    lines.append(f"{name}_sum{_labels(labels)} {total!r}")
+                    lines.append(f"{name}_count{_labels(labels)} {count}")
+            else:
+                for (fam, labels), value in sorted(recorded):
+                    if fam == family:
+                        lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+        for kind, extra in (("counter", counters), ("gauge", gauges)):
+            for family, (help_text, value) in (extra or {}).items():
+                name = f"{NAMESPACE}_{family}"
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {_number(value)}"]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: LabelSet) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+# -----------------------------------
+# Per-endpoint latency
+# -----------------------------------
+class MetricsMiddleware:
+    """
+    Plain ASGI middleware (no BaseHTTPMiddleware task / body copy): times
+    every HTTP request and records it under the matched route template, so
+    `/admin/models/v2/activate` and `/admin/models/v3/activate` share a series.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: "Metrics"):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.metrics.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        token = request_started.set(start)
+        status = 500
+
+        async def send_and_record_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_record_status)
+        finally:
+            request_started.reset(token)
+            route = scope.get("route")
+            self.metrics.observe(
+                "request_duration_seconds",
+                time.perf_counter() - start,
+                endpoint=getattr(route, "path", "unmatched"),
+                method=scope["method"],
+                status=str(status),
+            )
+
+
+metrics = Metrics(enabled=settings.METRICS_ENABLED)
@@ -0,0 +1,187 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from api.metrics import BATCH_SIZE_BUCKETS, Histogram, metrics
+from api.model_loader import LoadedModel
+from api.predictor import predict_batch
+
+_POLL_S = 0.05
+
+# payload, its future, when it was queued, the model it is pinned to (if any)
+_Item = Tuple[dict, Future, float, Optional[LoadedModel]]
+
+# /stats histogram upper bounds (the last bucket is open-ended)
+QUEUE_DELAY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100)
+
+
+def _summary(hist: Histogram) -> Dict[str, Any]:
+    labels = [f"<={b:g}" for b in hist.bounds] + [f">{hist.bounds[-1]:g}"]
+    return {
+        "count": hist.count,
+        "mean": hist.sum / hist.count if hist.count else None,
+        "buckets": dict(zip(labels, hist.counts)),
+    }
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-row predictions into one vectorized call.
+
+    Callers get a Future right away. A background thread takes the first
+    waiting request, keeps collecting for up to `max_wait_ms` (or until
+    `max_batch` rows are waiting), scores them with one `score_fn` call (one
+    per model, when callers pinned different ones) and resolves every future.
+    Under light traffic a request waits at most `max_wait_ms`; under load the
+    batches fill up and throughput goes up.
+    """
+
+    def __init__(
+        self,
+        max_batch: int = 64,
+        max_wait_ms: float = 2.0,
+        max_queue: int = 10_000,
+        score_fn: Callable[..., List[Any]] = predict_batch,
+        wrap: Callable[[Callable[..., Any]], Callable[..., Any]] = lambda fn: fn,
+    ):
+        self.max_batch = max(int(max_batch), 1)
+        self.max_wait_s = max(float(max_wait_ms), 0.0) / 1000
+        self.max_queue = int(max_queue)
+        self.score_fn = score_fn
+        # applied to score_fn per batch, e.g. Profiler.wrap so profiling sessions see the batcher thread
+        self.wrap = wrap
+
+        self._queue: "queue.Queue[_Item]" = queue.Queue(maxsize=self.max_queue)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self.submitted = 0
+        self.rejected = 0
+        self.batches = 0
+        self.failed_batches = 0
+        # per-batcher copies for /stats; /metrics gets the same through api.metrics
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_delay_ms = Histogram(QUEUE_DELAY_BUCKETS_MS)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # -----------------------------------
+    # Lifecycle
+    # -----------------------------------
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Score everything still queued, then stop the batching thread."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    # -----------------------------------
+    # Caller side
+    # -----------------------------------
+    def submit(self, payload: dict, model: Optional[LoadedModel] = None) -> Future:
+        """
+        Queue one payload; the future resolves to its score_fn result.
+        Pass `model` to pin a version (default: score_fn's own). Raises queue.Full.
+        """
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((payload, future, time.perf_counter(), model))
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            raise
+        with self._lock:
+            self.submitted += 1
+        return future
+
+    def predict(self, payload: dict, timeout: Optional[float] = None, model: Optional[LoadedModel] = None) -> Any:
+        return self.submit(payload, model).result(timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self.running,
+                "max_batch": self.max_batch,
+                "max_wait_ms": self.max_wait_s * 1000,
+                "queue_depth": self._queue.qsize(),
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "batches": self.batches,
+                "failed_batches": self.failed_batches,
+                "batch_size": _summary(self.batch_sizes),
+                "queue_delay_ms": _summary(self.queue_delay_ms),
+            }
+
+    # -----------------------------------
+    # Batching thread
+    # -----------------------------------
+    def _next_batch(self) -> List["_Item"]:
+        try:
+            # short polls so stop() is noticed while idle
+            first = self._queue.get(timeout=_POLL_S)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        deadline = first[2] + self.max_wait_s
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+        return batch
+
+    def _score(self, batch: List["_Item"]) -> None:
+        start = time.perf_counter()
+        delays = [start - enqueued for _, _, enqueued, _ in batch]
+        with self._lock:
+            self.batches += 1
+            self.batch_sizes.observe(len(batch))
+            for delay in delays:
+                self.queue_delay_ms.observe(delay * 1000)
+        if metrics.enabled:
+            metrics.observe("micro_batch_size", len(batch))
+            for delay in delays:
+                metrics.observe("micro_batch_queue_delay_seconds", delay)
+
+        by_model: Dict[Optional[LoadedModel], List[Tuple[dict, Future]]] = {}
+        for payload, future, _, model in batch:
+            if future.set_running_or_notify_cancel():
+                by_model.setdefault(model, []).append((payload, future))
+        for model, live in by_model.items():
+            self._score_live(live, model)
+
+    def _score_live(self, live: List[Tuple[dict, Future]], model: Optional[LoadedModel]) -> None:
+        payloads = [payload for payload, _ in live]
+        try:
+            score = self.wrap(self.score_fn)
+            results = score(payloads) if model is None else score(payloads, model)
+        except Exception as e:
+            with self._lock:
+                self.failed_batches += 1
+            for _, future in live:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(live, results):
+            future.set_result(result)
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._score(batch)
@@ -1,16 +1,183 @@
-from functools import lru_cache
+import hashlib
+import logging
+import warnings
 from pathlib import Path
+from typing import Any, Dict, Optional
 import joblib
 
+from api.feature_encoder import FeatureEncoder
+from api.scorers import (
+    TREE_PARITY_ATOL,
+    SklearnScorer,
+    TreeEnsembleScorer,
+    build_scorer,
+    compile_tree_scorer,
+    max_parity_error,
+    parity_sample,
+)
+from api.tree_ensemble import TreeEnsemble
+
 # project root: E:\credit risk modelling\
 BASE_DIR = Path(__file__).resolve().parents[1]
 
-# model artifact path (versioned)
-MODEL_PATH = BASE_DIR / "artifacts" / "model_data_v1.joblib"
+# compiled artifacts sit next to the original: model_data_v2.compiled.joblib
+COMPILED_SUFFIX = ".compiled.joblib"
+
+logger = logging.getLogger(__name__)
+
+
+def compiled_path_for(model_path: Path) -> Path:
+    return model_path.with_name(model_path.name.replace(".joblib", "") + COMPILED_SUFFIX)
+
+
+def source_fingerprint(path: Path) -> Dict[str, Any]:
+    """Size + SHA-256 of an artifact file, stored in the compiled twin's meta."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return {"size": Path(path).stat().st_size, "sha256": digest.hexdigest()}
+
+
+def _compiled_is_current(meta: Dict[str, Any], path: Path) -> bool:
+    # a compiled twin shipped without its source is served as is
+    if not path.exists():
+        return True
+    source = meta.get("source")
+    if not source or source.get("size") != path.stat().st_size:
+        return False
+    return source == source_fingerprint(path)
+
+
+# -----------------------------------
+# Compiled tree-ensemble artifacts
+# -----------------------------------
+def export_compiled(
+    md: Dict[str, Any],
+    out_path: Path,
+    atol: float = TREE_PARITY_ATOL,
+    source: Optional[Path] = None,
+) -> float:
+    """
+    Flatten an XGBoost artifact into plain NumPy arrays and save it.
+    Refuses to write when the compiled model disagrees with predict_proba.
+    `source` is the artifact file `md` was loaded from; its fingerprint
+    lets load_model tell when the compiled twin is stale.
+    Returns the max absolute probability difference.
+    """
+    encoder = FeatureEncoder.from_model_data(md)
+    scorer = compile_tree_scorer(md["model"], encoder)
+    if scorer is None:
+        raise ValueError(f"Cannot compile model of type {type(md['model']).__name__}")
+
+    err = max_parity_error(scorer, SklearnScorer(md["model"], encoder), parity_sample(n=2048))
+    if err > atol:
+        raise ValueError(f"Compiled model off by {err:.3g} (> {atol}) vs predict_proba")
+
+    meta = {
+        "model_type": type(md["model"]).__name__,
+        "scaler_type": type(md["scaler"]).__name__,
+        "cols_to_scale": [str(c) for c in md["cols_to_scale"]],
+        "max_parity_error": err,
+        "source": source_fingerprint(source) if source is not None else None,
+    }
+    save_compiled(meta, encoder, scorer.ensemble, out_path)
+    return err
+
+
+def save_compiled(meta: Dict[str, Any], encoder: FeatureEncoder, ensemble: TreeEnsemble, out_path: Path) -> None:
+    # uncompressed on purpose: joblib can only memory-map arrays of uncompressed files
+    joblib.dump({"meta": meta, "encoder": encoder.to_dict(), "trees": ensemble.to_dict()}, out_path)
+
+
+def load_compiled(path: Path, mmap_mode: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Only NumPy arrays and builtins inside: no sklearn/xgboost import.
+    With mmap_mode="r" the arrays stay in the OS page cache, shared by
+    every worker process that maps the same file.
+    """
+    blob = joblib.load(path, mmap_mode=mmap_mode or None)
+    encoder = FeatureEncoder.from_dict(blob["encoder"])
+    return {
+        "meta": blob["meta"],
+        "encoder": encoder,
+        "ensemble": TreeEnsemble.from_dict(blob["trees"]),
+    }
+
+
+# -----------------------------------
+# One loaded model version
+# -----------------------------------
+class LoadedModel:
+    """Everything needed to serve one artifact version (immutable once built)."""
+
+    def __init__(
+        self,
+        version: str,
+        path: Path,
+        scorer: Any,
+        encoder: FeatureEncoder,
+        info: Dict[str, Any],
+        size_bytes: int,
+    ):
+        self.version = version
+        self.path = path
+        self.scorer = scorer
+        self.encoder = encoder
+        self.info = info
+        self.size_bytes = size_bytes
+
 
+def load_model(path: Path, version: str, mmap_mode: Optional[str] = None) -> LoadedModel:
+    """
+    Load one artifact. Prefers the compiled twin when it exists and was
+    built from this artifact file (no sklearn/xgboost import); otherwise
+    the fused linear scorer when possible, sklearn predict_proba as the
+    fallback. `mmap_mode` maps NumPy arrays read-only instead of copying
+    them into the process.
+    """
+    path = Path(path)
+    compiled_path = compiled_path_for(path)
+    compiled = load_compiled(compiled_path, mmap_mode=mmap_mode) if compiled_path.exists() else None
+    if compiled is not None and not _compiled_is_current(compiled["meta"], path):
+        logger.warning("Ignoring %s: not built from the current %s, recompile it", compiled_path.name, path.name)
+        compiled = None
+    if compiled is not None:
+        meta = compiled["meta"]
+        encoder = compiled["encoder"]
+        return LoadedModel(
+            version=version,
+            path=path,
+            scorer=TreeEnsembleScorer(compiled["ensemble"], encoder),
+            encoder=encoder,
+            info={
+                "model_type": meta["model_type"],
+                "scaler_type": meta["scaler_type"],
+                "n_features": encoder.n_features,
+                "cols_to_scale": list(meta["cols_to_scale"]),
+            },
+            size_bytes=compiled_path.stat().st_size,
+        )
 
-@lru_cache(maxsize=1)
-def get_model_data():
-    if not MODEL_PATH.exists():
-        raise FileNotFoundError(f"Model not found: {MODEL_PATH}")
-    return joblib.load(MODEL_PATH)
+    if not path.exists():
+        raise FileNotFoundError(f"Model not found: {path}")
+    with warnings.catch_warnings():
+        # compressed artifacts cannot be mapped; joblib then just reads them
+        warnings.filterwarnings("ignore", message=".*mmap_mode.*")
+        md = joblib.load(path, mmap_mode=mmap_mode or None)
+    # compiled once per loaded artifact (column indexes + scaler params)
+    encoder = FeatureEncoder.from_model_data(md)
+    return LoadedModel(
+        version=version,
+        path=path,
+        scorer=build_scorer(md, encoder),
+        encoder=encoder,
+        info={
+            "model_type": type(md["model"]).__name__,
+            "scaler_type": type(md["scaler"]).__name__,
+            "n_features": len(md["features"]),
+            "cols_to_scale": list(md["cols_to_scale"]),
+        },
+        # on-disk pickle size is a good proxy for the in-memory footprint
+        size_bytes=path.stat().st_size,
+    )
@@ -0,0 +1,188 @@
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from api.model_loader import BASE_DIR, LoadedModel, load_model
+from api.settings import settings
+
+_VERSION_RE = re.compile(r"^model_data_(v\d+)(\.compiled)?\.joblib$")
+
+
+def _version_key(version: str) -> int:
+    return int(version[1:])
+
+
+class ModelRegistry:
+    """
+    All `model_data_v*.joblib` versions in one directory.
+
+    Versions load lazily on first use and stay in an LRU cache bounded by
+    `max_bytes` (the active version is never evicted). `activate()` loads
+    the new version first and then swaps one reference, so a request that
+    already picked up `active` finishes on the model it started with.
+    """
+
+    def __init__(self, artifact_dir: Path, default_version: str, max_bytes: int, mmap_mode: Optional[str] = None):
+        self.artifact_dir = Path(artifact_dir)
+        self.max_bytes = int(max_bytes)
+        self.mmap_mode = mmap_mode or None
+        self._active_version = default_version
+
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, LoadedModel]" = OrderedDict()
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+        self.loads = 0
+        self.evictions = 0
+        self.swaps = 0
+
+    # -----------------------------------
+    # Discovery
+    # -----------------------------------
+    def discover(self) -> Dict[str, Path]:
+        """version -> artifact path, oldest version first (a compiled twin alone is enough)."""
+        found = {}
+        for path in self.artifact_dir.glob("model_data_v*.joblib"):
+            m = _VERSION_RE.match(path.name)
+            if m:
+                found[m.group(1)] = self.artifact_dir / f"model_data_{m.group(1)}.joblib"
+        return dict(sorted(found.items(), key=lambda kv: _version_key(kv[0])))
+
+    def path_for(self, version: str) -> Path:
+        path = self.discover().get(version)
+        if path is None:
+            raise KeyError(f"Unknown model version: {version}")
+        return path
+
+    # -----------------------------------
+    # Loading / cache
+    # -----------------------------------
+    def get(self, version: str) -> LoadedModel:
+        with self._lock:
+            model = self._cache.get(version)
+            if model is not None:
+                self._cache.move_to_end(version)
+                return model
+            load_lock = self._load_locks.setdefault(version, threading.Lock())
+
+        # one loader per version; other versions keep serving meanwhile
+        with load_lock:
+            with self._lock:
+                model = self._cache.get(version)
+            if model is None:
+                model = load_model(self.path_for(version), version, mmap_mode=self.mmap_mode)
+                with self._lock:
+                    self._cache[version] = model
+                    self.loads += 1
+                    self._evict(keep=version)
+        return model
+
+    def _evict(self, keep: str) -> None:
+        # caller holds self._lock
+        total = sum(m.size_bytes for m in self._cache.values())
+        for version in list(self._cache):
+            if total <= self.max_bytes:
+                break
+            if version in (keep, self._active_version):
+                continue
+            total -= self._cache.pop(version).size_bytes
+            self.evictions += 1
+
+    # -----------------------------------
+    # Active version
+    # -----------------------------------
+    @property
+    def active_version(self) -> str:
+        return self._active_version
+
+    @property
+    def active(self) -> LoadedModel:
+        return self.get(self._active_version)
+
+    def activate(self, version: str) -> LoadedModel:
+        """Load `version` (outside the swap) and make it the active model."""
+        model = self.get(version)
+        with self._lock:
+            self._active_version = version
+            self.swaps += 1
+            self._evict(keep=version)
+        return model
+
+    def versions(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            cached = dict(self._cache)
+            active = self._active_version
+        return [
+            {
+                "version": version,
+                "artifact_path": _display_path(path),
+                "active": version == active,
+                "loaded": version in cached,
+                "size_bytes": cached[version].size_bytes if version in cached else None,
+            }
+            for version, path in self.discover().items()
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "active_version": self._active_version,
+                "loaded_versions": list(self._cache),
+                "cached_bytes": sum(m.size_bytes for m in self._cache.values()),
+                "max_bytes": self.max_bytes,
+                "mmap_mode": self.mmap_mode,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "swaps": self.swaps,
+            }
+
+
+def _display_path(path: Path) -> str:
+    try:
+        return Path(path).relative_to(BASE_DIR).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def _default_registry() -> ModelRegistry:
+    # MODEL_PATH names the directory to scan; MODEL_VERSION the version served at startup
+    return ModelRegistry(
+        artifact_dir=(BASE_DIR / settings.MODEL_PATH).parent,
+        default_version=settings.MODEL_VERSION,
+        max_bytes=int(settings.MODEL_CACHE_MAX_MB * 1024 * 1024),
+        mmap_mode=settings.MODEL_MMAP_MODE,
+    )
+
+
+registry = _default_registry()
+
+
+# -----------------------------------
+# Serving entry points
+# -----------------------------------
+def get_registry() -> ModelRegistry:
+    return registry
+
+
+def get_active_model() -> LoadedModel:
+    return registry.active
+
+
+def get_feature_encoder():
+    return registry.active.encoder
+
+
+def get_scorer():
+    return registry.active.scorer
+
+
+def get_model_info() -> Dict[str, Any]:
+    model = registry.active
+    return {
+        **model.info,
+        "model_version": model.version,
+        "artifact_path": _display_path(model.path),
+        "scorer": model.scorer.name,
+    }
@@ -0,0 +1,77 @@
+import json
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from pydantic import ValidationError
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from api.schemas import PredictRequest
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = 65_536
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Split a byte stream into (line number, line) as the bytes arrive.
+
+    Only the current partial line is buffered. A line longer than
+    `max_line_bytes` is skipped (yielded as None) instead of being held in
+    memory, so memory stays flat however large the upload is.
+    """
+    buf = bytearray()
+    lineno = 0
+    oversized = False
+    async for chunk in chunks:
+        start = 0
+        while True:
+            nl = chunk.find(b"\n", start)
+            if nl < 0:
+                if not oversized:
+                    buf += chunk[start:]
+                    if len(buf) > max_line_bytes:
+                        oversized = True
+                        buf.clear()
+                break
+            lineno += 1
+            if not oversized:
+                buf += chunk[start:nl]
+            yield lineno, (None if oversized or len(buf) > max_line_bytes else bytes(buf))
+            buf.clear()
+            oversized = False
+            start = nl + 1
+    if buf or oversized:
+        yield lineno + 1, None if oversized else bytes(buf)
+
+
+def parse_request_line(line: bytes) -> Tuple[Optional[Dict[str, Any]], Optional[list]]:
+    """(validated payload, None) or (None, pydantic errors) for one NDJSON line."""
+    try:
+        return PredictRequest.model_validate_json(line).model_dump(), None
+    except ValidationError as e:
+        return None, json.loads(e.json(include_url=False, include_input=False))
+
+
+def ndjson(obj: Dict[str, Any]) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode() + b"\n"
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body iterator may still be reading the request.
+
+    Starlette's version listens for client disconnects by calling `receive`
+    alongside the body iterator, which would swallow request body chunks.
+    Here `receive` is left to `request.stream()` only (it raises
+    ClientDisconnect itself).
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
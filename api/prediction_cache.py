@@ -0,0 +1,81 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def payload_key(payload: Dict[str, Any], model_version: str) -> str:
+    """Hash of the validated payload (sorted keys) plus the model version that scored it."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(f"{model_version}|{canonical}".encode(), digest_size=16).hexdigest()
+
+
+class PredictionCache:
+    """
+    LRU + TTL cache of prediction results.
+
+    Keys include the model version, so a swapped model never serves the old
+    version's scores; `clear()` on a swap also frees the memory right away.
+    `max_entries=0` disables the cache (every lookup is a miss, nothing is stored).
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl_s: float = 300.0):
+        self.max_entries = max(int(max_entries), 0)
+        self.ttl_s = float(ttl_s)
+
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_s > 0 and time.monotonic() - entry[0] > self.ttl_s:
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl_s,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "expired": self.expired,
+                "evictions": self.evictions,
+            }
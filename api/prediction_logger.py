@@ -0,0 +1,172 @@
+import logging
+import queue
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from api.db_sqlite import insert_predictions
+from api.metrics import metrics
+
+_POLL_S = 0.05
+
+logger = logging.getLogger(__name__)
+
+
+def new_prediction_id() -> str:
+    # assigned by the app so the response never waits for the INSERT
+    return f"pred-{uuid.uuid4().hex}"
+
+
+class PredictionLogger:
+    """
+    Write-behind logger for prediction rows.
+
+    Requests put rows on a bounded in-memory queue and return at once.
+    A background thread writes them with one `executemany` + commit per
+    batch, flushing when `batch_size` rows are waiting or `flush_interval`
+    seconds after the first row of a batch arrived. When the queue is full
+    rows are dropped (and counted) instead of blocking the request.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        writer: Callable[[List[Dict[str, Any]]], Any] = insert_predictions,
+        on_flush: Optional[Callable[[int], None]] = None,
+    ):
+        self.max_queue = int(max_queue)
+        self.batch_size = int(batch_size)
+        self.flush_interval = float(flush_interval)
+        self.writer = writer
+        self.on_flush = on_flush
+
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=self.max_queue)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # -----------------------------------
+    # Lifecycle
+    # -----------------------------------
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="prediction-logger", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Write everything still queued, then stop the writer thread."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def flush(self) -> None:
+        """Block until every row queued so far has been written."""
+        self._queue.join()
+
+    # -----------------------------------
+    # Producer side
+    # -----------------------------------
+    def submit(self, row: Dict[str, Any]) -> bool:
+        """Queue one row. Returns False if it was dropped."""
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.enqueued += 1
+        return True
+
+    def submit_many(self, rows: List[Dict[str, Any]]) -> int:
+        return sum(self.submit(row) for row in rows)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self.running,
+                "queue_depth": self._queue.qsize(),
+                "max_queue": self.max_queue,
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "flushes": self.flushes,
+            }
+
+    # -----------------------------------
+    # Writer thread
+    # -----------------------------------
+    def _get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        # short polls so stop() is noticed even with a long flush_interval
+        deadline = time.monotonic() + timeout
+        while True:
+            if self._stop.is_set():
+                try:
+                    return self._queue.get_nowait()
+                except queue.Empty:
+                    return None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                return self._queue.get(timeout=min(remaining, _POLL_S))
+            except queue.Empty:
+                continue
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        first = self._get(self.flush_interval)
+        if first is None:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            row = self._get(deadline - time.monotonic())
+            if row is None:
+                break
+            batch.append(row)
+        return batch
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            with metrics.timer("sqlite_write"):
+                self.writer(batch)
+            with self._lock:
+                self.written += len(batch)
+                self.flushes += 1
+            if self.on_flush is not None:
+                try:
+                    self.on_flush(len(batch))
+                except Exception as e:
+                    logger.error("Prediction log flush hook failed: %s", e)
+        except Exception as e:
+            with self._lock:
+                self.failed += len(batch)
+            logger.error("Prediction log write failed: %s", e)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
@@ -1,63 +1,26 @@
-import pandas as pd
-from api.model_loader import get_model_data
+import time
+from typing import TYPE_CHECKING, List, Literal, Optional, Tuple, get_args, get_origin
 
+from api.model_loader import LoadedModel
+from api.model_registry import get_active_model, get_feature_encoder
+from api.schemas import PredictRequest
 
-def prepare_input(payload: dict) -> pd.DataFrame:
-    md = get_model_data()
-    scaler = md["scaler"]
-    features = md["features"]
-    cols_to_scale = md["cols_to_scale"]
+if TYPE_CHECKING:
+    import pandas as pd
 
-    income = float(payload["income"])
-    loan_amount = float(payload["loan_amount"])
 
-    data = {
-        "age": float(payload["age"]),
-        "loan_tenure_months": float(payload["loan_tenure_months"]),
-        "number_of_open_accounts": float(payload["num_open_accounts"]),
-        "credit_utilization_ratio": float(payload["credit_utilization_ratio"]),
-        "loan_to_income": (loan_amount / income) if income > 0 else 0.0,
-        "delinquency_ratio": float(payload["delinquency_ratio"]),
-        "avg_dpd_per_delinquency": float(payload["avg_dpd_per_delinquency"]),
+def prepare_inputs(payloads: List[dict]) -> "pd.DataFrame":
+    import pandas as pd
 
-        # ✅ IMPORTANT: use int(…)
-        "residence_type_Owned": int(payload["residence_type"] == "Owned"),
-        "residence_type_Rented": int(payload["residence_type"] == "Rented"),
-        "loan_purpose_Education": int(payload["loan_purpose"] == "Education"),
-        "loan_purpose_Home": int(payload["loan_purpose"] == "Home"),
-        "loan_purpose_Personal": int(payload["loan_purpose"] == "Personal"),
-        "loan_type_Unsecured": int(payload["loan_type"] == "Unsecured"),
-    }
+    encoder = get_feature_encoder()
+    return pd.DataFrame(encoder.encode_many(payloads), columns=encoder.features)
 
-    df = pd.DataFrame([data])
 
-    # ✅ Make sure scaler gets exactly what it expects (columns + numeric dtype)
-    for c in cols_to_scale:
-        if c not in df.columns:
-            df[c] = 0.0
+def prepare_input(payload: dict) -> "pd.DataFrame":
+    return prepare_inputs([payload])
 
-    df[cols_to_scale] = scaler.transform(df[cols_to_scale])
-
-    # ✅ Align to training features & force numeric dtype
-    df = df.reindex(columns=features, fill_value=0)
-    df = df.astype(float)
-
-    return df
-
-
-def predict(payload: dict):
-    md = get_model_data()
-    model = md["model"]
-
-    X = prepare_input(payload)
-
-    # ✅ Use sklearn directly (no manual np.exp)
-    if hasattr(model, "predict_proba"):
-        p_default = float(model.predict_proba(X)[0, 1])
-    else:
-        # fallback (rare)
-        p_default = float(model.predict(X)[0])
 
+def score_to_rating(p_default: float) -> Tuple[int, str]:
     credit_score = int(300 + (1 - p_default) * 600)
 
     if credit_score < 500:
@@ -69,4 +32,66 @@ def predict(payload: dict):
     else:
         rating = "Excellent"
 
-    return p_default, credit_score, rating
+    return credit_score, rating
+
+
+def predict_batch(payloads: List[dict], model: Optional[LoadedModel] = None) -> List[Tuple[float, int, str]]:
+    """
+    Score many applicants with one model call.
+    Results are returned in the same order as `payloads`.
+    Pass `model` to pin a version (default: the active one).
+    """
+    if not payloads:
+        return []
+
+    model = model or get_active_model()
+    probs = model.scorer.predict_proba(payloads)
+
+    results = []
+    for p in probs:
+        p_default = float(p)
+        credit_score, rating = score_to_rating(p_default)
+        results.append((p_default, credit_score, rating))
+    return results
+
+
+def predict(payload: dict, model: Optional[LoadedModel] = None):
+    return predict_batch([payload], model=model)[0]
+
+
+# -----------------------------------
+# Warm-up (run before the API reports ready)
+# -----------------------------------
+def warmup_payloads(n: int = 32) -> List[dict]:
+    """Valid synthetic requests spread over each field's range and every category."""
+    payloads = []
+    for i in range(n):
+        frac = i / max(n - 1, 1)
+        payload = {}
+        for name, field in PredictRequest.model_fields.items():
+            if get_origin(field.annotation) is Literal:
+                values = get_args(field.annotation)
+                payload[name] = values[i % len(values)]
+                continue
+            lo, hi = 0.0, 5_000_000.0
+            for m in field.metadata:
+                lo = float(getattr(m, "ge", lo))
+                hi = float(getattr(m, "le", hi))
+            value = lo + frac * (hi - lo)
+            payload[name] = int(value) if field.annotation is int else value
+        payloads.append(PredictRequest(**payload).model_dump())
+    return payloads
+
+
+def warm_up(model: Optional[LoadedModel] = None, rows: int = 32) -> float:
+    """
+    Load `model` (default: active) and push single and batched requests
+    through it, so the first real request pays no first-use costs.
+    Returns the time taken in ms.
+    """
+    start = time.perf_counter()
+    model = model or get_active_model()
+    payloads = warmup_payloads(max(rows, 1))
+    predict_batch(payloads[:1], model=model)
+    predict_batch(payloads, model=model)
+    return (time.perf_counter() - start) * 1000
@@ -0,0 +1,338 @@
+import asyncio
+import cProfile
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+MODES = ("cprofile", "sampling")
+
+# frames deeper than this are cut from sampled stacks (the root side is kept)
+MAX_STACK_DEPTH = 64
+
+# leaf frames of threads parked waiting for work; counted as idle, not ranked
+IDLE_LEAVES = {("threading.py", "wait"), ("selectors.py", "select"), ("thread.py", "_worker")}
+
+Frame = Tuple[str, int, str]  # (filename, first line, function)
+
+
+def _frame_label(frame: Frame) -> str:
+    filename, line, func = frame
+    return f"{func} ({os.path.basename(filename)}:{line})"
+
+
+class ProfileSession:
+    """
+    One profiling run.
+
+    "cprofile": deterministic. The event loop thread is profiled for the
+    whole session, and every model call submitted through `wrap()` is
+    profiled on its inference thread. The per-thread profiles are merged
+    when the session stops.
+
+    "sampling": a background thread records the Python stack of every
+    thread each `interval_s`. It adds no cost to the profiled code, so
+    it can stay on longer under real traffic.
+
+    With `memory=True`, tracemalloc snapshots are taken at start and stop
+    and the report lists the source lines whose allocations grew the most.
+    """
+
+    def __init__(
+        self,
+        mode: str = "sampling",
+        requests: Optional[int] = None,
+        memory: bool = False,
+        interval_s: float = 0.005,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        self.mode = mode
+        self.requests = requests
+        self.memory = memory
+        self.interval_s = float(interval_s)
+
+        self.started_at: Optional[float] = None
+        self.seconds: Optional[float] = None
+        self.requests_seen = 0
+        self.stopped = False
+        self._finished = False
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._idle = threading.Condition(self._lock)
+        self._done = asyncio.Event()
+
+        # cprofile
+        self._profiles: Dict[int, cProfile.Profile] = {}
+        self._loop_profile: Optional[cProfile.Profile] = None
+        self._stats: Optional[pstats.Stats] = None
+
+        # sampling
+        self._samples: "Counter[Tuple[str, Tuple[Frame, ...]]]" = Counter()
+        self._idle_samples = 0
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_sampler = threading.Event()
+
+        # tracemalloc
+        self._started_tracemalloc = False
+        self._snapshot_start: Optional[tracemalloc.Snapshot] = None
+        self._memory_top: List[Dict[str, Any]] = []
+        self._memory_totals: Dict[str, float] = {}
+
+    # -----------------------------------
+    # Lifecycle
+    # -----------------------------------
+    def start(self) -> None:
+        """Call from the event loop thread (that is the thread cprofile follows)."""
+        self.started_at = time.perf_counter()
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            self._snapshot_start = tracemalloc.take_snapshot()
+        if self.mode == "cprofile":
+            self._loop_profile = cProfile.Profile()
+            self._loop_profile.enable()
+        else:
+            self._sampler = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+            self._sampler.start()
+
+    async def wait(self, seconds: float) -> None:
+        """Until `requests` predictions were served or `seconds` passed, whichever is first."""
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    def stop(self) -> None:
+        """
+        Call from the thread that called start(): new model calls run
+        unprofiled from here and the event loop profile is switched off.
+        Does not block; finish() collects the results.
+        """
+        with self._lock:
+            if self.stopped:
+                return
+            self.stopped = True
+        self.seconds = time.perf_counter() - self.started_at
+        if self._loop_profile is not None:
+            self._loop_profile.disable()
+        self._stop_sampler.set()
+
+    def finish(self, join_timeout: float = 5.0) -> None:
+        """After stop(), from any thread: waits for profiled calls still running, then merges."""
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+            # model calls already inside a profiled wrapper finish first
+            self._idle.wait_for(lambda: self._in_flight == 0, timeout=join_timeout)
+
+        if self._loop_profile is not None:
+            profiles = [self._loop_profile, *self._profiles.values()]
+            self._stats = pstats.Stats(profiles[0])
+            for p in profiles[1:]:
+                self._stats.add(p)
+        if self._sampler is not None:
+            self._sampler.join(timeout=join_timeout)
+        if self._snapshot_start is not None:
+            self._take_memory_diff()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+    # -----------------------------------
+    # Hooks on the request path
+    # -----------------------------------
+    def request_done(self) -> None:
+        self.requests_seen += 1
+        if self.requests and self.requests_seen >= self.requests:
+            self._done.set()
+
+    def wrap(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """`fn` profiled on whichever thread runs it (cprofile mode only)."""
+        if self.mode != "cprofile":
+            return fn
+
+        def profiled(*args: Any) -> Any:
+            with self._lock:
+                if self.stopped:
+                    profile = None
+                else:
+                    self._in_flight += 1
+                    tid = threading.get_ident()
+                    profile = self._profiles.get(tid)
+                    if profile is None:
+                        profile = self._profiles[tid] = cProfile.Profile()
+            if profile is None:
+                return fn(*args)
+            profile.enable()
+            try:
+                return fn(*args)
+            finally:
+                profile.disable()
+                with self._lock:
+                    self._in_flight -= 1
+                    self._idle.notify_all()
+
+        return profiled
+
+    # -----------------------------------
+    # Sampling
+    # -----------------------------------
+    def _sample_loop(self) -> None:
+        me = threading.get_ident()
+        while not self._stop_sampler.wait(self.interval_s):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for tid, frame in sys._current_frames().items():
+                if tid == me:
+                    continue
+                stack: List[Frame] = []
+                f = frame
+                while f is not None:
+                    code = f.f_code
+                    stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                    f = f.f_back
+                leaf = stack[0]
+                if (os.path.basename(leaf[0]), leaf[2]) in IDLE_LEAVES:
+                    self._idle_samples += 1
+                    continue
+                root_first = tuple(reversed(stack))[:MAX_STACK_DEPTH]
+                self._samples[(names.get(tid, str(tid)), root_first)] += 1
+
+    # -----------------------------------
+    # Memory
+    # -----------------------------------
+    def _take_memory_diff(self, top: int = 50) -> None:
+        ignore = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+        end = tracemalloc.take_snapshot().filter_traces(ignore)
+        start = self._snapshot_start.filter_traces(ignore)
+        diff = end.compare_to(start, "lineno")
+        self._memory_top = [
+            {
+                "location": f"{s.traceback[0].filename}:{s.traceback[0].lineno}",
+                "size_kb_diff": s.size_diff / 1024,
+                "count_diff": s.count_diff,
+                "size_kb": s.size / 1024,
+            }
+            for s in diff[:top]
+            if s.size_diff > 0
+        ]
+        current, peak = tracemalloc.get_traced_memory()
+        self._memory_totals = {
+            "net_growth_kb": sum(s.size_diff for s in diff) / 1024,
+            "traced_kb": current / 1024,
+            "peak_traced_kb": peak / 1024,
+        }
+
+    # -----------------------------------
+    # Results
+    # -----------------------------------
+    def report(self, top: int = 30) -> Dict[str, Any]:
+        """Top functions by own time / samples and by cumulative time / samples."""
+        out: Dict[str, Any] = {
+            "mode": self.mode,
+            "seconds": self.seconds,
+            "requests": self.requests_seen,
+        }
+        if self._stats is not None:
+            rows = [
+                {
+                    "function": _frame_label(func),
+                    "calls": nc,
+                    "primitive_calls": cc,
+                    "self_s": tt,
+                    "cumulative_s": ct,
+                }
+                for func, (cc, nc, tt, ct, _) in self._stats.stats.items()
+            ]
+            out["total_s"] = self._stats.total_tt
+            out["top_self"] = sorted(rows, key=lambda r: -r["self_s"])[:top]
+            out["top_cumulative"] = sorted(rows, key=lambda r: -r["cumulative_s"])[:top]
+        if self.mode == "sampling":
+            own: Counter = Counter()
+            total: Counter = Counter()
+            threads: Counter = Counter()
+            for (thread, stack), n in self._samples.items():
+                threads[thread] += n
+                own[stack[-1]] += n
+                for frame in set(stack):
+                    total[frame] += n
+            busy = sum(threads.values())
+            pct = lambda n: 100.0 * n / busy if busy else 0.0  # noqa: E731
+            out["samples"] = busy
+            out["idle_samples"] = self._idle_samples
+            out["threads"] = dict(threads.most_common())
+            out["top_self"] = [
+                {"function": _frame_label(f), "samples": n, "percent": pct(n)} for f, n in own.most_common(top)
+            ]
+            out["top_cumulative"] = [
+                {"function": _frame_label(f), "samples": n, "percent": pct(n)} for f, n in total.most_common(top)
+            ]
+        if self.memory:
+            out["memory"] = {**self._memory_totals, "top_growth": self._memory_top[:top]}
+        return out
+
+    def dump(self) -> Tuple[bytes, str, str]:
+        """(body, media type, file name) of the raw profile for offline tools."""
+        if self._stats is not None:
+            # same bytes as pstats.Stats.dump_stats: `python -m pstats`, snakeviz, ...
+            return marshal.dumps(self._stats.stats), "application/octet-stream", "profile.prof"
+        # collapsed stacks for flamegraph.pl / speedscope
+        lines = [
+            ";".join([thread, *(_frame_label(f) for f in stack)]) + f" {n}"
+            for (thread, stack), n in sorted(self._samples.items())
+        ]
+        return ("\n".join(lines) + "\n").encode(), "text/plain", "profile.folded"
+
+
+class Profiler:
+    """Holds the one profiling session the process may run at a time."""
+
+    def __init__(self):
+        self.session: Optional[ProfileSession] = None
+        self._lock = threading.Lock()
+
+    def start(self, **kwargs: Any) -> ProfileSession:
+        """Raises RuntimeError when a session is already running."""
+        with self._lock:
+            if self.session is not None:
+                raise RuntimeError("A profiling session is already running")
+            self.session = ProfileSession(**kwargs)
+        try:
+            self.session.start()
+        except Exception:
+            self.session = None
+            raise
+        return self.session
+
+    def detach(self) -> Optional[ProfileSession]:
+        """
+        End the running session without blocking (call from the thread that
+        started it); the caller runs `session.finish()`, e.g. in a threadpool.
+        """
+        with self._lock:
+            session, self.session = self.session, None
+        if session is not None:
+            session.stop()
+        return session
+
+    def stop(self) -> Optional[ProfileSession]:
+        session = self.detach()
+        if session is not None:
+            session.finish()
+        return session
+
+    def wrap(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        session = self.session
+        return fn if session is None else session.wrap(fn)
+
+    def request_done(self) -> None:
+        session = self.session
+        if session is not None:
+            session.request_done()
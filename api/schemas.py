@@ -32,4 +32,5 @@ class ModelInfoResponse(BaseModel):
     artifact_path: str
     cols_scaled: list[str]
     model_version: str
+    scorer: str
     
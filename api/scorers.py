@@ -0,0 +1,172 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from api.feature_encoder import RAW_COLUMNS, FeatureEncoder
+from api.metrics import metrics
+from api.tree_ensemble import TreeEnsemble
+
+# model classes whose predict_proba is sigmoid(coef_ @ x + intercept_)
+LINEAR_MODELS = {"LogisticRegression", "LogisticRegressionCV"}
+TREE_MODELS = {"XGBClassifier", "Booster"}
+
+PARITY_ATOL = 1e-9
+# XGBoost sums leaves in float32; the compiled walk sums in float64
+TREE_PARITY_ATOL = 1e-6
+
+logger = logging.getLogger(__name__)
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    with np.errstate(over="ignore"):
+        return 1.0 / (1.0 + np.exp(-z))
+
+
+# -----------------------------------
+# Scorers (payloads -> default probability)
+# -----------------------------------
+class SklearnScorer:
+    """Encoder + the artifact's own predict_proba (works for any model)."""
+
+    name = "sklearn"
+
+    def __init__(self, model: Any, encoder: FeatureEncoder):
+        self.model = model
+        self.encoder = encoder
+
+    def predict_proba_features(self, X: np.ndarray) -> np.ndarray:
+        model = self.model
+        if hasattr(model, "feature_names_in_"):
+            # models fitted on a DataFrame warn when given a bare array
+            import pandas as pd
+
+            X = pd.DataFrame(X, columns=self.encoder.features, copy=False)
+
+        # ✅ Use sklearn directly (no manual np.exp)
+        if hasattr(model, "predict_proba"):
+            return np.asarray(model.predict_proba(X)[:, 1], dtype=np.float64)
+        # fallback (rare)
+        return np.asarray(model.predict(X), dtype=np.float64)
+
+    def predict_proba(self, payloads: List[Dict[str, Any]]) -> np.ndarray:
+        with metrics.timer("feature_prep"):
+            X = self.encoder.encode_many(payloads)
+        with metrics.timer("inference"):
+            return self.predict_proba_features(X)
+
+
+class LinearScorer:
+    """
+    Scaler folded into the logistic regression coefficients.
+
+    Scoring is one dot product over the raw feature row plus a sigmoid;
+    no scaled feature matrix is ever built.
+    """
+
+    name = "fused-linear"
+
+    def __init__(self, weights: np.ndarray, intercept: float, encoder: FeatureEncoder):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.encoder = encoder
+
+    @classmethod
+    def from_model(cls, model: Any, encoder: FeatureEncoder) -> Optional["LinearScorer"]:
+        """Returns None when the model/scaler pair cannot be fused."""
+        if type(model).__name__ not in LINEAR_MODELS or not encoder.is_affine:
+            return None
+        coef = np.asarray(getattr(model, "coef_", None))
+        if coef.ndim != 2 or coef.shape != (1, encoder.n_features) or len(model.classes_) != 2:
+            return None
+
+        # scaled_j = raw[src_j] * a_j + c_j
+        w = coef[0]
+        a = encoder.mul / encoder.div
+        c = encoder.add - encoder.sub * a
+
+        weights = np.zeros(len(RAW_COLUMNS) + 1)
+        np.add.at(weights, encoder.src, w * a)
+        intercept = float(model.intercept_[0]) + float(np.dot(w, c))
+        return cls(weights, intercept, encoder)
+
+    def predict_proba_raw(self, raw: np.ndarray) -> np.ndarray:
+        return _sigmoid(raw @ self.weights + self.intercept)
+
+    def predict_proba(self, payloads: List[Dict[str, Any]]) -> np.ndarray:
+        with metrics.timer("feature_prep"):
+            raw = self.encoder.raw_matrix(payloads)
+        with metrics.timer("inference"):
+            return self.predict_proba_raw(raw)
+
+
+class TreeEnsembleScorer:
+    """Encoder + the flattened tree ensemble (no xgboost needed at serve time)."""
+
+    name = "compiled-trees"
+
+    def __init__(self, ensemble: TreeEnsemble, encoder: FeatureEncoder):
+        self.ensemble = ensemble
+        self.encoder = encoder
+
+    def predict_proba_raw(self, raw: np.ndarray) -> np.ndarray:
+        return self.ensemble.predict_proba(self.encoder.transform_raw(raw))
+
+    def predict_proba(self, payloads: List[Dict[str, Any]]) -> np.ndarray:
+        with metrics.timer("feature_prep"):
+            X = self.encoder.encode_many(payloads)
+        with metrics.timer("inference"):
+            return self.ensemble.predict_proba(X)
+
+
+# -----------------------------------
+# Parity check
+# -----------------------------------
+def parity_sample(n: int = 256, seed: int = 0) -> np.ndarray:
+    """Deterministic raw rows covering the numeric ranges and every one-hot."""
+    rng = np.random.default_rng(seed)
+    raw = np.zeros((n, len(RAW_COLUMNS) + 1))
+    for k, col in enumerate(RAW_COLUMNS):
+        if col.startswith(("residence_type_", "loan_purpose_", "loan_type_")):
+            raw[:, k] = rng.integers(0, 2, n)
+        elif col == "loan_to_income":
+            raw[:, k] = rng.uniform(0, 10, n)
+        else:
+            raw[:, k] = rng.uniform(0, 365, n)
+    return raw
+
+
+def max_parity_error(scorer, reference: SklearnScorer, raw: np.ndarray) -> float:
+    fast = scorer.predict_proba_raw(raw)
+    slow = reference.predict_proba_features(reference.encoder.transform_raw(raw))
+    return float(np.max(np.abs(fast - slow)))
+
+
+def compile_tree_scorer(model: Any, encoder: FeatureEncoder) -> Optional[TreeEnsembleScorer]:
+    """Returns None when the model is not an XGBoost ensemble we can flatten."""
+    if type(model).__name__ not in TREE_MODELS:
+        return None
+    try:
+        return TreeEnsembleScorer(TreeEnsemble.from_xgboost(model), encoder)
+    except ValueError as e:
+        logger.warning("Could not compile tree ensemble: %s", e)
+        return None
+
+
+def build_scorer(md: Dict[str, Any], encoder: FeatureEncoder):
+    """Fast scorer for linear/XGBoost models (after a parity check), sklearn otherwise."""
+    reference = SklearnScorer(md["model"], encoder)
+
+    fast = LinearScorer.from_model(md["model"], encoder)
+    atol = PARITY_ATOL
+    if fast is None:
+        fast = compile_tree_scorer(md["model"], encoder)
+        atol = TREE_PARITY_ATOL
+    if fast is None:
+        return reference
+
+    err = max_parity_error(fast, reference, parity_sample())
+    if err > atol:
+        logger.warning("%s scorer off by %.3g vs predict_proba; using sklearn path", fast.name, err)
+        return reference
+    return fast
@@ -2,8 +2,68 @@ from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
+    # every artifacts/model_data_v*.joblib next to MODEL_PATH is a servable version
     MODEL_PATH: str = "artifacts/model_data_v1.joblib"
     MODEL_VERSION: str = "v1"
+    MODEL_CACHE_MAX_MB: float = 1024.0
+    # "r": memory-map artifact arrays so uvicorn workers share one copy ("" = load into each process)
+    MODEL_MMAP_MODE: str = "r"
+    # load + exercise the model at startup; /ready stays 503 until done
+    MODEL_WARMUP: bool = True
+    MODEL_WARMUP_ROWS: int = 32
+
+    # per-stage / per-endpoint latency histograms and counters at /metrics (off = no timing at all)
+    METRICS_ENABLED: bool = True
+    LOG_LEVEL: str = "INFO"
+
+    # admin endpoints (model swap, ...) need this in X-Admin-Token; empty = disabled
+    ADMIN_TOKEN: str = ""
+    # longest run of POST /admin/profile
+    PROFILE_MAX_SECONDS: float = 300.0
+
+    # dedicated inference threads for the async /predict endpoints; beyond
+    # INFERENCE_MAX_PENDING admitted requests the API answers 503 + Retry-After
+    INFERENCE_WORKERS: int = 4
+    INFERENCE_MAX_PENDING: int = 64
+    INFERENCE_RETRY_AFTER_S: float = 1.0
+
+    # results for identical payloads (same model version); 0 entries = off
+    PREDICTION_CACHE_SIZE: int = 10_000
+    PREDICTION_CACHE_TTL_S: float = 300.0
+
+    # /predict-stream: rows scored per chunk, longest accepted NDJSON line,
+    # how long a chunk waits for inference capacity before its rows fail
+    STREAM_CHUNK_ROWS: int = 256
+    STREAM_MAX_LINE_BYTES: int = 65_536
+    STREAM_OVERLOAD_TIMEOUT_S: float = 30.0
+
+    # opt-in micro-batching of concurrent /predict calls into one model call
+    PREDICT_BATCHING: bool = False
+    PREDICT_BATCH_MAX_ROWS: int = 64
+    PREDICT_BATCH_MAX_WAIT_MS: float = 2.0
+    PREDICT_BATCH_QUEUE_SIZE: int = 10_000
+
+    # write-behind prediction logging (off = write synchronously in the request)
+    PREDICTION_LOG_ASYNC: bool = True
+    PREDICTION_LOG_QUEUE_SIZE: int = 10_000
+    PREDICTION_LOG_BATCH_SIZE: int = 500
+    PREDICTION_LOG_FLUSH_INTERVAL_S: float = 0.5
+
+    # background drift checks (a trigger set to 0 is disabled)
+    DRIFT_EVERY_N_PREDICTIONS: int = 100
+    DRIFT_INTERVAL_S: float = 0.0
+    DRIFT_WINDOW: int = 100  # at most db_sqlite.DRIFT_MAX_WINDOW (10k)
+    DRIFT_Z_THRESHOLD: float = 3.0
+    DRIFT_BASELINE_PATH: str = "artifacts/drift_baseline.json"
+    DRIFT_POLL_S: float = 1.0
+    DRIFT_LEASE_S: float = 300.0
+
+    # retention: archive predictions older than N days to data/archive (0 = keep forever)
+    RETENTION_DAYS: float = 0.0
+    RETENTION_INTERVAL_S: float = 3600.0
+    RETENTION_BATCH_ROWS: int = 50_000
+    RETENTION_POLL_S: float = 10.0
+    RETENTION_LEASE_S: float = 3600.0  # longer than one run: a big backlog takes a while to archive
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,176 @@
+import json
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# objectives whose predict_proba is sigmoid(sum of leaves + base margin)
+LOGISTIC_OBJECTIVES = {"binary:logistic", "reg:logistic"}
+
+BLOCK_ROWS = 256
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    with np.errstate(over="ignore"):
+        return 1.0 / (1.0 + np.exp(-z))
+
+
+class TreeEnsemble:
+    """
+    A boosted tree ensemble flattened into NumPy arrays.
+
+    All trees live in one node table. Leaves point to themselves, so every
+    tree of every row can be walked in lock-step for `max_depth` steps.
+    Comparisons are done in float32, like XGBoost itself.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        default_left: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        base_margin: float,
+        children: Optional[np.ndarray] = None,
+    ):
+        self.feature = np.asarray(feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold, dtype=np.float32)
+        self.left = np.asarray(left, dtype=np.int32)
+        self.right = np.asarray(right, dtype=np.int32)
+        self.default_left = np.asarray(default_left, dtype=bool)
+        self.value = np.asarray(value, dtype=np.float32)
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.max_depth = int(max_depth)
+        self.base_margin = float(base_margin)
+
+        # lookup table for the walk: child of node i is children[2*i + go_left].
+        # Stored in compiled artifacts, so a memory-mapped load needs no private copy.
+        if children is None:
+            children = np.stack([self.right, self.left], axis=1).ravel()
+        self.children = np.asarray(children, dtype=np.intp)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    # -----------------------------------
+    # Evaluation
+    # -----------------------------------
+    def predict_margin(self, X: np.ndarray) -> np.ndarray:
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if len(X) <= BLOCK_ROWS:
+            return self._walk(X)
+        # row blocks keep the (rows x trees) index arrays cache-sized
+        return np.concatenate([self._walk(X[i : i + BLOCK_ROWS]) for i in range(0, len(X), BLOCK_ROWS)])
+
+    def _walk(self, X: np.ndarray) -> np.ndarray:
+        n_rows, n_cols = X.shape
+        flat = X.ravel()
+        row_base = (np.arange(n_rows, dtype=np.intp) * n_cols)[:, None]
+        node = np.repeat(self.roots[None, :].astype(np.intp), n_rows, axis=0)
+        has_nan = bool(np.isnan(flat).any())
+
+        for _ in range(self.max_depth):
+            x = flat.take(row_base + self.feature.take(node))
+            go_left = x < self.threshold.take(node)
+            if has_nan:
+                go_left |= np.isnan(x) & self.default_left.take(node)
+            node = self.children.take(2 * node + go_left)
+
+        return self.value.take(node).sum(axis=1, dtype=np.float64) + self.base_margin
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Probability of the positive class, shape (n_rows,)."""
+        return _sigmoid(self.predict_margin(X))
+
+    # -----------------------------------
+    # Plain-array form (what the compiled artifact stores)
+    # -----------------------------------
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "feature": self.feature,
+            "threshold": self.threshold,
+            "left": self.left,
+            "right": self.right,
+            "default_left": self.default_left,
+            "value": self.value,
+            "roots": self.roots,
+            "max_depth": self.max_depth,
+            "base_margin": self.base_margin,
+            "children": self.children,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "TreeEnsemble":
+        return cls(**d)
+
+    # -----------------------------------
+    # Export from XGBoost
+    # -----------------------------------
+    @classmethod
+    def from_xgboost(cls, model: Any) -> "TreeEnsemble":
+        """Flatten a fitted XGBClassifier / Booster (binary logistic, numeric splits)."""
+        booster = model.get_booster() if hasattr(model, "get_booster") else model
+        learner = json.loads(booster.save_raw("json"))["learner"]
+
+        objective = learner["objective"]["name"]
+        if objective not in LOGISTIC_OBJECTIVES:
+            raise ValueError(f"Unsupported XGBoost objective: {objective}")
+
+        gb = learner["gradient_booster"]
+        if gb.get("name") != "gbtree":
+            raise ValueError(f"Unsupported XGBoost booster: {gb.get('name')}")
+        trees = gb["model"]["trees"]
+
+        # predict_proba stops at best_iteration when early stopping was used
+        best_iteration = getattr(model, "best_iteration", None) if hasattr(model, "get_booster") else None
+        if best_iteration is not None:
+            per_round = int(gb["model"]["gbtree_model_param"].get("num_parallel_tree", 1))
+            trees = trees[: (int(best_iteration) + 1) * per_round]
+
+        base_score = float(str(learner["learner_model_param"]["base_score"]).strip("[]"))
+        base_margin = float(np.log(base_score / (1.0 - base_score)))
+
+        feature, threshold, left, right, default_left, value, roots = [], [], [], [], [], [], []
+        max_depth = 0
+        offset = 0
+        for tree in trees:
+            if any(int(t) != 0 for t in tree.get("split_type", [])):
+                raise ValueError("Categorical splits are not supported")
+
+            lc = np.asarray(tree["left_children"], dtype=np.int64)
+            rc = np.asarray(tree["right_children"], dtype=np.int64)
+            is_leaf = lc < 0
+            own = np.arange(len(lc))
+
+            feature.append(np.where(is_leaf, 0, np.asarray(tree["split_indices"])))
+            threshold.append(np.where(is_leaf, 0.0, np.asarray(tree["split_conditions"])))
+            left.append(np.where(is_leaf, own, lc) + offset)
+            right.append(np.where(is_leaf, own, rc) + offset)
+            default_left.append(np.asarray(tree["default_left"], dtype=bool))
+            value.append(np.where(is_leaf, np.asarray(tree["split_conditions"]), 0.0))
+            roots.append(offset)
+
+            stack = [(0, 0)]
+            while stack:
+                i, depth = stack.pop()
+                if is_leaf[i]:
+                    max_depth = max(max_depth, depth)
+                else:
+                    stack += [(lc[i], depth + 1), (rc[i], depth + 1)]
+            offset += len(lc)
+
+        return cls(
+            feature=np.concatenate(feature),
+            threshold=np.concatenate(threshold),
+            left=np.concatenate(left),
+            right=np.concatenate(right),
+            default_left=np.concatenate(default_left),
+            value=np.concatenate(value),
+            roots=np.asarray(roots),
+            max_depth=max_depth,
+            base_margin=base_margin,
+        )
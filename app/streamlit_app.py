@@ -243,32 +243,29 @@ else:
 st.subheader("📊 Analytics (from Logs)")
 
 try:
-    logs = api_get("/logs", params={"limit": 500})  # pull enough data for nicer charts
-    if logs:
-        df = pd.DataFrame(logs)
+    # aggregated server-side over every logged prediction (small payload)
+    analytics = api_get("/analytics", params={"score_bins": 6})
+    if analytics and analytics["count"] > 0:
+        st.caption(f"{analytics['count']} predictions")
 
         # ---- Chart 1: Rating distribution ----
         st.markdown("**1) Rating Distribution**")
-        rating_counts = df["rating"].value_counts()
-        st.bar_chart(rating_counts)
+        rating_counts = pd.Series(analytics["rating_counts"])
+        st.bar_chart(rating_counts[rating_counts > 0])
 
         # ---- Chart 2: Credit Score distribution (easy + realistic) ----
         st.markdown("**2) Credit Score Distribution**")
-
-        # Create score ranges (bins)
-        df["score_range"] = pd.cut(
-            df["credit_score"],
-            bins=[300, 400, 500, 600, 700, 800, 900],
-            include_lowest=True
-        )
-        
-        df["score_range"] = df["score_range"].astype(str)  # Convert to string for better display
-
-        score_dist = df["score_range"].value_counts().sort_index()
+        hist = pd.DataFrame(analytics["score_histogram"])
+        score_dist = hist.set_index("bin")["count"]
         st.bar_chart(score_dist)
 
+        # ---- Probability quantiles ----
+        st.markdown("**3) Default Probability Quantiles**")
+        quantiles = pd.Series(analytics["probability_quantiles"], name="default_probability")
+        st.dataframe(quantiles.to_frame().T, use_container_width=True, hide_index=True)
+
     else:
-        st.info("No logs yet. Run bulk_calls.py to generate data.")
+        st.info("No logs yet. Run `python -m scripts.bulk_calls` to generate data.")
 except Exception as e:
-    st.error("Could not load logs for charts.")
+    st.error("Could not load analytics for charts.")
     st.code(str(e))
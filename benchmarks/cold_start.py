@@ -0,0 +1,144 @@
+"""
+Import-time and cold-start benchmark for the API.
+
+    python -m benchmarks.cold_start [--runs 5]
+
+1. `import api.main` in fresh interpreters (median wall time, heavy modules loaded).
+2. uvicorn started from scratch, with and without MODEL_WARMUP:
+   time until /ready answers 200, then latency of the first and later /predict calls.
+
+Needs uvicorn and a model artifact in artifacts/. Predictions made here are
+logged to the normal SQLite database.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+HEAVY_MODULES = ["pandas", "sklearn", "xgboost", "mlflow", "pyarrow"]
+
+PAYLOAD = {
+    "age": 28,
+    "income": 1200000,
+    "loan_amount": 2560000,
+    "loan_tenure_months": 36,
+    "avg_dpd_per_delinquency": 20,
+    "delinquency_ratio": 30,
+    "credit_utilization_ratio": 30,
+    "num_open_accounts": 2,
+    "residence_type": "Owned",
+    "loan_purpose": "Home",
+    "loan_type": "Secured",
+}
+
+IMPORT_SNIPPET = (
+    "import json, sys, time; t = time.perf_counter(); import api.main; "
+    "print(json.dumps({'ms': (time.perf_counter() - t) * 1000, "
+    f"'heavy': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))"
+)
+
+
+# -----------------------------------
+# Helpers
+# -----------------------------------
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _request(url: str, payload=None, timeout: float = 10.0):
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as r:
+        return r.status, json.loads(r.read())
+
+
+def _timed_predict(base: str) -> float:
+    start = time.perf_counter()
+    _request(f"{base}/predict", PAYLOAD)
+    return (time.perf_counter() - start) * 1000
+
+
+# -----------------------------------
+# Benchmarks
+# -----------------------------------
+def bench_import(runs: int) -> dict:
+    times, heavy = [], []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        times.append(result["ms"])
+        heavy = result["heavy"]
+    return {"import_ms_median": statistics.median(times), "heavy_modules_loaded": heavy}
+
+
+def bench_cold_start(warmup: bool, timeout_s: float = 60.0) -> dict:
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    env = {**os.environ, "MODEL_WARMUP": str(warmup).lower(), "DRIFT_EVERY_N_PREDICTIONS": "0"}
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if time.perf_counter() - start > timeout_s:
+                raise TimeoutError("API did not become ready")
+            try:
+                if _request(f"{base}/ready", timeout=1.0)[0] == 200:
+                    break
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.02)
+        ready_ms = (time.perf_counter() - start) * 1000
+
+        first_ms = _timed_predict(base)
+        steady = [_timed_predict(base) for _ in range(20)]
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+    return {
+        "warmup": warmup,
+        "ready_ms": ready_ms,
+        "first_predict_ms": first_ms,
+        "steady_predict_ms_median": statistics.median(steady),
+        "time_to_first_prediction_ms": ready_ms + first_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API import time and cold start")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters for the import benchmark")
+    args = parser.parse_args()
+
+    results = {"import": bench_import(args.runs), "cold_start": [bench_cold_start(w) for w in (False, True)]}
+
+    imp = results["import"]
+    print(f"import api.main: {imp['import_ms_median']:.0f} ms (heavy modules: {imp['heavy_modules_loaded'] or 'none'})")
+    for r in results["cold_start"]:
+        print(
+            f"warmup={str(r['warmup']):5} ready {r['ready_ms']:7.0f} ms | "
+            f"first /predict {r['first_predict_ms']:6.1f} ms | steady {r['steady_predict_ms_median']:5.1f} ms"
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
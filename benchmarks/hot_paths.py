@@ -0,0 +1,351 @@
+"""
+In-process micro-benchmarks of the API's hot paths, with a regression gate.
+
+    python -m benchmarks.hot_paths                    # run, print ops/s and allocations
+    python -m benchmarks.hot_paths --check            # also compare with benchmarks/baseline.json
+    python -m benchmarks.hot_paths --save             # write the current numbers as the baseline
+    python -m benchmarks.hot_paths --check --baseline /tmp/base.json
+    python -m benchmarks.hot_paths -k drift --time 2  # only benchmarks whose name contains "drift"
+
+Every benchmark reports the median ops/s over `--rounds` timed rounds, and
+one traced call: peak memory allocated during the call (tracemalloc) and
+the number of memory blocks still held afterwards. `--check` exits with 1 when a
+benchmark is more than `--tolerance` slower, or allocates more than
+`--alloc-tolerance` above its baseline peak.
+
+Baselines are machine-specific, so none is committed: generate one with
+--save on the machine (or CI runner) that runs the checks, e.g. from the
+base branch before checking a change. --check exits with 2 when there is
+no baseline. Uses a temporary SQLite database and the model in artifacts/.
+"""
+import argparse
+import inspect
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from api import db_sqlite
+from scripts.bulk_calls import random_payload
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# name -> setup() returning the zero-argument callable to measure; a setup
+# that changes global state yields the callable instead and restores the
+# state after the yield (like a pytest fixture)
+BENCHMARKS: Dict[str, Callable[[], Any]] = {}
+
+
+def benchmark(name: str):
+    def register(setup: Callable[[], Any]):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def _payloads(n: int = 1000, seed: int = 0) -> List[dict]:
+    rng = random.Random(seed)
+    return [random_payload(rng) for _ in range(n)]
+
+
+def _cycle(items: List[Any]) -> Callable[[], Any]:
+    state = {"i": 0}
+
+    def next_item():
+        state["i"] = (state["i"] + 1) % len(items)
+        return items[state["i"]]
+
+    return next_item
+
+
+def _drift_frame(rows: int, seed: int = 0):
+    import numpy as np
+    import pandas as pd
+
+    from api.drift_monitor import DRIFT_COLUMNS
+
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(rng.normal(size=(rows, len(DRIFT_COLUMNS))), columns=DRIFT_COLUMNS)
+
+
+def _log_row(payload: dict) -> dict:
+    return {
+        "created_at": "2026-01-01T00:00:00+00:00",
+        "payload": payload,
+        "default_probability": 0.2,
+        "credit_score": 780,
+        "rating": "Excellent",
+    }
+
+
+# -----------------------------------
+# Benchmarks
+# -----------------------------------
+@benchmark("prepare_input")
+def _prepare_input():
+    from api.predictor import prepare_input
+
+    nxt = _cycle(_payloads())
+    return lambda: prepare_input(nxt())
+
+
+@benchmark("predict")
+def _predict():
+    from api.predictor import predict
+
+    nxt = _cycle(_payloads())
+    return lambda: predict(nxt())
+
+
+@benchmark("predict_batch[100]")
+def _predict_batch():
+    from api.predictor import predict_batch
+
+    payloads = _payloads(100)
+    return lambda: predict_batch(payloads)
+
+
+@benchmark("insert_prediction")
+def _insert_prediction():
+    nxt = _cycle(_payloads())
+    return lambda: db_sqlite.insert_prediction(**_log_row(nxt()))
+
+
+@benchmark("insert_predictions[500]")
+def _insert_predictions():
+    rows = [_log_row(p) for p in _payloads(500)]
+    return lambda: db_sqlite.insert_predictions(rows)
+
+
+@benchmark("fetch_logs[20]")
+def _fetch_logs():
+    db_sqlite.insert_predictions([_log_row(p) for p in _payloads(10_000)])
+    return lambda: db_sqlite.fetch_logs(limit=20)
+
+
+def _mixed_load_setup(threads: int, ops: int = 64):
+    def setup():
+        db_sqlite.insert_predictions([_log_row(p) for p in _payloads(10_000)])
+        rows = [_log_row(p) for p in _payloads(5)]
+
+        def worker():
+            for i in range(ops // threads):
+                if i % 4 == 0:
+                    db_sqlite.insert_predictions(rows)
+                else:
+                    db_sqlite.fetch_logs(limit=20)
+
+        pool = ThreadPoolExecutor(max_workers=threads)
+
+        def call():
+            for future in [pool.submit(worker) for _ in range(threads)]:
+                future.result()
+
+        try:
+            yield call
+        finally:
+            pool.shutdown()
+
+    return setup
+
+
+# the same 64 SQLite calls (1 insert : 3 reads) split over more threads; with
+# WAL readers next to the one writer, ops/s should not drop as threads are added
+for _threads in (1, 2, 4, 8):
+    benchmark(f"sqlite_mixed_64ops[{_threads} threads]")(_mixed_load_setup(_threads))
+
+
+def _zscore_setup(rows: int):
+    def setup():
+        from api.drift_monitor import zscore_drift
+
+        baseline = {"features": {c: {"mean": 0.0, "std": 1.0} for c in _drift_frame(1).columns}}
+        X = _drift_frame(rows, seed=1)
+        return lambda: zscore_drift(X, baseline)
+
+    return setup
+
+
+for _rows in (100, 10_000, 1_000_000):
+    benchmark(f"zscore_drift[{_rows}]")(_zscore_setup(_rows))
+
+
+@benchmark("save_baseline_stats[1000000]")
+def _save_baseline_stats():
+    from api.drift_monitor import save_baseline_stats
+
+    X = _drift_frame(1_000_000)
+    out = Path(tempfile.mkdtemp(prefix="bench-baseline-")) / "drift_baseline.json"
+    return lambda: save_baseline_stats(X, out)
+
+
+@benchmark("POST /predict (TestClient)")
+def _predict_round_trip():
+    from fastapi.testclient import TestClient
+
+    from api import main
+    from api.prediction_cache import PredictionCache
+
+    client = TestClient(main.app)
+    nxt = _cycle(_payloads())
+
+    def call():
+        r = client.post("/predict", json=nxt())
+        r.raise_for_status()
+
+    # measure the full scoring path, not cache hits
+    cache, main.prediction_cache = main.prediction_cache, PredictionCache(max_entries=0)
+    try:
+        yield call
+    finally:
+        main.prediction_cache = cache
+
+
+# -----------------------------------
+# Runner
+# -----------------------------------
+def measure(fn: Callable[[], Any], min_time: float = 1.0, rounds: int = 5) -> Dict[str, Any]:
+    fn()  # first call pays lazy imports / caches
+
+    # calibrate: iterations so one round takes about min_time / rounds
+    n, elapsed = 1, 0.0
+    while True:
+        start = time.perf_counter()
+        for _ in range(n):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / rounds / 4 or n >= 1_000_000:
+            break
+        n *= 4
+    n = max(1, int(n * (min_time / rounds) / max(elapsed, 1e-9)))
+
+    rates = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(n):
+            fn()
+        rates.append(n / (time.perf_counter() - start))
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        peak = tracemalloc.get_traced_memory()[1] - base
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    net_blocks = sum(s.count_diff for s in after.compare_to(before, "filename"))
+
+    return {
+        "ops_per_s": statistics.median(rates),
+        "ops_per_s_min": min(rates),
+        "iterations": n * rounds,
+        "peak_alloc_kb": peak / 1024,
+        "net_blocks": net_blocks,
+    }
+
+
+def run(names: List[str], min_time: float, rounds: int) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    db_path = db_sqlite.DB_PATH
+    with tempfile.TemporaryDirectory(prefix="bench-db-") as tmp:
+        db_sqlite.DB_PATH = Path(tmp) / "predictions.db"
+        db_sqlite.init_db()
+        try:
+            for name in names:
+                setup = BENCHMARKS[name]()
+                if not inspect.isgenerator(setup):
+                    results[name] = measure(setup, min_time=min_time, rounds=rounds)
+                else:
+                    try:
+                        results[name] = measure(next(setup), min_time=min_time, rounds=rounds)
+                    finally:
+                        setup.close()  # runs the setup's cleanup
+                r = results[name]
+                print(
+                    f"{name:32} {r['ops_per_s']:12,.1f} ops/s | "
+                    f"peak {r['peak_alloc_kb']:10,.1f} KB | net blocks {r['net_blocks']:6d}"
+                )
+        finally:
+            db_sqlite.close_connections()
+            db_sqlite.DB_PATH = db_path
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float = 0.25,
+    alloc_tolerance: float = 0.5,
+) -> List[Tuple[str, str]]:
+    """(benchmark, reason) for every regression against the baseline."""
+    regressions = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if r["ops_per_s"] < base["ops_per_s"] * (1 - tolerance):
+            regressions.append(
+                (name, f"{r['ops_per_s']:,.1f} ops/s vs baseline {base['ops_per_s']:,.1f} (-{tolerance:.0%} allowed)")
+            )
+        # tiny allocations are noise; only gate on growth of at least 64 KB
+        limit = max(base["peak_alloc_kb"] * (1 + alloc_tolerance), base["peak_alloc_kb"] + 64)
+        if r["peak_alloc_kb"] > limit:
+            regressions.append(
+                (name, f"peak {r['peak_alloc_kb']:,.1f} KB vs baseline {base['peak_alloc_kb']:,.1f} KB")
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of the API hot paths")
+    parser.add_argument("-k", dest="filter", default=None, help="only benchmarks whose name contains this")
+    parser.add_argument("--time", type=float, default=1.0, help="seconds of timed calls per benchmark")
+    parser.add_argument("--rounds", type=int, default=5, help="timed rounds (the median is reported)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--check", action="store_true", help="fail on regressions against the baseline")
+    parser.add_argument("--save", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed ops/s drop (0.25 = 25%%)")
+    parser.add_argument("--alloc-tolerance", type=float, default=0.5, help="allowed peak allocation growth")
+    parser.add_argument("--out", type=Path, default=None, help="write the results as JSON here")
+    args = parser.parse_args(argv)
+
+    names = [n for n in BENCHMARKS if not args.filter or args.filter in n]
+    if not names:
+        print(f"❌ No benchmark matches {args.filter!r}")
+        return 2
+    results = run(names, min_time=args.time, rounds=args.rounds)
+
+    if args.out:
+        args.out.write_text(json.dumps(results, indent=2))
+    if args.save:
+        saved = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        saved.update(results)
+        args.baseline.write_text(json.dumps(saved, indent=2, sort_keys=True) + "\n")
+        print(f"✅ Baseline written to {args.baseline}")
+    if args.check:
+        if not args.baseline.exists():
+            print(f"❌ No baseline at {args.baseline} (generate one on this machine with --save first)")
+            return 2
+        regressions = compare(
+            results, json.loads(args.baseline.read_text()), args.tolerance, args.alloc_tolerance
+        )
+        for name, reason in regressions:
+            print(f"❌ {name}: {reason}")
+        if regressions:
+            return 1
+        print("✅ No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Resident memory of N uvicorn workers serving one large compiled model.
+
+    python -m benchmarks.mmap_workers [--workers 4] [--trees 4000] [--depth 8]
+
+Builds a synthetic compiled tree ensemble (random splits, same encoder as the
+artifact in artifacts/), then starts `uvicorn --workers N` twice: with
+MODEL_MMAP_MODE=r and with it disabled. After every worker has warmed up and
+served some requests, RSS and PSS of the worker processes are summed from
+/proc/<pid>/smaps_rollup. PSS splits shared pages between the processes that
+map them, so it is the number that shows what the mapping saves.
+
+Linux only. Needs uvicorn and a model artifact in artifacts/. Predictions made
+here are logged to the normal SQLite database.
+"""
+import argparse
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from api.feature_encoder import FeatureEncoder  # noqa: E402
+from api.model_loader import compiled_path_for, save_compiled  # noqa: E402
+from api.settings import settings  # noqa: E402
+from api.tree_ensemble import TreeEnsemble  # noqa: E402
+from benchmarks.cold_start import PAYLOAD  # noqa: E402
+
+
+# -----------------------------------
+# Synthetic artifact
+# -----------------------------------
+def build_ensemble(n_features: int, n_trees: int, depth: int, seed: int = 0) -> TreeEnsemble:
+    """Complete binary trees of `depth` with random splits (leaves point to themselves)."""
+    rng = np.random.default_rng(seed)
+    per_tree = 2 ** (depth + 1) - 1
+    n_internal = 2**depth - 1
+    local = np.arange(per_tree)
+    is_leaf = local >= n_internal
+
+    offsets = (np.arange(n_trees) * per_tree)[:, None]
+    left = (np.where(is_leaf, local, 2 * local + 1) + offsets).ravel()
+    right = (np.where(is_leaf, local, 2 * local + 2) + offsets).ravel()
+    leaf = np.tile(is_leaf, n_trees)
+
+    n = n_trees * per_tree
+    return TreeEnsemble(
+        feature=np.where(leaf, 0, rng.integers(0, n_features, n)),
+        threshold=np.where(leaf, 0.0, rng.random(n)),
+        left=left,
+        right=right,
+        default_left=rng.random(n) < 0.5,
+        value=np.where(leaf, rng.normal(0, 0.01, n), 0.0),
+        roots=np.arange(n_trees) * per_tree,
+        max_depth=depth,
+        base_margin=0.0,
+    )
+
+
+def write_artifact(out_dir: Path, n_trees: int, depth: int) -> Path:
+    md = joblib.load(ROOT / settings.MODEL_PATH)
+    encoder = FeatureEncoder.from_model_data(md)
+    if encoder.scaler is not None:
+        raise SystemExit("❌ The artifact's scaler cannot be exported; use one with MinMax/Standard scaling")
+
+    ensemble = build_ensemble(encoder.n_features, n_trees, depth)
+    model_path = out_dir / "model_data_v1.joblib"
+    meta = {
+        "model_type": "SyntheticTreeEnsemble",
+        "scaler_type": type(md["scaler"]).__name__,
+        "cols_to_scale": [str(c) for c in md["cols_to_scale"]],
+        "max_parity_error": 0.0,
+    }
+    # only the compiled twin is written; the registry serves it as v1
+    save_compiled(meta, encoder, ensemble, compiled_path_for(model_path))
+    return model_path
+
+
+# -----------------------------------
+# Process memory
+# -----------------------------------
+def _workers(pid: int) -> list:
+    """Worker processes of a uvicorn supervisor (skips multiprocessing's resource tracker)."""
+    kids = []
+    for task in Path(f"/proc/{pid}/task").iterdir():
+        kids += [int(k) for k in (task / "children").read_text().split()]
+    return [k for k in kids if b"spawn_main" in Path(f"/proc/{k}/cmdline").read_bytes()]
+
+
+def _smaps_kb(pid: int) -> dict:
+    out = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        key, value = line.split(":", 1)
+        out[key] = int(value.split()[0])
+    return out
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _predict(base: str) -> None:
+    req = urllib.request.Request(
+        f"{base}/predict", data=json.dumps(PAYLOAD).encode(), headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(req, timeout=30) as r:
+        r.read()
+
+
+def bench_workers(model_path: Path, workers: int, mmap: bool, requests: int, timeout_s: float = 120.0) -> dict:
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    env = {
+        **os.environ,
+        "MODEL_PATH": str(model_path),
+        "MODEL_MMAP_MODE": "r" if mmap else "",
+        "MODEL_WARMUP": "true",
+        "DRIFT_EVERY_N_PREDICTIONS": "0",
+    }
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "api.main:app",
+            "--port", str(port), "--workers", str(workers), "--no-access-log",
+        ],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        # each worker logs this once its lifespan (model load + warm-up) is done
+        started, start = 0, time.perf_counter()
+        while started < workers:
+            if time.perf_counter() - start > timeout_s:
+                raise TimeoutError("workers did not start")
+            line = proc.stderr.readline()
+            if not line:
+                raise RuntimeError("uvicorn exited during startup")
+            started += "Application startup complete" in line
+
+        for _ in range(requests):
+            _predict(base)
+
+        pids = _workers(proc.pid)
+        stats = [_smaps_kb(pid) for pid in pids]
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+    return {
+        "mmap": mmap,
+        "workers": len(pids),
+        "rss_mb": sum(s["Rss"] for s in stats) / 1024,
+        "pss_mb": sum(s["Pss"] for s in stats) / 1024,
+        "private_mb": sum(s["Private_Clean"] + s["Private_Dirty"] for s in stats) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare worker memory with and without mmap model loading")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--trees", type=int, default=4000, help="trees in the synthetic ensemble")
+    parser.add_argument("--depth", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=50, help="/predict calls before measuring")
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="mmap-bench-"))
+    try:
+        model_path = write_artifact(tmp, args.trees, args.depth)
+        size_mb = compiled_path_for(model_path).stat().st_size / 2**20
+        print(f"artifact: {args.trees} trees x depth {args.depth} = {size_mb:.0f} MB")
+
+        results = [bench_workers(model_path, args.workers, mmap, args.requests) for mmap in (False, True)]
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    for r in results:
+        print(
+            f"mmap={str(r['mmap']):5} {r['workers']} workers | RSS {r['rss_mb']:7.0f} MB | "
+            f"PSS {r['pss_mb']:7.0f} MB | private {r['private_mb']:7.0f} MB"
+        )
+    saved = results[0]["pss_mb"] - results[1]["pss_mb"]
+    print(f"PSS saved by mmap: {saved:.0f} MB")
+    print(json.dumps({"artifact_mb": size_mb, "runs": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,16 +4,14 @@
 
 from __future__ import annotations
 
+import importlib.util
 import json
 from pathlib import Path
 import numpy as np
 import pandas as pd
 
-try:
-    import mlflow
-    MLFLOW_AVAILABLE = True
-except Exception:
-    MLFLOW_AVAILABLE = False
+# mlflow is optional and slow to import: only load it when a report is logged
+MLFLOW_AVAILABLE = importlib.util.find_spec("mlflow") is not None
 
 
 # 1) SAVE BASELINE STATS
@@ -124,5 +122,7 @@ def log_report_to_mlflow(report_path: str | Path, artifact_path: str = "drift"):
     if not MLFLOW_AVAILABLE:
         print("⚠️ mlflow not installed; skipping MLflow logging.")
         return
+    import mlflow
+
     mlflow.log_artifact(str(report_path), artifact_path=artifact_path)
 
@@ -0,0 +1,45 @@
+"""
+Archive old predictions to Parquet and delete them from SQLite.
+
+    python -m scripts.archive_predictions --days 90 [--vacuum]
+
+Rows go to data/archive/date=YYYY-MM-DD/*.parquet (zstd). `--vacuum` runs a
+one-time full VACUUM so databases created before incremental auto_vacuum
+was enabled can hand freed pages back to the filesystem.
+"""
+import argparse
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from api import archive, db_sqlite
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive predictions older than N days")
+    parser.add_argument("--days", type=float, required=True, help="keep this many days in SQLite")
+    parser.add_argument("--db", type=Path, default=db_sqlite.DB_PATH, help="SQLite database path")
+    parser.add_argument("--archive-dir", type=Path, default=archive.ARCHIVE_DIR, help="archive root")
+    parser.add_argument("--batch-rows", type=int, default=50_000, help="rows per archive batch")
+    parser.add_argument("--vacuum", action="store_true", help="full VACUUM afterwards (one-time migration)")
+    args = parser.parse_args()
+
+    db_sqlite.DB_PATH = args.db
+    db_sqlite.init_db()
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=args.days)
+    result = archive.archive_predictions(cutoff, batch_rows=args.batch_rows, archive_dir=args.archive_dir)
+    print(f"✅ Archived {result['archived']} predictions older than {cutoff:%Y-%m-%d %H:%M} into {result['files']} files")
+
+    if args.vacuum:
+        db_sqlite.close_connections()
+        conn = db_sqlite.get_conn()  # sets auto_vacuum=INCREMENTAL; VACUUM applies it
+        conn.execute("VACUUM")
+        conn.close()
+        print("✅ Database vacuumed (incremental auto_vacuum enabled)")
+    else:
+        free = db_sqlite.reclaim_space()
+        print(f"✅ {free} free pages left in the database file")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,280 @@
+"""
+Load generator for the API.
+
+    python -m scripts.bulk_calls --concurrency 32 --requests 5000
+    python -m scripts.bulk_calls --rate 500 --duration 30 --endpoint predict-batch --batch-size 50
+    python -m scripts.bulk_calls --replay payloads.jsonl --out results/run1.json
+
+Closed loop by default: `--concurrency` clients each send their next request
+as soon as the previous one answers. With `--rate`, requests are sent on a
+fixed schedule (open loop) no matter how fast the API answers, and latency
+is measured from the scheduled send time, so queueing shows up in the
+percentiles instead of silently lowering the request rate.
+
+Payloads are random, or replayed from a JSONL file with one PredictRequest
+per line. Prints throughput, p50/p95/p99/max latency and errors by kind.
+`--out` writes the same numbers as JSON so runs can be compared.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
 import random
 import time
-import requests
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
-API_URL = "http://127.0.0.1:8000/predict"
+import httpx
+
+API_URL = "http://127.0.0.1:8000"
+ENDPOINTS = ["predict", "predict-batch", "logs"]
 
 RESIDENCE = ["Owned", "Rented", "Mortgage"]
 PURPOSE = ["Education", "Home", "Auto", "Personal"]
 LOAN_TYPE = ["Unsecured", "Secured"]
 
-def random_payload():
-    income = random.randint(300_000, 3_000_000)
-    loan_amount = random.randint(100_000, 5_000_000)
+# open loop: beyond this many requests waiting for a client slot, new ones are dropped
+MAX_BACKLOG_PER_CLIENT = 10
+
+
+def random_payload(rng: random.Random = random) -> dict:
+    income = rng.randint(300_000, 3_000_000)
+    loan_amount = rng.randint(100_000, 5_000_000)
 
     return {
-        "age": random.randint(18, 70),
+        "age": rng.randint(18, 70),
         "income": float(income),
         "loan_amount": float(loan_amount),
-        "loan_tenure_months": random.choice([12, 24, 36, 48, 60]),
-        "avg_dpd_per_delinquency": float(random.randint(0, 60)),
-        "delinquency_ratio": float(random.randint(0, 100)),
-        "credit_utilization_ratio": float(random.randint(0, 100)),
-        "num_open_accounts": random.randint(1, 10),
-        "residence_type": random.choice(RESIDENCE),
-        "loan_purpose": random.choice(PURPOSE),
-        "loan_type": random.choice(LOAN_TYPE),
+        "loan_tenure_months": rng.choice([12, 24, 36, 48, 60]),
+        "avg_dpd_per_delinquency": float(rng.randint(0, 60)),
+        "delinquency_ratio": float(rng.randint(0, 100)),
+        "credit_utilization_ratio": float(rng.randint(0, 100)),
+        "num_open_accounts": rng.randint(1, 10),
+        "residence_type": rng.choice(RESIDENCE),
+        "loan_purpose": rng.choice(PURPOSE),
+        "loan_type": rng.choice(LOAN_TYPE),
     }
 
-def main(n=100, sleep=0.05):
-    ok = 0
-    for i in range(n):
-        payload = random_payload()
-        r = requests.post(API_URL, json=payload, timeout=15)
 
-        if r.status_code == 200:
-            ok += 1
+def payload_source(replay: Optional[Path] = None, seed: int = 0) -> Iterator[dict]:
+    """Endless payloads: the replay file on a loop, or random ones."""
+    if replay is None:
+        rng = random.Random(seed)
+        while True:
+            yield random_payload(rng)
+    payloads = [json.loads(line) for line in replay.read_text().splitlines() if line.strip()]
+    if not payloads:
+        raise ValueError(f"No payloads in {replay}")
+    yield from itertools.cycle(payloads)
+
+
+# -----------------------------------
+# Results
+# -----------------------------------
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    k = max(math.ceil(q / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(k, len(sorted_values) - 1)]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies_ms: List[float] = []
+        self.errors: Dict[str, int] = {}
+        self.ok = 0
+        self.dropped = 0
+
+    def record(self, latency_ms: float, error: Optional[str]) -> None:
+        if error is None:
+            self.ok += 1
+            self.latencies_ms.append(latency_ms)
+        else:
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    def summary(self, seconds: float) -> Dict[str, Any]:
+        lat = sorted(self.latencies_ms)
+        sent = self.ok + sum(self.errors.values())
+        return {
+            "requests": sent,
+            "ok": self.ok,
+            "errors": dict(sorted(self.errors.items())),
+            "dropped": self.dropped,
+            "seconds": seconds,
+            "throughput_rps": self.ok / seconds if seconds else None,
+            "latency_ms": {
+                "mean": sum(lat) / len(lat) if lat else None,
+                "p50": percentile(lat, 50),
+                "p95": percentile(lat, 95),
+                "p99": percentile(lat, 99),
+                "max": lat[-1] if lat else None,
+            },
+        }
+
+
+# -----------------------------------
+# Requests
+# -----------------------------------
+def request_factory(endpoint: str, payloads: Iterator[dict], batch_size: int) -> Callable[[], Dict[str, Any]]:
+    if endpoint == "predict":
+        return lambda: {"method": "POST", "url": "/predict", "json": next(payloads)}
+    if endpoint == "predict-batch":
+        return lambda: {"method": "POST", "url": "/predict-batch", "json": [next(payloads) for _ in range(batch_size)]}
+    if endpoint == "logs":
+        return lambda: {"method": "GET", "url": "/logs", "params": {"limit": 20}}
+    raise ValueError(f"endpoint must be one of {ENDPOINTS}")
+
+
+async def _send(client: httpx.AsyncClient, request: Dict[str, Any], started: float, recorder: Recorder) -> None:
+    error = None
+    try:
+        r = await client.request(**request)
+        if r.status_code >= 400:
+            error = f"http_{r.status_code}"
+    except httpx.TimeoutException:
+        error = "timeout"
+    except httpx.HTTPError as e:
+        error = type(e).__name__
+    recorder.record((time.perf_counter() - started) * 1000, error)
+
+
+async def _closed_loop(client, make_request, concurrency, stop, recorder) -> None:
+    async def worker():
+        while not stop():
+            await _send(client, make_request(), time.perf_counter(), recorder)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def _open_loop(client, make_request, concurrency, rate, stop, recorder) -> None:
+    slots = asyncio.Semaphore(concurrency)
+    waiting = 0
+    tasks = set()
+
+    async def one(scheduled: float):
+        nonlocal waiting
+        async with slots:
+            waiting -= 1
+            await _send(client, make_request(), scheduled, recorder)
+
+    start = time.perf_counter()
+    for i in itertools.count():
+        scheduled = start + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if stop():
+            break
+        if waiting >= concurrency * MAX_BACKLOG_PER_CLIENT:
+            recorder.dropped += 1
+            continue
+        waiting += 1
+        task = asyncio.create_task(one(scheduled))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+async def run_load(
+    url: str = API_URL,
+    endpoint: str = "predict",
+    concurrency: int = 10,
+    rate: Optional[float] = None,
+    requests: Optional[int] = 500,
+    duration: Optional[float] = None,
+    batch_size: int = 20,
+    replay: Optional[Path] = None,
+    timeout: float = 15.0,
+    seed: int = 0,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> Dict[str, Any]:
+    """Run one load test; stops after `duration` seconds if given, else after `requests`."""
+    make_request = request_factory(endpoint, payload_source(replay, seed), batch_size)
+    recorder = Recorder()
+    issued = itertools.count(1)
+    started_at = datetime.now(timezone.utc).isoformat()
+    start = time.perf_counter()
+
+    if duration is not None:
+        stop = lambda: time.perf_counter() - start >= duration  # noqa: E731
+    else:
+        stop = lambda: next(issued) > requests  # noqa: E731
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits, transport=transport) as client:
+        if rate:
+            await _open_loop(client, make_request, concurrency, rate, stop, recorder)
         else:
-            print("Failed:", r.status_code, r.text)
+            await _closed_loop(client, make_request, concurrency, stop, recorder)
+
+    return {
+        "config": {
+            "url": url,
+            "endpoint": endpoint,
+            "mode": "open" if rate else "closed",
+            "concurrency": concurrency,
+            "rate": rate,
+            "requests": None if duration is not None else requests,
+            "duration": duration,
+            "batch_size": batch_size if endpoint == "predict-batch" else None,
+            "replay": str(replay) if replay else None,
+        },
+        "started_at": started_at,
+        **recorder.summary(time.perf_counter() - start),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load generator for the credit risk API")
+    parser.add_argument("--url", default=API_URL, help="API base URL")
+    parser.add_argument("--endpoint", choices=ENDPOINTS, default="predict")
+    parser.add_argument("--concurrency", type=int, default=10, help="concurrent clients / open connections")
+    parser.add_argument("--rate", type=float, default=None, help="target requests/s (open loop)")
+    parser.add_argument("--requests", type=int, default=500, help="requests to send (ignored with --duration)")
+    parser.add_argument("--duration", type=float, default=None, help="run for this many seconds")
+    parser.add_argument("--batch-size", type=int, default=20, help="payloads per /predict-batch call")
+    parser.add_argument("--replay", type=Path, default=None, help="JSONL file of PredictRequest payloads")
+    parser.add_argument("--timeout", type=float, default=15.0, help="per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="seed for random payloads")
+    parser.add_argument("--out", type=Path, default=None, help="write the results as JSON here")
+    args = parser.parse_args()
+
+    result = asyncio.run(
+        run_load(
+            url=args.url,
+            endpoint=args.endpoint,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            requests=args.requests,
+            duration=args.duration,
+            batch_size=args.batch_size,
+            replay=args.replay,
+            timeout=args.timeout,
+            seed=args.seed,
+        )
+    )
 
-        if (i + 1) % 10 == 0:
-            print(f"Sent {i+1}/{n} (success={ok})")
+    lat = result["latency_ms"]
+    fmt = lambda v: "-" if v is None else f"{v:.1f}"  # noqa: E731
+    print(
+        f"Done ✅ {result['ok']}/{result['requests']} ok in {result['seconds']:.1f} s "
+        f"({result['throughput_rps']:.0f} req/s)"
+    )
+    print(f"latency ms: p50 {fmt(lat['p50'])} | p95 {fmt(lat['p95'])} | p99 {fmt(lat['p99'])} | max {fmt(lat['max'])}")
+    if result["errors"]:
+        print("❌ errors:", result["errors"])
+    if result["dropped"]:
+        print(f"⚠️ {result['dropped']} requests dropped client-side (target rate not reachable)")
 
-        time.sleep(sleep)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(result, indent=2))
+        print(f"✅ Results written to {args.out}")
 
-    print(f"Done ✅ success={ok}/{n}")
 
 if __name__ == "__main__":
-    main(n=50, sleep=0.03)
+    main()
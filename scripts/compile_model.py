@@ -0,0 +1,34 @@
+"""
+Export an XGBoost model artifact to plain NumPy arrays for serving.
+
+    python -m scripts.compile_model artifacts/model_data_v2.joblib
+
+Writes artifacts/model_data_v2.compiled.joblib next to the input. The API
+prefers the compiled file when it exists, so it never has to import
+xgboost/sklearn for that model version. The compiled file records the
+input's size and SHA-256; if the artifact is replaced later, the API
+ignores the stale compiled file until it is recompiled.
+"""
+import argparse
+from pathlib import Path
+
+import joblib
+
+from api.model_loader import compiled_path_for, export_compiled
+from api.scorers import TREE_PARITY_ATOL
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a tree-ensemble model artifact")
+    parser.add_argument("artifact", type=Path, help="path to model_data_v*.joblib")
+    parser.add_argument("--out", type=Path, default=None, help="output path (default: <artifact>.compiled.joblib)")
+    parser.add_argument("--atol", type=float, default=TREE_PARITY_ATOL, help="max allowed probability difference")
+    args = parser.parse_args()
+
+    out = args.out or compiled_path_for(args.artifact)
+    err = export_compiled(joblib.load(args.artifact), out, atol=args.atol, source=args.artifact)
+    print(f"✅ Compiled {args.artifact} -> {out} (max |Δp| = {err:.2e})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Recompute the hourly / daily metric rollups from the predictions table
+and the Parquet archive (data/archive).
+
+    python -m scripts.rebuild_rollups [--db data/predictions.db]
+
+Run once after upgrading an existing database, or any time the rollups
+look out of sync. The API keeps them current on its own after that.
+"""
+import argparse
+import time
+from pathlib import Path
+
+from api import db_sqlite
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild prediction metric rollups")
+    parser.add_argument("--db", type=Path, default=db_sqlite.DB_PATH, help="SQLite database path")
+    args = parser.parse_args()
+
+    db_sqlite.DB_PATH = args.db
+    db_sqlite.init_db()
+
+    start = time.perf_counter()
+    n = db_sqlite.rebuild_rollups()
+    print(f"✅ Rolled up {n} predictions in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
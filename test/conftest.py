@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from api import db_sqlite
+from test.synthetic import random_payload
+
+
+@pytest.fixture
+def payloads():
+    rng = random.Random(42)
+    return [random_payload(rng) for _ in range(200)]
+
+
+@pytest.fixture(autouse=True)
+def tmp_db(tmp_path, monkeypatch):
+    # every test gets its own SQLite file (never touch data/predictions.db)
+    monkeypatch.setattr(db_sqlite, "DB_PATH", tmp_path / "predictions.db")
+    db_sqlite.init_db()
+    yield db_sqlite.DB_PATH
+    db_sqlite.close_connections()
+
+
+@pytest.fixture(scope="session")
+def synthetic_artifact_dir(tmp_path_factory):
+    import joblib
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import MinMaxScaler
+
+    from test.synthetic import build_model_data
+
+    path = tmp_path_factory.mktemp("artifacts")
+    joblib.dump(build_model_data(MinMaxScaler(), LogisticRegression()), path / "model_data_v1.joblib")
+    return path
+
+
+@pytest.fixture
+def synthetic_model(synthetic_artifact_dir, monkeypatch):
+    # endpoint / CLI tests serve this instead of artifacts/ (not in the repo)
+    from api import model_registry
+    from api.model_registry import ModelRegistry
+
+    registry = ModelRegistry(synthetic_artifact_dir, default_version="v1", max_bytes=10**9)
+    monkeypatch.setattr(model_registry, "registry", registry)
+    return registry
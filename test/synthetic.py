@@ -0,0 +1,65 @@
+import random
+
+import numpy as np
+import pandas as pd
+
+FEATURES = [
+    "age",
+    "loan_tenure_months",
+    "number_of_open_accounts",
+    "credit_utilization_ratio",
+    "loan_to_income",
+    "delinquency_ratio",
+    "avg_dpd_per_delinquency",
+    "residence_type_Owned",
+    "residence_type_Rented",
+    "loan_purpose_Education",
+    "loan_purpose_Home",
+    "loan_purpose_Personal",
+    "loan_type_Unsecured",
+]
+
+# like the training notebook: the scaler also saw columns the model dropped
+COLS_TO_SCALE = [
+    "age",
+    "number_of_dependants",
+    "loan_tenure_months",
+    "number_of_open_accounts",
+    "credit_utilization_ratio",
+    "loan_to_income",
+    "delinquency_ratio",
+    "avg_dpd_per_delinquency",
+    "bank_balance_at_application",
+]
+
+
+def random_payload(rng: random.Random) -> dict:
+    return {
+        "age": rng.randint(18, 100),
+        "income": float(rng.choice([0, rng.randint(100_000, 5_000_000)])),
+        "loan_amount": float(rng.randint(0, 8_000_000)),
+        "loan_tenure_months": rng.randint(0, 600),
+        "avg_dpd_per_delinquency": rng.uniform(0, 365),
+        "delinquency_ratio": rng.uniform(0, 100),
+        "credit_utilization_ratio": rng.uniform(0, 100),
+        "num_open_accounts": rng.randint(1, 50),
+        "residence_type": rng.choice(["Owned", "Rented", "Mortgage"]),
+        "loan_purpose": rng.choice(["Education", "Home", "Auto", "Personal"]),
+        "loan_type": rng.choice(["Unsecured", "Secured"]),
+    }
+
+
+def build_model_data(scaler, model, n: int = 400, seed: int = 0) -> dict:
+    """Small synthetic artifact with the same layout as model_data_v*.joblib."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({c: rng.uniform(0, 100, n) for c in COLS_TO_SCALE})
+    df["loan_to_income"] = rng.uniform(0, 5, n)
+    for c in FEATURES[7:]:
+        df[c] = rng.integers(0, 2, n)
+
+    df[COLS_TO_SCALE] = scaler.fit_transform(df[COLS_TO_SCALE])
+    X = df[FEATURES]
+    y = (X["delinquency_ratio"] + X["credit_utilization_ratio"] > np.median(X["delinquency_ratio"] + X["credit_utilization_ratio"])).astype(int)
+    model.fit(X, y)
+
+    return {"model": model, "scaler": scaler, "features": X.columns, "cols_to_scale": list(COLS_TO_SCALE)}
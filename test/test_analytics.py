@@ -0,0 +1,79 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from api.analytics import compute_analytics, score_edges
+from api.db_sqlite import insert_predictions
+from api.main import app
+from test.synthetic import random_payload
+
+client = TestClient(app)
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _seed(n=2000):
+    rng = random.Random(11)
+    rows = [
+        {
+            "created_at": (START + timedelta(minutes=i)).isoformat(),
+            "payload": random_payload(rng),
+            "default_probability": rng.betavariate(2, 5),
+            "credit_score": rng.randint(300, 900),
+            "rating": rng.choice(["Poor", "Average", "Good", "Excellent"]),
+        }
+        for i in range(n)
+    ]
+    insert_predictions(rows)
+    return pd.DataFrame(rows)
+
+
+def test_matches_pandas_over_a_time_range():
+    df = _seed()
+    since, until = START + timedelta(minutes=200), START + timedelta(minutes=1500)
+    out = compute_analytics(since=since, until=until, quantiles=[0.5, 0.9])
+
+    window = df[(df["created_at"] >= since.isoformat()) & (df["created_at"] < until.isoformat())]
+    assert out["count"] == len(window)
+
+    expected_ratings = window["rating"].value_counts().to_dict()
+    assert {k: v for k, v in out["rating_counts"].items() if v} == expected_ratings
+
+    # same bins the dashboard used to build with pd.cut
+    cut = pd.cut(window["credit_score"], bins=[300, 400, 500, 600, 700, 800, 900], include_lowest=True)
+    assert [b["count"] for b in out["score_histogram"]] == cut.value_counts(sort=False).tolist()
+
+    for q, value in out["probability_quantiles"].items():
+        assert value == pytest.approx(np.quantile(window["default_probability"], float(q)), abs=0.01)
+
+
+def test_custom_edges_and_empty_range():
+    _seed(100)
+    out = compute_analytics(edges=[300, 650, 900])
+    assert [b["bin"] for b in out["score_histogram"]] == ["300-650", "650-900"]
+    assert sum(b["count"] for b in out["score_histogram"]) == 100
+
+    empty = compute_analytics(since=START + timedelta(days=30))
+    assert empty["count"] == 0
+    assert all(v is None for v in empty["probability_quantiles"].values())
+
+    assert score_edges(bins=3) == [300, 500, 700, 900]
+    with pytest.raises(ValueError):
+        score_edges(edges=[500])
+
+
+def test_analytics_endpoint():
+    _seed(50)
+    r = client.get("/analytics", params={"score_bins": 12, "quantiles": [0.5]})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["count"] == 50
+    assert len(body["score_histogram"]) == 12
+    assert list(body["probability_quantiles"]) == ["0.5"]
+    assert len(r.content) < 2000
+
+    assert client.get("/analytics", params={"quantiles": [1.5]}).status_code == 400
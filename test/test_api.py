@@ -1,6 +1,9 @@
+import pytest
 from fastapi.testclient import TestClient
 from api.main import app
 
+pytestmark = pytest.mark.usefixtures("synthetic_model")
+
 client = TestClient(app)
 
 
@@ -52,3 +55,42 @@ def test_predict_rejects_bad_age():
 
     r = client.post("/predict", json=payload)
     assert r.status_code == 422
+
+
+def test_predict_batch_matches_single_in_order():
+    base = {
+        "age": 28,
+        "income": 1200000,
+        "loan_amount": 2560000,
+        "loan_tenure_months": 36,
+        "avg_dpd_per_delinquency": 20,
+        "delinquency_ratio": 30,
+        "credit_utilization_ratio": 30,
+        "num_open_accounts": 2,
+        "residence_type": "Owned",
+        "loan_purpose": "Home",
+        "loan_type": "Secured",
+    }
+    payloads = [
+        base,
+        {**base, "age": 55, "delinquency_ratio": 80, "residence_type": "Rented"},
+        {**base, "income": 0, "loan_purpose": "Auto", "loan_type": "Unsecured"},
+    ]
+
+    r = client.post("/predict-batch", json=payloads)
+    assert r.status_code == 200
+
+    data = r.json()
+    assert len(data) == len(payloads)
+    assert len({d["prediction_id"] for d in data}) == len(payloads)
+
+    for payload, row in zip(payloads, data):
+        single = client.post("/predict", json=payload).json()
+        assert abs(single["default_probability"] - row["default_probability"]) < 1e-12
+        assert single["credit_score"] == row["credit_score"]
+        assert single["rating"] == row["rating"]
+
+
+def test_predict_batch_rejects_bad_row():
+    r = client.post("/predict-batch", json=[{"age": 10}])
+    assert r.status_code == 422
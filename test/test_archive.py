@@ -0,0 +1,152 @@
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from api import archive  # noqa: E402
+from api.analytics import compute_analytics  # noqa: E402
+from api.db_sqlite import (  # noqa: E402
+    INPUT_COLUMNS,
+    PREDICTION_COLUMNS,
+    _load_accumulator_from,
+    get_accumulated_count,
+    get_prediction_count,
+    insert_predictions,
+    read_conn,
+    rebuild_drift_accumulator,
+    rebuild_rollups,
+    reclaim_space,
+)
+from test.synthetic import random_payload  # noqa: E402
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def archive_dir(tmp_path, monkeypatch):
+    path = tmp_path / "archive"
+    monkeypatch.setattr(archive, "ARCHIVE_DIR", path)
+    return path
+
+
+def _seed(n=1200):
+    rng = random.Random(9)
+    rows = [
+        {
+            "prediction_id": f"pred-{i}",
+            "created_at": (START + timedelta(minutes=10 * i)).isoformat(),  # ~8 days
+            "payload": random_payload(rng),
+            "default_probability": rng.random(),
+            "credit_score": rng.randint(300, 900),
+            "rating": rng.choice(["Poor", "Average", "Good", "Excellent"]),
+        }
+        for i in range(n)
+    ]
+    insert_predictions(rows)
+    return rows
+
+
+def test_archive_moves_rows_into_date_partitions(archive_dir):
+    rows = _seed()
+    cutoff = START + timedelta(days=5)
+    result = archive.archive_predictions(cutoff, batch_rows=300)
+
+    n_old = sum(r["created_at"] < cutoff.isoformat() for r in rows)
+    assert result["archived"] == n_old
+    assert get_prediction_count() == len(rows) - n_old
+    assert sorted(p.name for p in archive_dir.iterdir()) == [f"date=2026-01-0{d}" for d in range(1, 6)]
+
+    # nothing left to do on a second run
+    assert archive.archive_predictions(cutoff)["archived"] == 0
+
+
+def test_load_predictions_spans_archive_and_live(archive_dir):
+    rows = _seed()
+    archive.archive_predictions(START + timedelta(days=5), batch_rows=500)
+
+    since, until = START + timedelta(days=3, hours=7), START + timedelta(days=6)
+    df = archive.load_predictions(since, until, columns=["created_at", "age", "rating"])
+    expected = [r for r in rows if since.isoformat() <= r["created_at"] < until.isoformat()]
+    assert list(df.columns) == ["created_at", "age", "rating"]
+    assert df["created_at"].tolist() == [r["created_at"] for r in expected]
+    assert df["age"].tolist() == [r["payload"]["age"] for r in expected]
+
+    # projection: only the requested columns come out of the files
+    old = archive.read_archive(since=since, columns=["credit_score"])
+    assert list(old.columns) == ["credit_score"]
+
+    full = archive.read_archive()
+    assert set(INPUT_COLUMNS) <= set(full.columns)
+    assert full["prediction_uid"].tolist()[:3] == ["pred-0", "pred-1", "pred-2"]
+
+
+def test_archive_keeps_the_raw_request(archive_dir):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = _seed(300)
+    archive.archive_predictions(START + timedelta(days=1), batch_rows=100)
+    df = archive.read_archive(columns=["prediction_uid", "input_json"])
+    by_uid = {r["prediction_id"]: r["payload"] for r in rows}
+    assert len(df) == 144
+    assert all(json.loads(raw) == by_uid[uid] for uid, raw in zip(df["prediction_uid"], df["input_json"]))
+
+    # a partition written before input_json was archived still reads (as null)
+    old = archive.read_archive(columns=list(PREDICTION_COLUMNS)).head(3)
+    old_dir = archive_dir / "date=2025-12-31"
+    old_dir.mkdir()
+    old = old.assign(id=[-3, -2, -1], created_at=(START - timedelta(days=1)).isoformat())
+    pq.write_table(pa.Table.from_pandas(old, preserve_index=False), old_dir / "part--3--1.parquet")
+    df = archive.read_archive(until=START, columns=["id", "input_json"])
+    assert df["id"].tolist() == [-3, -2, -1]
+    assert df["input_json"].isna().all()
+
+
+def test_raw_analytics_include_archived_rows(archive_dir):
+    rows = _seed()
+    before = compute_analytics(since=START + timedelta(minutes=5))
+    archive.archive_predictions(START + timedelta(days=4))
+    after = compute_analytics(since=START + timedelta(minutes=5))
+
+    assert after["source"] == "raw"
+    assert after["count"] == len(rows) - 1
+    for key in ["rating_counts", "score_histogram", "probability_quantiles"]:
+        assert after[key] == before[key]
+
+
+def test_deleted_pages_are_released(archive_dir):
+    _seed()
+    with read_conn() as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        pages_before = conn.execute("PRAGMA page_count").fetchone()[0]
+
+    archive.archive_predictions(START + timedelta(days=30))
+    assert reclaim_space() == 0
+    with read_conn() as conn:
+        assert conn.execute("PRAGMA page_count").fetchone()[0] < pages_before
+
+
+def _rollup_state():
+    with read_conn() as conn:
+        return (
+            sorted(tuple(r) for r in conn.execute("SELECT grain, bucket, n, round(sum_p, 9) FROM prediction_rollups")),
+            sorted(tuple(r) for r in conn.execute("SELECT * FROM prediction_rollup_hist")),
+        )
+
+
+def test_rebuilds_keep_archived_history(archive_dir):
+    rows = _seed()
+    rollups = _rollup_state()
+    _, sums, sumsqs = _load_accumulator_from(read_conn)
+
+    archive.archive_predictions(START + timedelta(days=5), batch_rows=300)
+    assert rebuild_rollups() == len(rows)
+    assert _rollup_state() == rollups
+    assert rebuild_drift_accumulator() == len(rows)
+    assert get_accumulated_count() == len(rows)
+    _, new_sums, new_sumsqs = _load_accumulator_from(read_conn)
+    assert new_sums == pytest.approx(sums) and new_sumsqs == pytest.approx(sumsqs)
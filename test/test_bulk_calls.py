@@ -0,0 +1,50 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from api.db_sqlite import get_prediction_count
+from api.main import app
+from scripts.bulk_calls import percentile, run_load
+
+pytestmark = pytest.mark.usefixtures("synthetic_model")
+
+
+def _run(**kwargs):
+    return asyncio.run(run_load(url="http://test", transport=httpx.ASGITransport(app=app), **kwargs))
+
+
+def test_closed_loop_counts_every_request():
+    result = _run(endpoint="predict", concurrency=4, requests=30)
+    assert result["ok"] == 30
+    assert result["errors"] == {}
+    assert get_prediction_count() == 30
+    lat = result["latency_ms"]
+    assert 0 < lat["p50"] <= lat["p95"] <= lat["p99"] <= lat["max"]
+
+
+def test_open_loop_with_replay_and_batches(payloads, tmp_path):
+    replay = tmp_path / "payloads.jsonl"
+    replay.write_text("\n".join(json.dumps(p) for p in payloads[:3]))
+
+    result = _run(endpoint="predict-batch", batch_size=5, rate=200, duration=0.2, concurrency=2, replay=replay)
+    assert result["config"]["mode"] == "open"
+    assert result["ok"] > 0
+    assert get_prediction_count() == 5 * result["ok"]
+
+
+def test_errors_are_broken_down_by_kind(payloads, tmp_path):
+    bad = tmp_path / "bad.jsonl"
+    bad.write_text(json.dumps({**payloads[0], "age": 3}))
+    result = _run(endpoint="predict", requests=5, concurrency=2, replay=bad)
+    assert result["ok"] == 0
+    assert result["errors"] == {"http_422": 5}
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile([], 50) is None
@@ -0,0 +1,114 @@
+import gc
+import random
+import sqlite3
+import threading
+import time
+import weakref
+
+from api import db_sqlite
+from api.db_sqlite import fetch_logs, get_prediction_count, insert_predictions, read_conn
+from api.prediction_logger import new_prediction_id
+from test.synthetic import random_payload
+
+_rng = random.Random(0)
+
+
+def _rows(n: int) -> list:
+    return [
+        {
+            "prediction_id": new_prediction_id(),
+            "created_at": "2026-01-01T00:00:00+00:00",
+            "payload": random_payload(_rng),
+            "default_probability": 0.2,
+            "credit_score": 780,
+            "rating": "Excellent",
+        }
+        for i in range(n)
+    ]
+
+
+def test_connections_use_wal_and_are_reused():
+    with read_conn() as a, read_conn() as b:
+        assert a is b
+        assert a.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert a.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+    seen = []
+    t = threading.Thread(target=lambda: seen.append(db_sqlite._pool().read().__enter__()))
+    t.start()
+    t.join()
+    with read_conn() as mine:
+        assert seen[0] is not mine
+
+
+def test_reader_connection_closes_when_its_thread_exits():
+    pool = db_sqlite._pool()
+    opened = []
+
+    def read_once():
+        with read_conn() as conn:
+            conn.execute("SELECT 1")
+            opened.append(weakref.ref(conn))
+
+    threads = [threading.Thread(target=read_once) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    gc.collect()
+    assert all(ref() is None for ref in opened)
+    assert len(pool._readers) <= 1  # at most this thread's own reader
+
+
+def test_readers_do_not_wait_for_an_open_write_transaction():
+    insert_predictions(_rows(10))
+    counts = []
+    with db_sqlite.write_conn() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        db_sqlite._accumulate_rollups(conn, [("2026-01-01T00:00:00+00:00", 0.5, 700, "Good")])
+
+        def read():
+            start = time.perf_counter()
+            with read_conn() as reader:
+                counts.append(reader.execute("SELECT COUNT(*) FROM predictions").fetchone()[0])
+            counts.append(time.perf_counter() - start)
+
+        t = threading.Thread(target=read)
+        t.start()
+        t.join(timeout=2)
+        assert not t.is_alive()
+    # the reader saw the last committed state right away (WAL snapshot, no busy wait)
+    assert counts[0] == 10
+    assert counts[1] < 0.5
+
+
+def _run_mixed_load(n_threads: int, ops_per_thread: int) -> None:
+    errors = []
+
+    def worker(tid: int):
+        try:
+            for i in range(ops_per_thread):
+                if i % 4 == 0:
+                    insert_predictions(_rows(5))
+                else:
+                    fetch_logs(limit=20)
+                    get_prediction_count()
+        except sqlite3.Error as e:  # e.g. "database is locked"
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(n_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+
+
+def test_mixed_load_has_no_lock_errors():
+    # throughput by thread count is measured in benchmarks/hot_paths.py (sqlite_mixed_*)
+    ops = 200
+    thread_counts = (1, 2, 4, 8)
+    for n in thread_counts:
+        _run_mixed_load(n, ops)
+
+    assert get_prediction_count() == sum(n * (ops // 4) * 5 for n in thread_counts)
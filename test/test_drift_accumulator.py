@@ -0,0 +1,95 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from api import db_sqlite
+from api.db_sqlite import (
+    fetch_drift_window,
+    get_accumulated_count,
+    insert_prediction,
+    insert_predictions,
+    read_conn,
+    rebuild_drift_accumulator,
+)
+from api.drift_monitor import zscore_drift, zscore_drift_from_means
+from test.synthetic import random_payload
+
+
+def _log(payloads):
+    insert_predictions(
+        [
+            {
+                "created_at": "2026-01-01T00:00:00+00:00",
+                "payload": p,
+                "default_probability": 0.3,
+                "credit_score": 720,
+                "rating": "Good",
+            }
+            for p in payloads
+        ]
+    )
+
+
+def test_window_matches_get_dummies_path():
+    rng = random.Random(7)
+    payloads = [random_payload(rng) for _ in range(250)]
+
+    # uneven batches so snapshot boundaries fall inside a batch
+    _log(payloads[:37])
+    for p in payloads[37:41]:
+        insert_prediction("2026-01-01T00:00:00+00:00", p, 0.3, 720, "Good")
+    _log(payloads[41:])
+
+    # window starts at the snapshot at or before 250 - 100 (i.e. #100)
+    assert fetch_drift_window(last_n=100)["count"] == 150
+    assert fetch_drift_window(last_n=50)["count"] == 50
+
+    window = fetch_drift_window(last_n=150)
+    assert window["count"] == 150
+
+    expected = pd.get_dummies(pd.DataFrame(payloads[-150:])).astype(float)
+    for col in expected.columns:
+        assert np.isclose(window["mean"][col], expected[col].mean(), rtol=1e-12)
+        assert np.isclose(window["std"][col], expected[col].std(ddof=0), rtol=1e-9, atol=1e-9)
+
+    baseline = {"features": {c: {"mean": 0.5, "std": 1.0} for c in list(expected.columns) + ["loan_to_income"]}}
+    pd.testing.assert_frame_equal(
+        zscore_drift_from_means(window["mean"], baseline),
+        zscore_drift(pd.get_dummies(pd.DataFrame(payloads[-150:])), baseline),
+    )
+
+
+def test_rebuild_reproduces_incremental_totals():
+    rng = random.Random(3)
+    _log([random_payload(rng) for _ in range(230)])
+    incremental = fetch_drift_window(last_n=130)
+
+    assert rebuild_drift_accumulator(chunk_size=64) == 230
+    assert get_accumulated_count() == 230
+    rebuilt = fetch_drift_window(last_n=130)
+
+    assert rebuilt["count"] == incremental["count"] == 130
+    for col, mean in incremental["mean"].items():
+        assert np.isclose(rebuilt["mean"][col], mean, rtol=1e-12)
+
+
+def test_snapshots_older_than_the_largest_window_are_pruned(monkeypatch):
+    monkeypatch.setattr(db_sqlite, "DRIFT_MAX_WINDOW", 300)
+    rng = random.Random(5)
+    payloads = [random_payload(rng) for _ in range(1050)]
+    for i in range(0, len(payloads), 70):
+        _log(payloads[i : i + 70])
+
+    with read_conn() as conn:
+        kept = [r[0] for r in conn.execute("SELECT n_predictions FROM drift_snapshots ORDER BY n_predictions")]
+    assert kept == [700, 800, 900, 1000]
+
+    # the largest window still starts at a kept snapshot
+    window = fetch_drift_window(last_n=300)
+    assert window["count"] == 350
+    expected = pd.get_dummies(pd.DataFrame(payloads[-350:])).astype(float)
+    assert np.isclose(window["mean"]["age"], expected["age"].mean(), rtol=1e-12)
+    with pytest.raises(ValueError):
+        fetch_drift_window(last_n=301)
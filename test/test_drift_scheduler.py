@@ -0,0 +1,37 @@
+import json
+import random
+
+from api.db_sqlite import fetch_drift_reports, insert_predictions
+from api.drift_monitor import DRIFT_COLUMNS
+from api.drift_scheduler import run_drift_check
+from test.synthetic import random_payload
+
+_rng = random.Random(11)
+
+
+def _log(n: int) -> None:
+    insert_predictions(
+        [
+            {
+                "created_at": "2026-01-01T00:00:00+00:00",
+                "payload": random_payload(_rng),
+                "default_probability": 0.4,
+                "credit_score": 660,
+                "rating": "Good",
+            }
+            for _ in range(n)
+        ]
+    )
+
+
+def test_drift_report_records_window_and_duration(tmp_path):
+    baseline = tmp_path / "drift_baseline.json"
+    baseline.write_text(json.dumps({"features": {c: {"mean": 1.0, "std": 1.0} for c in DRIFT_COLUMNS}}))
+    _log(200)
+
+    result = run_drift_check(window=100, baseline_path=str(baseline))
+    report = fetch_drift_reports(limit=1)[0]
+
+    assert result["window_size"] == report["window_size"] == 100
+    assert report["duration_ms"] >= 0
+    assert report["report"]["summary"]["window_size"] == 100
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import MinMaxScaler, RobustScaler, StandardScaler
+
+from api.feature_encoder import RAW_COLUMNS, FeatureEncoder
+from test.synthetic import build_model_data
+
+
+def legacy_prepare_input(md: dict, payload: dict) -> pd.DataFrame:
+    # the original pandas implementation of api.predictor.prepare_input
+    scaler = md["scaler"]
+    features = md["features"]
+    cols_to_scale = md["cols_to_scale"]
+
+    income = float(payload["income"])
+    loan_amount = float(payload["loan_amount"])
+    data = {
+        "age": float(payload["age"]),
+        "loan_tenure_months": float(payload["loan_tenure_months"]),
+        "number_of_open_accounts": float(payload["num_open_accounts"]),
+        "credit_utilization_ratio": float(payload["credit_utilization_ratio"]),
+        "loan_to_income": (loan_amount / income) if income > 0 else 0.0,
+        "delinquency_ratio": float(payload["delinquency_ratio"]),
+        "avg_dpd_per_delinquency": float(payload["avg_dpd_per_delinquency"]),
+        "residence_type_Owned": int(payload["residence_type"] == "Owned"),
+        "residence_type_Rented": int(payload["residence_type"] == "Rented"),
+        "loan_purpose_Education": int(payload["loan_purpose"] == "Education"),
+        "loan_purpose_Home": int(payload["loan_purpose"] == "Home"),
+        "loan_purpose_Personal": int(payload["loan_purpose"] == "Personal"),
+        "loan_type_Unsecured": int(payload["loan_type"] == "Unsecured"),
+    }
+    df = pd.DataFrame([data])
+    for c in cols_to_scale:
+        if c not in df.columns:
+            df[c] = 0.0
+    df[cols_to_scale] = scaler.transform(df[cols_to_scale])
+    df = df.reindex(columns=features, fill_value=0)
+    return df.astype(float)
+
+
+@pytest.mark.parametrize(
+    "scaler",
+    [MinMaxScaler(), MinMaxScaler(clip=True), StandardScaler(), RobustScaler()],
+    ids=["minmax", "minmax-clip", "standard", "robust-fallback"],
+)
+def test_encoder_matches_legacy_pandas_path(scaler, payloads):
+    md = build_model_data(scaler, LogisticRegression())
+    encoder = FeatureEncoder.from_model_data(md)
+
+    expected = np.vstack([legacy_prepare_input(md, p).to_numpy() for p in payloads])
+
+    assert encoder.features == list(md["features"])
+    np.testing.assert_array_equal(encoder.encode_many(payloads), expected)
+    np.testing.assert_array_equal(encoder.encode(payloads[0]), expected[:1])
+
+
+def test_encoder_writes_into_preallocated_buffer(payloads):
+    md = build_model_data(MinMaxScaler(), LogisticRegression())
+    encoder = FeatureEncoder.from_model_data(md)
+
+    buf = np.empty((len(payloads), len(RAW_COLUMNS) + 1))
+    raw = encoder.raw_matrix(payloads, out=buf)
+
+    assert raw is buf
+    np.testing.assert_array_equal(encoder.transform_raw(raw), encoder.encode_many(payloads))
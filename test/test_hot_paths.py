@@ -0,0 +1,46 @@
+from api import main as api_main
+from benchmarks.hot_paths import BENCHMARKS, compare, main, measure, run
+
+
+def test_measure_reports_rate_and_allocations():
+    r = measure(lambda: [0] * 10_000, min_time=0.05, rounds=2)
+    assert r["ops_per_s"] > 0
+    assert r["peak_alloc_kb"] >= 10_000 * 8 / 1024
+
+
+def test_gate_flags_slowdowns_and_allocation_growth():
+    baseline = {"a": {"ops_per_s": 1000.0, "peak_alloc_kb": 100.0}, "b": {"ops_per_s": 10.0, "peak_alloc_kb": 1.0}}
+    results = {
+        "a": {"ops_per_s": 700.0, "peak_alloc_kb": 400.0},
+        "b": {"ops_per_s": 9.0, "peak_alloc_kb": 50.0},  # within tolerance / below the 64 KB floor
+        "new": {"ops_per_s": 1.0, "peak_alloc_kb": 1e6},  # not in the baseline yet
+    }
+    assert [name for name, _ in compare(results, baseline)] == ["a", "a"]
+
+
+def test_every_hot_path_is_covered():
+    names = " ".join(BENCHMARKS)
+    hot_paths = [
+        "prepare_input", "predict", "insert_prediction", "fetch_logs", "sqlite_mixed", "zscore_drift",
+        "save_baseline_stats",
+    ]
+    for hot_path in hot_paths + ["POST /predict"]:
+        assert hot_path in names
+
+
+def test_check_against_saved_baseline(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    args = ["-k", "fetch_logs", "--time", "0.05", "--rounds", "1", "--baseline", str(baseline)]
+    assert main(args + ["--save"]) == 0
+    assert main(args + ["--check", "--tolerance", "0.99"]) == 0
+
+
+def test_check_without_baseline_fails(tmp_path):
+    args = ["-k", "fetch_logs", "--time", "0.05", "--rounds", "1", "--baseline", str(tmp_path / "missing.json")]
+    assert main(args + ["--check"]) == 2
+
+
+def test_benchmark_setup_restores_global_state(synthetic_model):
+    cache = api_main.prediction_cache
+    run(["POST /predict (TestClient)"], min_time=0.05, rounds=1)
+    assert api_main.prediction_cache is cache
@@ -0,0 +1,63 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import main
+from api.inference_executor import InferenceExecutor, Overloaded
+from api.prediction_cache import PredictionCache
+
+pytestmark = pytest.mark.usefixtures("synthetic_model")
+
+client = TestClient(main.app)
+
+
+def test_admits_up_to_max_pending_then_rejects():
+    gate = threading.Event()
+    executor = InferenceExecutor(max_workers=1, max_pending=2)
+    running = [executor.submit(gate.wait), executor.submit(gate.wait)]
+
+    with pytest.raises(Overloaded):
+        executor.submit(gate.wait)
+    stats = executor.stats()
+    assert stats["rejected"] == 1
+    assert stats["queue_depth"] == 1
+
+    gate.set()
+    assert all(f.result(timeout=5) for f in running)
+    executor.stop()
+    assert executor.stats()["completed"] == 2
+    assert executor.stats()["queue_depth"] == 0
+
+
+def test_run_awaits_result_and_counts_failures():
+    executor = InferenceExecutor(max_workers=2)
+    assert asyncio.run(executor.run(sum, [1, 2, 3])) == 6
+    with pytest.raises(ZeroDivisionError):
+        asyncio.run(executor.run(lambda: 1 / 0))
+    executor.stop()
+    assert executor.stats()["failed"] == 1
+
+
+def test_full_executor_answers_503_with_retry_after(payloads, monkeypatch):
+    gate = threading.Event()
+    executor = InferenceExecutor(max_workers=1, max_pending=1, retry_after_s=2.5)
+    monkeypatch.setattr(main, "inference_executor", executor)
+    # a cached payload would never reach the executor
+    monkeypatch.setattr(main, "prediction_cache", PredictionCache(max_entries=0))
+
+    blocker = executor.submit(gate.wait)
+    try:
+        r = client.post("/predict", json=payloads[0])
+        assert r.status_code == 503
+        assert r.headers["Retry-After"] == "3"
+        assert client.post("/predict-batch", json=payloads[:3]).status_code == 503
+        # cheap endpoints keep answering while inference is saturated
+        assert client.get("/stats").json()["inference"]["rejected"] == 2
+    finally:
+        gate.set()
+        blocker.result(timeout=5)
+
+    assert client.post("/predict", json=payloads[0]).status_code == 200
+    executor.stop()
@@ -0,0 +1,88 @@
+import random
+import threading
+
+from api.db_sqlite import insert_predictions, try_acquire_lease
+from api.job_scheduler import JobScheduler
+from test.synthetic import random_payload
+
+JOB = "test-job"
+
+_rng = random.Random(11)
+
+
+def _log(n: int) -> None:
+    insert_predictions(
+        [
+            {
+                "created_at": "2026-01-01T00:00:00+00:00",
+                "payload": random_payload(_rng),
+                "default_probability": 0.4,
+                "credit_score": 660,
+                "rating": "Good",
+            }
+            for _ in range(n)
+        ]
+    )
+
+
+def test_count_trigger_runs_once_per_bucket_across_workers():
+    calls = []
+    workers = [JobScheduler(job=lambda: calls.append(1), name=JOB, every_n=100) for _ in range(3)]
+
+    _log(99)
+    assert not any(w.run_once() for w in workers)
+
+    _log(130)  # 229 rows: crossed 100 and 200, one run is enough
+    assert sum(w.run_once() for w in workers) == 1
+    assert sum(w.run_once() for w in workers) == 0
+
+    _log(71)  # 300
+    assert sum(w.run_once() for w in workers) == 1
+    assert len(calls) == 2
+
+
+def test_count_trigger_after_accumulator_shrank(monkeypatch):
+    from api import job_scheduler
+
+    calls = []
+    worker = JobScheduler(job=lambda: calls.append(1), name=JOB, every_n=100)
+    _log(300)
+    assert worker.run_once()
+
+    # e.g. rebuilt from fewer rows than the last run saw
+    monkeypatch.setattr(job_scheduler, "get_accumulated_count", lambda: 120)
+    assert worker.run_once()
+    assert not worker.run_once()
+    assert len(calls) == 2
+
+
+def test_lease_held_elsewhere_blocks_run():
+    _log(100)
+    assert try_acquire_lease(JOB, "other-worker", ttl_s=60, now=1e12)
+
+    calls = []
+    scheduler = JobScheduler(job=lambda: calls.append(1), name=JOB, every_n=100)
+    # the scheduler's clock is earlier than the other worker's lease expiry
+    assert scheduler.run_once() is False
+    assert scheduler.stats()["skipped_locked"] == 1
+    assert calls == []
+
+
+def test_interval_trigger_and_failing_job_never_raise():
+    _log(5)
+
+    def broken_job():
+        raise RuntimeError("baseline missing")
+
+    scheduler = JobScheduler(job=broken_job, name=JOB, every_n=0, interval_s=0.01)
+    assert scheduler.run_once() is True
+    assert scheduler.stats()["failures"] == 1
+
+
+def test_background_thread_runs_job():
+    _log(100)
+    done = threading.Event()
+    scheduler = JobScheduler(job=done.set, name=JOB, every_n=100, poll_s=0.01)
+    scheduler.start()
+    assert done.wait(timeout=5)
+    scheduler.stop()
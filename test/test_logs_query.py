@@ -0,0 +1,94 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from api.db_sqlite import fetch_logs_page, insert_predictions, read_conn
+from api.main import app
+from test.synthetic import random_payload
+
+client = TestClient(app)
+
+RATINGS = ["Poor", "Average", "Good", "Excellent"]
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _seed(n=300):
+    rng = random.Random(3)
+    rows = [
+        {
+            "prediction_id": f"pred-{i}",
+            # a few rows share a timestamp so ties are broken by id
+            "created_at": (START + timedelta(minutes=i // 3)).isoformat(),
+            "payload": random_payload(rng),
+            "default_probability": rng.random(),
+            "credit_score": rng.randint(300, 900),
+            "rating": RATINGS[i % 4],
+        }
+        for i in range(n)
+    ]
+    insert_predictions(rows)
+    return rows
+
+
+def test_cursor_walks_every_row_once():
+    rows = _seed()
+    seen = []
+    cursor = None
+    while True:
+        page = fetch_logs_page(limit=47, cursor=cursor)
+        seen += [r["prediction_id"] for r in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [r["prediction_id"] for r in reversed(rows)]
+
+
+def test_filters_match_python():
+    rows = _seed()
+    since = START + timedelta(minutes=10)
+    until = START + timedelta(minutes=60)
+    items = fetch_logs_page(
+        limit=1000, since=since, until=until, rating="Good", min_score=400, max_score=800
+    )["items"]
+
+    expected = [
+        r["prediction_id"]
+        for r in reversed(rows)
+        if since.isoformat() <= r["created_at"] < until.isoformat()
+        and r["rating"] == "Good"
+        and 400 <= r["credit_score"] <= 800
+    ]
+    assert expected
+    assert [r["prediction_id"] for r in items] == expected
+
+
+def test_pages_use_covering_indexes():
+    _seed(10)
+    with read_conn() as conn:
+        for where, index in [("", "idx_predictions_created"), ("WHERE rating = 'Good'", "idx_predictions_rating")]:
+            plan = " ".join(
+                str(r[-1])
+                for r in conn.execute(
+                    f"EXPLAIN QUERY PLAN SELECT id, prediction_uid, created_at, default_probability, "
+                    f"credit_score, rating FROM predictions {where} ORDER BY created_at DESC, id DESC LIMIT 20"
+                )
+            )
+            assert f"COVERING INDEX {index}" in plan
+            assert "TEMP B-TREE" not in plan
+
+
+def test_logs_endpoint_pages_with_header():
+    _seed(30)
+    r = client.get("/logs", params={"limit": 20, "rating": "Poor"})
+    assert r.status_code == 200
+    assert len(r.json()) == 8
+    assert "X-Next-Cursor" not in r.headers
+
+    r = client.get("/logs", params={"limit": 20})
+    assert len(r.json()) == 20
+    r2 = client.get("/logs", params={"limit": 20, "cursor": r.headers["X-Next-Cursor"]})
+    assert len(r2.json()) == 10
+
+    assert client.get("/logs", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/logs", params={"rating": "Great"}).status_code == 422
@@ -0,0 +1,69 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api import main
+from api.metrics import Histogram, Metrics, metrics
+from api.prediction_cache import PredictionCache
+
+pytestmark = pytest.mark.usefixtures("synthetic_model")
+
+client = TestClient(main.app)
+
+
+def test_histogram_buckets_are_cumulative():
+    h = Histogram([0.1, 1.0])
+    for v in (0.05, 0.1, 0.5, 2.0):
+        h.observe(v)
+    assert h.cumulative() == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+    assert h.count == 4 and h.sum == 2.65
+
+
+def test_render_prometheus_text():
+    m = Metrics(buckets=[0.01])
+    with m.timer("inference"):
+        pass
+    m.inc("predictions_total", 3, endpoint="/predict", rating="Good")
+    text = m.render({"inference_queue_depth": ("Waiting model calls", 2)}, {"cache_hits_total": ("Cache hits", 5)})
+
+    assert "# TYPE credit_api_stage_duration_seconds histogram" in text
+    assert 'credit_api_stage_duration_seconds_bucket{stage="inference",le="0.01"} 1' in text
+    assert 'credit_api_stage_duration_seconds_count{stage="inference"} 1' in text
+    assert 'credit_api_predictions_total{endpoint="/predict",rating="Good"} 3' in text
+    assert "# TYPE credit_api_inference_queue_depth gauge\ncredit_api_inference_queue_depth 2" in text
+    assert "# TYPE credit_api_cache_hits_total counter\ncredit_api_cache_hits_total 5" in text
+
+
+def test_disabled_metrics_record_nothing():
+    m = Metrics(enabled=False)
+    with m.timer("inference"):
+        pass
+    m.inc("predictions_total", endpoint="/predict", rating="Good")
+    m.observe_stage("validation", 0.1)
+    assert "credit_api_stage_duration_seconds_count" not in m.render()
+    assert "credit_api_predictions_total{" not in m.render()
+
+
+def test_metrics_endpoint_after_predict(payloads, monkeypatch):
+    # a cache hit would skip the feature_prep / inference stages
+    monkeypatch.setattr(main, "prediction_cache", PredictionCache(max_entries=0))
+    metrics.reset()
+    r = client.post("/predict", json=payloads[0])
+    assert r.status_code == 200
+    rating = r.json()["rating"]
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    text = r.text
+    for stage in ("validation", "feature_prep", "inference", "sqlite_write"):
+        assert f'credit_api_stage_duration_seconds_count{{stage="{stage}"}} 1' in text
+    assert f'credit_api_predictions_total{{endpoint="/predict",rating="{rating}"}} 1' in text
+    assert 'credit_api_request_duration_seconds_count{endpoint="/predict",method="POST",status="200"} 1' in text
+    assert "credit_api_inference_queue_depth 0" in text
+    assert "# TYPE credit_api_prediction_cache_misses_total counter\ncredit_api_prediction_cache_misses_total" in text
+    assert "# TYPE credit_api_inference_rejected_total counter" in text
+
+
+def test_metrics_endpoint_404_when_disabled(monkeypatch):
+    monkeypatch.setattr(metrics, "enabled", False)
+    assert client.get("/metrics").status_code == 404
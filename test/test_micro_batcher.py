@@ -0,0 +1,111 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import main, micro_batcher
+from api.metrics import Metrics
+from api.micro_batcher import MicroBatcher
+from api.prediction_cache import PredictionCache
+from api.predictor import predict
+
+pytestmark = pytest.mark.usefixtures("synthetic_model")
+
+
+def test_concurrent_requests_share_batches(payloads, monkeypatch):
+    recorded = Metrics()
+    monkeypatch.setattr(micro_batcher, "metrics", recorded)
+    calls = []
+
+    def score(rows):
+        calls.append(len(rows))
+        return [row["age"] for row in rows]
+
+    batcher = MicroBatcher(max_batch=16, max_wait_ms=20, score_fn=score)
+    batcher.start()
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(batcher.predict, payloads[:100]))
+    batcher.stop()
+
+    # every caller gets its own row's result back
+    assert results == [p["age"] for p in payloads[:100]]
+    assert sum(calls) == 100
+    assert max(calls) <= 16
+    assert len(calls) < 100
+
+    stats = batcher.stats()
+    assert stats["batches"] == len(calls)
+    assert stats["batch_size"]["count"] == len(calls)
+    assert stats["queue_delay_ms"]["count"] == 100
+    assert sum(stats["batch_size"]["buckets"].values()) == len(calls)
+
+    # the same histograms are exported on /metrics
+    text = recorded.render()
+    assert f"credit_api_micro_batch_size_count {len(calls)}" in text
+    assert f'credit_api_micro_batch_size_bucket{{le="16"}} {len(calls)}' in text
+    assert "credit_api_micro_batch_queue_delay_seconds_count 100" in text
+
+
+def test_lone_request_waits_at_most_the_window(payloads):
+    batcher = MicroBatcher(max_batch=64, max_wait_ms=5)
+    batcher.start()
+    result = batcher.predict(payloads[0], timeout=5)
+    batcher.stop()
+
+    assert result == predict(payloads[0])
+    assert batcher.stats()["queue_delay_ms"]["mean"] < 1000
+
+
+def test_scoring_error_reaches_every_caller(payloads):
+    gate = threading.Event()
+
+    def fail(rows):
+        gate.wait()
+        raise RuntimeError("model exploded")
+
+    batcher = MicroBatcher(max_batch=8, max_wait_ms=50, score_fn=fail)
+    batcher.start()
+    futures = [batcher.submit(p) for p in payloads[:3]]
+    gate.set()
+    for f in futures:
+        with pytest.raises(RuntimeError):
+            f.result(timeout=5)
+    batcher.stop()
+    assert batcher.stats()["failed_batches"] >= 1
+
+
+def test_rows_pinned_to_different_models_are_scored_apart(payloads):
+    v1, v2 = object(), object()
+    calls = []
+
+    def score(rows, model=None):
+        calls.append((model, len(rows)))
+        return [model] * len(rows)
+
+    batcher = MicroBatcher(max_batch=8, max_wait_ms=50, score_fn=score)
+    futures = [batcher.submit(p, m) for p, m in zip(payloads[:4], [v1, v2, v1, None])]
+    batcher.start()  # all four are already queued, so they form one batch
+    results = [f.result(timeout=5) for f in futures]
+    batcher.stop()
+
+    assert results == [v1, v2, v1, None]
+    assert calls == [(v1, 2), (v2, 1), (None, 1)]
+    assert batcher.stats()["batches"] == 1
+
+
+def test_predict_endpoint_goes_through_the_batcher(payloads, monkeypatch):
+    monkeypatch.setattr(main.settings, "PREDICT_BATCHING", True)
+    monkeypatch.setattr(main, "prediction_cache", PredictionCache(max_entries=0))
+    with TestClient(main.app) as client:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            responses = list(pool.map(lambda p: client.post("/predict", json=p), payloads[:20]))
+        stats = client.get("/stats").json()["micro_batcher"]
+
+    assert all(r.status_code == 200 for r in responses)
+    assert [r.json()["default_probability"] for r in responses] == pytest.approx(
+        [predict(p)[0] for p in payloads[:20]]
+    )
+    assert stats["running"] is True
+    assert stats["submitted"] == 20
+    assert not main.micro_batcher.running
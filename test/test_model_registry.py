@@ -0,0 +1,116 @@
+import random
+
+import joblib
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from api import main, model_registry
+from api.main import app
+from api.model_registry import ModelRegistry
+from api.prediction_cache import PredictionCache, payload_key
+from api.predictor import predict_batch
+from api.settings import settings
+from test.synthetic import build_model_data, random_payload
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def artifact_dir(tmp_path):
+    joblib.dump(build_model_data(MinMaxScaler(), LogisticRegression(), seed=1), tmp_path / "model_data_v1.joblib")
+    joblib.dump(build_model_data(StandardScaler(), LogisticRegression(C=0.05), seed=2), tmp_path / "model_data_v2.joblib")
+    joblib.dump(build_model_data(MinMaxScaler(), LogisticRegression(C=5.0), seed=3), tmp_path / "model_data_v10.joblib")
+    (tmp_path / "model_data_v2.compiled.joblib.tmp").write_text("not an artifact")
+    (tmp_path / "notes.txt").write_text("ignored")
+    return tmp_path
+
+
+@pytest.fixture
+def registry(artifact_dir, monkeypatch):
+    reg = ModelRegistry(artifact_dir, default_version="v1", max_bytes=10**9)
+    monkeypatch.setattr(model_registry, "registry", reg)
+    return reg
+
+
+def test_discovers_versions_in_numeric_order_and_loads_lazily(registry):
+    assert list(registry.discover()) == ["v1", "v2", "v10"]
+    assert registry.stats()["loaded_versions"] == []
+
+    assert registry.active.version == "v1"
+    assert registry.get("v1") is registry.active
+    assert registry.stats()["loads"] == 1
+
+    with pytest.raises(KeyError):
+        registry.get("v3")
+
+
+def test_cache_is_memory_bounded_but_keeps_active(artifact_dir):
+    one = (artifact_dir / "model_data_v1.joblib").stat().st_size
+    reg = ModelRegistry(artifact_dir, default_version="v1", max_bytes=int(one * 1.5))
+
+    reg.active
+    reg.get("v2")
+    assert reg.stats()["loaded_versions"] == ["v1", "v2"]  # just loaded, kept for its caller
+    reg.get("v10")
+    assert reg.stats()["loaded_versions"] == ["v1", "v10"]
+    assert reg.stats()["evictions"] == 1
+
+
+def test_swap_leaves_in_flight_requests_on_their_model(registry):
+    rng = random.Random(0)
+    payloads = [random_payload(rng) for _ in range(50)]
+
+    in_flight = registry.active  # what a request picked up before the swap
+    before = predict_batch(payloads, model=in_flight)
+
+    registry.activate("v2")
+    assert registry.active_version == "v2"
+    assert predict_batch(payloads, model=in_flight) == before
+
+    after = predict_batch(payloads)
+    assert not np.allclose([r[0] for r in after], [r[0] for r in before])
+
+
+def test_swap_mid_request_scores_and_caches_under_one_version(registry, monkeypatch):
+    cache = PredictionCache(max_entries=100)
+    monkeypatch.setattr(main, "prediction_cache", cache)
+    scored_with = []
+
+    def swap_then_score(rows, model):
+        registry.activate("v2")  # lands between the cache lookup and the model call
+        scored_with.append(model.version)
+        return predict_batch(rows, model)
+
+    monkeypatch.setattr(main, "predict_batch", swap_then_score)
+    payload = random_payload(random.Random(0))
+    r = client.post("/predict", json=payload)
+
+    assert r.status_code == 200
+    assert scored_with == ["v1"]
+    assert cache.get(payload_key(payload, "v1"))[0] == r.json()["default_probability"]
+    assert cache.get(payload_key(payload, "v2")) is None
+
+
+def test_admin_activate_endpoint(registry, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+    assert client.post("/admin/models/v2/activate").status_code == 403
+
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    assert client.post("/admin/models/v2/activate", headers={"X-Admin-Token": "nope"}).status_code == 401
+    assert client.post("/admin/models/v9/activate", headers={"X-Admin-Token": "s3cret"}).status_code == 404
+
+    r = client.post("/admin/models/v2/activate", headers={"X-Admin-Token": "s3cret"})
+    assert r.status_code == 200
+    assert r.json()["previous_version"] == "v1"
+
+    info = client.get("/model-info").json()
+    assert info["model_version"] == "v2"
+    assert info["scaler_type"] == "StandardScaler"
+    assert info["artifact_path"].endswith("model_data_v2.joblib")
+
+    listed = {m["version"]: m for m in client.get("/models").json()}
+    assert listed["v2"]["active"] and listed["v2"]["loaded"]
+    assert not listed["v10"]["loaded"]
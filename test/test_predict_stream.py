@@ -0,0 +1,94 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.background import BackgroundTask
+
+from api import main
+from api.db_sqlite import get_prediction_count
+from api.inference_executor import Overloaded
+from api.ndjson_stream import NDJSONStreamingResponse, iter_ndjson_lines
+from api.predictor import predict
+
+pytestmark = pytest.mark.usefixtures("synthetic_model")
+
+client = TestClient(main.app)
+
+
+def _collect(chunks, max_line_bytes=100):
+    async def gen():
+        for c in chunks:
+            yield c
+
+    async def run():
+        return [item async for item in iter_ndjson_lines(gen(), max_line_bytes)]
+
+    return asyncio.run(run())
+
+
+def test_lines_split_across_network_chunks():
+    assert _collect([b'{"a"', b":1}\n\n{", b'"b":2}']) == [(1, b'{"a":1}'), (2, b""), (3, b'{"b":2}')]
+    # an oversized line is dropped without buffering it, the next one still parses
+    assert _collect([b"x" * 80, b"y" * 80, b"\nok\n"]) == [(1, None), (2, b"ok")]
+
+
+def test_stream_scores_in_chunks_with_inline_errors(payloads, monkeypatch):
+    monkeypatch.setattr(main.settings, "STREAM_CHUNK_ROWS", 7)
+    lines = [json.dumps(p) for p in payloads[:20]]
+    lines[3] = "not json"
+    lines[9] = json.dumps({**payloads[9], "age": 5})
+    body = ("\n".join(lines) + "\n").encode()
+
+    def upload():
+        # arrives in odd-sized pieces, like a real upload
+        for i in range(0, len(body), 333):
+            yield body[i : i + 333]
+
+    with client.stream("POST", "/predict-stream", content=upload()) as r:
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("application/x-ndjson")
+        out = [json.loads(line) for line in r.iter_lines() if line]
+
+    assert [o["line"] for o in out] == list(range(1, 21))
+    assert out[3]["errors"][0]["type"] == "json_invalid"
+    assert out[9]["errors"][0]["loc"] == ["age"]
+    good = [i for i in range(20) if i not in (3, 9)]
+    for i in good:
+        assert out[i]["default_probability"] == pytest.approx(predict(payloads[i])[0])
+    assert get_prediction_count() == len(good)
+
+
+def test_chunk_gives_up_after_overload_timeout(payloads, monkeypatch):
+    monkeypatch.setattr(main.settings, "STREAM_OVERLOAD_TIMEOUT_S", 0.1)
+
+    async def always_full(batch):
+        raise Overloaded(1.0)
+
+    monkeypatch.setattr(main, "_score", always_full)
+    body = "\n".join([json.dumps(payloads[0]), "not json", json.dumps(payloads[1])]) + "\n"
+    r = client.post("/predict-stream", content=body.encode())
+
+    out = [json.loads(line) for line in r.text.splitlines()]
+    assert [o["line"] for o in out] == [1, 2, 3]
+    assert [o["errors"][0]["type"] for o in out] == ["overloaded", "json_invalid", "overloaded"]
+    assert get_prediction_count() == 0
+
+
+def test_streaming_response_runs_background_task():
+    ran = []
+
+    async def body():
+        yield b"{}\n"
+
+    response = NDJSONStreamingResponse(body(), background=BackgroundTask(ran.append, "done"))
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    asyncio.run(response({"type": "http", "asgi": {"spec_version": "2.4"}}, receive, send))
+    assert sent[-1]["type"] == "http.response.body" and ran == ["done"]
@@ -0,0 +1,57 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import main
+from api.db_sqlite import get_prediction_count
+from api.prediction_cache import PredictionCache, payload_key
+
+pytestmark = pytest.mark.usefixtures("synthetic_model")
+
+client = TestClient(main.app)
+
+
+def test_key_is_canonical_and_version_aware(payloads):
+    p = payloads[0]
+    shuffled = dict(reversed(list(p.items())))
+    assert payload_key(p, "v1") == payload_key(shuffled, "v1")
+    assert payload_key(p, "v1") != payload_key(p, "v2")
+    assert payload_key(p, "v1") != payload_key(payloads[1], "v1")
+
+
+def test_lru_and_ttl():
+    cache = PredictionCache(max_entries=2, ttl_s=0.05)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)  # evicts b, the least recently used
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    time.sleep(0.06)
+    assert cache.get("c") is None
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["expired"] == 1
+    assert stats["hits"] == 2
+
+    off = PredictionCache(max_entries=0)
+    off.put("a", 1)
+    assert not off.enabled and off.get("a") is None
+
+
+def test_repeated_payload_is_served_from_cache_but_still_logged(payloads, monkeypatch):
+    cache = PredictionCache(max_entries=100)
+    monkeypatch.setattr(main, "prediction_cache", cache)
+
+    first = client.post("/predict", json=payloads[0]).json()
+    again = client.post("/predict", json=payloads[0]).json()
+    batch = client.post("/predict-batch", json=[payloads[0], payloads[1]]).json()
+
+    assert again["default_probability"] == first["default_probability"]
+    assert again["prediction_id"] != first["prediction_id"]
+    assert batch[0]["credit_score"] == first["credit_score"]
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+    assert get_prediction_count() == 4
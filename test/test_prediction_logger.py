@@ -0,0 +1,85 @@
+import random
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.db_sqlite import fetch_logs, get_prediction_count
+from api.main import app
+from api.prediction_logger import PredictionLogger, new_prediction_id
+from test.synthetic import random_payload
+
+pytestmark = pytest.mark.usefixtures("synthetic_model")
+
+_rng = random.Random(0)
+
+
+def _row(i: int) -> dict:
+    return {
+        "prediction_id": new_prediction_id(),
+        "created_at": f"2026-01-01T00:00:{i:02d}+00:00",
+        "payload": random_payload(_rng),
+        "default_probability": 0.1,
+        "credit_score": 840,
+        "rating": "Excellent",
+    }
+
+
+def test_rows_are_written_in_batches():
+    batches = []
+    logger = PredictionLogger(batch_size=10, flush_interval=0.05, writer=lambda rows: batches.append(len(rows)))
+    logger.start()
+    logger.submit_many([_row(i) for i in range(25)])
+    logger.flush()
+    logger.stop()
+
+    assert sum(batches) == 25
+    assert max(batches) <= 10
+    assert logger.stats()["written"] == 25
+
+
+def test_full_queue_drops_and_counts():
+    release = threading.Event()
+    logger = PredictionLogger(max_queue=3, batch_size=1, flush_interval=0.01, writer=lambda rows: release.wait())
+    logger.start()
+
+    accepted = logger.submit_many([_row(i) for i in range(20)])
+    stats = logger.stats()
+    release.set()
+    logger.stop()
+
+    assert stats["dropped"] == 20 - accepted
+    assert stats["dropped"] > 0
+    assert stats["queue_depth"] <= 3
+
+
+def test_stop_flushes_queued_rows_to_sqlite():
+    logger = PredictionLogger(batch_size=1000, flush_interval=60)
+    logger.start()
+    logger.submit_many([_row(i) for i in range(7)])
+    logger.stop()
+
+    assert get_prediction_count() == 7
+
+
+def test_predict_response_id_matches_logged_row():
+    payload = {
+        "age": 28,
+        "income": 1200000,
+        "loan_amount": 2560000,
+        "loan_tenure_months": 36,
+        "avg_dpd_per_delinquency": 20,
+        "delinquency_ratio": 30,
+        "credit_utilization_ratio": 30,
+        "num_open_accounts": 2,
+        "residence_type": "Owned",
+        "loan_purpose": "Home",
+        "loan_type": "Secured",
+    }
+
+    # entering the client runs the lifespan: the write-behind logger is live
+    with TestClient(app) as client:
+        data = client.post("/predict", json=payload).json()
+        assert client.get("/stats").json()["prediction_logger"]["running"] is True
+
+    assert fetch_logs(limit=1)[0]["prediction_id"] == data["prediction_id"]
@@ -0,0 +1,128 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import main
+from api.prediction_cache import PredictionCache
+from api.profiler import ProfileSession, Profiler
+from api.settings import settings
+
+pytestmark = pytest.mark.usefixtures("synthetic_model")
+
+ADMIN = {"X-Admin-Token": "s3cret"}
+
+
+@pytest.fixture
+def admin(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    # every request should reach the model
+    monkeypatch.setattr(main, "prediction_cache", PredictionCache(max_entries=0))
+
+
+def _wait_for_session():
+    deadline = time.monotonic() + 5
+    while main.profiler.session is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert main.profiler.session is not None
+
+
+def test_profile_needs_admin_token(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+    client = TestClient(main.app)
+    assert client.post("/admin/profile", params={"seconds": 0.1}).status_code == 403
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    assert client.post("/admin/profile", params={"seconds": 0.1}, headers={"X-Admin-Token": "no"}).status_code == 401
+
+
+def test_only_one_session_at_a_time():
+    profiler = Profiler()
+    profiler.start(mode="sampling", interval_s=0.01)
+    with pytest.raises(RuntimeError):
+        profiler.start(mode="sampling")
+    profiler.stop()
+    profiler.start(mode="sampling")
+    profiler.stop()
+    assert profiler.session is None
+
+
+def test_cprofile_stops_after_n_requests(admin, payloads):
+    with TestClient(main.app) as client, ThreadPoolExecutor(max_workers=1) as pool:
+        params = {"mode": "cprofile", "requests": 3, "seconds": 30, "top": 500}
+        pending = pool.submit(client.post, "/admin/profile", params=params, headers=ADMIN)
+        _wait_for_session()
+        for p in payloads[:3]:
+            assert client.post("/predict", json=p).status_code == 200
+        r = pending.result(timeout=30)
+
+    assert r.status_code == 200
+    report = r.json()
+    assert report["requests"] == 3
+    assert report["seconds"] < 30
+    functions = " ".join(row["function"] for row in report["top_cumulative"])
+    assert "predict_batch" in functions  # profiled on the inference thread
+    assert main.profiler.session is None
+
+
+def test_cprofile_sees_micro_batched_calls(admin, payloads, monkeypatch):
+    monkeypatch.setattr(settings, "PREDICT_BATCHING", True)
+    submitted = main.micro_batcher.stats()["submitted"]
+    with TestClient(main.app) as client, ThreadPoolExecutor(max_workers=1) as pool:
+        params = {"mode": "cprofile", "requests": 3, "seconds": 30, "top": 500}
+        pending = pool.submit(client.post, "/admin/profile", params=params, headers=ADMIN)
+        _wait_for_session()
+        for p in payloads[:3]:
+            assert client.post("/predict", json=p).status_code == 200
+        r = pending.result(timeout=30)
+        assert main.micro_batcher.stats()["submitted"] == submitted + 3
+
+    functions = " ".join(row["function"] for row in r.json()["top_cumulative"])
+    assert "predict_batch" in functions  # profiled on the batcher thread
+
+
+def test_stop_does_not_wait_for_profiled_calls():
+    session = ProfileSession(mode="cprofile")
+    session.start()
+    release = threading.Event()
+    worker = threading.Thread(target=session.wrap(release.wait))
+    worker.start()
+    while session._in_flight == 0:
+        time.sleep(0.001)
+
+    started = time.perf_counter()
+    session.stop()  # on the loop thread: must not block on the running call
+    assert time.perf_counter() - started < 0.5
+    release.set()
+    session.finish()
+    worker.join()
+    assert any("wait" in row["function"] for row in session.report(top=500)["top_cumulative"])
+
+
+def test_sampling_download_and_memory(admin, payloads):
+    with TestClient(main.app) as client, ThreadPoolExecutor(max_workers=1) as pool:
+        params = {"seconds": 0.1, "memory": True, "download": True}
+        assert client.post("/admin/profile", params=params, headers=ADMIN).status_code == 400
+
+        pending = pool.submit(
+            client.post,
+            "/admin/profile",
+            params={"seconds": 0.5, "interval_ms": 1, "download": True},
+            headers=ADMIN,
+        )
+        _wait_for_session()
+        for p in payloads[:20]:
+            client.post("/predict", json=p)
+        r = pending.result(timeout=30)
+
+        assert r.status_code == 200
+        assert r.headers["content-disposition"].endswith('filename="profile.folded"')
+        lines = r.text.strip().splitlines()
+        assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+        r = client.post("/admin/profile", params={"seconds": 0.1, "memory": True}, headers=ADMIN)
+        report = r.json()
+        assert report["mode"] == "sampling"
+        assert {"samples", "idle_samples", "top_self", "top_cumulative"} <= set(report)
+        assert "net_growth_kb" in report["memory"]
@@ -0,0 +1,103 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+from api.analytics import compute_analytics, compute_trend, rollup_parts
+from api.db_sqlite import (
+    fetch_rollup_hist,
+    insert_prediction,
+    insert_predictions,
+    read_conn,
+    rebuild_rollups,
+)
+from test.synthetic import random_payload
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _seed(n=3000, step_minutes=7):
+    rng = random.Random(5)
+    rows = [
+        {
+            "created_at": (START + timedelta(minutes=i * step_minutes)).isoformat(),
+            "payload": random_payload(rng),
+            "default_probability": rng.random(),
+            "credit_score": rng.randint(300, 900),
+            "rating": rng.choice(["Poor", "Average", "Good", "Excellent"]),
+        }
+        for i in range(n)
+    ]
+    # mix of batch and single-row writes
+    insert_predictions(rows[:-10])
+    for r in rows[-10:]:
+        insert_prediction(r["created_at"], r["payload"], r["default_probability"], r["credit_score"], r["rating"])
+    return rows
+
+
+def _dump():
+    with read_conn() as conn:
+        return (
+            sorted(tuple(r) for r in conn.execute("SELECT grain, bucket, n, round(sum_p, 9) FROM prediction_rollups")),
+            sorted(tuple(r) for r in conn.execute("SELECT * FROM prediction_rollup_hist")),
+        )
+
+
+def test_incremental_matches_rebuild():
+    _seed()
+    incremental = _dump()
+    assert rebuild_rollups() == 3000
+    assert _dump() == incremental
+
+
+def test_rollup_analytics_match_raw():
+    _seed()
+    since = START + timedelta(hours=5)  # ragged start, whole days, ragged end
+    until = START + timedelta(days=9, hours=17)
+    parts = rollup_parts(since, until)
+    assert [p[0] for p in parts] == ["hour", "day", "hour"]
+
+    from_rollups = compute_analytics(since=since, until=until)
+    assert from_rollups["source"] == "rollup"
+
+    # an off-hour bound forces the raw path over the same rows
+    raw = compute_analytics(since=since, until=until - timedelta(microseconds=1))
+    assert raw["source"] == "raw"
+    for key in ["count", "rating_counts", "score_histogram", "probability_quantiles"]:
+        assert from_rollups[key] == raw[key]
+
+    # edges off the 10-point grid cannot come from rollups
+    assert compute_analytics(since=since, until=until, edges=[300, 555, 900])["source"] == "raw"
+
+
+def test_custom_edges_match_raw_at_the_first_edge():
+    day = START + timedelta(days=2)
+    created_at = (day + timedelta(hours=5, minutes=10)).isoformat()
+    for score in (395, 400, 450, 700):
+        insert_prediction(created_at, random_payload(random.Random(score)), 0.2, score, "Good")
+    since, until = day + timedelta(hours=5), day + timedelta(hours=6)
+
+    aligned = compute_analytics(since=since, until=until, edges=[400, 500, 900])
+    raw = compute_analytics(since=since, until=until - timedelta(microseconds=1), edges=[400, 500, 900])
+    assert raw["source"] == "raw"
+    assert aligned["score_histogram"] == raw["score_histogram"]
+    assert [b["count"] for b in raw["score_histogram"]] == [2, 1]
+
+    from_rollups = compute_analytics(since=since, until=until, edges=[300, 400, 500, 900])
+    assert from_rollups["source"] == "rollup"
+    assert [b["count"] for b in from_rollups["score_histogram"]] == [2, 1, 1]
+
+
+def test_trend_mean_and_std():
+    rows = pd.DataFrame(_seed(500))
+    trend = compute_trend(grain="day")
+    assert sum(t["count"] for t in trend) == 500
+
+    day = rows[rows["created_at"].str[:10] == trend[0]["bucket"]]["default_probability"]
+    assert trend[0]["mean_probability"] == pytest.approx(day.mean())
+    assert trend[0]["std_probability"] == pytest.approx(day.std(ddof=0))
+
+    hourly = compute_trend(grain="hour", limit=3)
+    assert len(hourly) == 3 and hourly[0]["bucket"] < hourly[-1]["bucket"]
+    assert sum(fetch_rollup_hist("hour")["rating"].values()) == 500
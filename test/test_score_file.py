@@ -0,0 +1,67 @@
+import json
+import sys
+import types
+
+import pandas as pd
+import pytest
+
+from api.db_sqlite import get_prediction_count
+from api.predictor import predict
+from scripts import score_file as score_file_cli
+from scripts.score_file import score_file
+
+pytestmark = pytest.mark.usefixtures("synthetic_model")
+
+
+def _expected(payloads):
+    return [predict(p) for p in payloads]
+
+
+def test_csv_in_parquet_out_across_processes(payloads, tmp_path):
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame(payloads)
+    df.loc[5, "age"] = 7  # fails the PredictRequest bounds
+    df.to_csv(tmp_path / "in.csv", index=False)
+
+    result = score_file(tmp_path / "in.csv", tmp_path / "out.parquet", chunk_rows=30, workers=2)
+
+    assert result["scored"] == len(payloads) - 1
+    assert result["invalid"] == 1
+    out = pd.read_parquet(tmp_path / "out.parquet")
+    assert out["row"].tolist() == [i for i in range(len(payloads)) if i != 5]
+    expected = [e for i, e in enumerate(_expected(payloads)) if i != 5]
+    assert out["default_probability"].tolist() == pytest.approx([e[0] for e in expected])
+    assert out["rating"].tolist() == [e[2] for e in expected]
+
+    errors = [json.loads(line) for line in (tmp_path / "out.parquet.errors.jsonl").read_text().splitlines()]
+    assert errors[0]["row"] == 5
+    assert errors[0]["errors"][0]["loc"] == ["age"]
+
+
+def test_jsonl_in_csv_out_and_db_load(payloads, tmp_path):
+    lines = [json.dumps(p) for p in payloads[:50]]
+    lines[10] = "{broken"
+    (tmp_path / "in.jsonl").write_text("\n".join(lines) + "\n")
+
+    result = score_file(tmp_path / "in.jsonl", tmp_path / "out.csv", chunk_rows=16, workers=1, to_db=True)
+
+    assert (result["scored"], result["invalid"]) == (49, 1)
+    out = pd.read_csv(tmp_path / "out.csv")
+    assert len(out) == 49
+    assert out.loc[0, "credit_score"] == predict(payloads[0])[1]
+    assert get_prediction_count() == 49
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        score_file(tmp_path / "in.xlsx", tmp_path / "out.csv")
+
+
+def test_cli_summary_with_zero_elapsed_time(payloads, tmp_path, monkeypatch, capsys):
+    (tmp_path / "in.jsonl").write_text(json.dumps(payloads[0]) + "\n")
+    monkeypatch.setattr(score_file_cli, "time", types.SimpleNamespace(perf_counter=lambda: 0.0))
+    argv = ["score_file", str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl"), "--workers", "1"]
+    monkeypatch.setattr(sys, "argv", argv)
+
+    score_file_cli.main()
+    assert "Scored 1 rows (0 invalid) in 0.0 s" in capsys.readouterr().out
@@ -0,0 +1,44 @@
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from api.feature_encoder import FeatureEncoder
+from api.scorers import LinearScorer, SklearnScorer, build_scorer
+from test.synthetic import build_model_data
+
+
+def test_fused_linear_scorer_matches_predict_proba(payloads):
+    for scaler in (MinMaxScaler(), StandardScaler()):
+        md = build_model_data(scaler, LogisticRegression())
+        encoder = FeatureEncoder.from_model_data(md)
+
+        scorer = build_scorer(md, encoder)
+        reference = SklearnScorer(md["model"], encoder)
+
+        assert isinstance(scorer, LinearScorer)
+        np.testing.assert_allclose(
+            scorer.predict_proba(payloads), reference.predict_proba(payloads), rtol=0, atol=1e-12
+        )
+
+
+def test_non_linear_models_use_sklearn_path(payloads):
+    md = build_model_data(MinMaxScaler(), RandomForestClassifier(n_estimators=5, random_state=0))
+    scorer = build_scorer(md, FeatureEncoder.from_model_data(md))
+    assert isinstance(scorer, SklearnScorer)
+
+    # clipping makes the scaler non-affine, so it cannot be folded either
+    md = build_model_data(MinMaxScaler(clip=True), LogisticRegression())
+    scorer = build_scorer(md, FeatureEncoder.from_model_data(md))
+    assert isinstance(scorer, SklearnScorer)
+
+
+def test_parity_failure_falls_back(monkeypatch):
+    md = build_model_data(MinMaxScaler(), LogisticRegression())
+    encoder = FeatureEncoder.from_model_data(md)
+
+    broken = LinearScorer.from_model(md["model"], encoder)
+    broken.intercept += 0.5
+    monkeypatch.setattr(LinearScorer, "from_model", classmethod(lambda cls, m, e: broken))
+
+    assert isinstance(build_scorer(md, encoder), SklearnScorer)
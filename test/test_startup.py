@@ -0,0 +1,52 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import model_registry
+from api.main import app
+from api.model_registry import ModelRegistry
+from api.predictor import warmup_payloads
+
+pytestmark = pytest.mark.usefixtures("synthetic_model")
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_warmup_payloads_cover_every_category():
+    payloads = warmup_payloads(12)
+    assert len(payloads) == 12
+    assert {p["loan_purpose"] for p in payloads} == {"Education", "Home", "Auto", "Personal"}
+    assert {p["residence_type"] for p in payloads} == {"Owned", "Rented", "Mortgage"}
+    assert payloads[0]["age"] == 18 and payloads[-1]["age"] == 100
+
+
+def test_ready_after_warmup():
+    client = TestClient(app)
+    with client:
+        r = client.get("/ready")
+        assert r.status_code == 200
+        assert r.json()["status"] == "ready"
+        assert r.json()["warmup_ms"] > 0
+        assert "v1" in model_registry.registry.stats()["loaded_versions"]
+    # shutting down flips readiness off again
+    assert client.get("/ready").status_code == 503
+
+
+def test_not_ready_when_model_fails_to_load(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_registry, "registry", ModelRegistry(tmp_path, "v1", max_bytes=10**9))
+    with TestClient(app) as client:
+        r = client.get("/ready")
+        assert r.status_code == 503
+        assert r.json()["status"] == "error"
+        assert client.get("/health").status_code == 200
+
+
+def test_serving_import_path_stays_lean():
+    code = "import sys, json, api.main; print(json.dumps(sorted(sys.modules)))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    loaded = set(json.loads(out.stdout.strip().splitlines()[-1]))
+    assert not loaded & {"pandas", "sklearn", "xgboost", "mlflow", "pyarrow"}
@@ -0,0 +1,89 @@
+import joblib
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import MinMaxScaler
+
+from api.feature_encoder import FeatureEncoder
+from api.model_loader import export_compiled, load_compiled, load_model
+from api.scorers import TreeEnsembleScorer, build_scorer
+from api.tree_ensemble import TreeEnsemble
+from test.synthetic import build_model_data
+
+xgb = pytest.importorskip("xgboost")
+
+
+@pytest.fixture
+def xgb_model_data():
+    model = xgb.XGBClassifier(n_estimators=60, max_depth=5, learning_rate=0.2, random_state=0)
+    return build_model_data(MinMaxScaler(), model, n=2000)
+
+
+def test_compiled_trees_match_xgboost(xgb_model_data, payloads):
+    md = xgb_model_data
+    encoder = FeatureEncoder.from_model_data(md)
+    X = encoder.encode_many(payloads)
+
+    ensemble = TreeEnsemble.from_xgboost(md["model"])
+
+    expected = md["model"].predict_proba(X)[:, 1]
+    np.testing.assert_allclose(ensemble.predict_proba(X), expected, rtol=0, atol=1e-6)
+
+
+def test_missing_values_follow_default_branch(xgb_model_data, payloads):
+    md = xgb_model_data
+    X = FeatureEncoder.from_model_data(md).encode_many(payloads)
+    X[::3, 4] = np.nan
+
+    ensemble = TreeEnsemble.from_xgboost(md["model"])
+    np.testing.assert_allclose(ensemble.predict_proba(X), md["model"].predict_proba(X)[:, 1], rtol=0, atol=1e-6)
+
+
+def test_build_scorer_compiles_xgboost(xgb_model_data):
+    scorer = build_scorer(xgb_model_data, FeatureEncoder.from_model_data(xgb_model_data))
+    assert isinstance(scorer, TreeEnsembleScorer)
+
+
+def test_export_round_trip(xgb_model_data, payloads, tmp_path):
+    md = xgb_model_data
+    out = tmp_path / "model_data_v2.compiled.joblib"
+
+    err = export_compiled(md, out)
+    compiled = load_compiled(out)
+
+    assert err <= 1e-6
+    X = compiled["encoder"].encode_many(payloads)
+    np.testing.assert_allclose(
+        compiled["ensemble"].predict_proba(X), md["model"].predict_proba(X)[:, 1], rtol=0, atol=1e-6
+    )
+
+
+def test_compiled_artifact_can_be_memory_mapped(xgb_model_data, payloads, tmp_path):
+    md = xgb_model_data
+    raw = tmp_path / "model_data_v2.joblib"
+    export_compiled(md, tmp_path / "model_data_v2.compiled.joblib")
+
+    mapped = load_model(raw, "v2", mmap_mode="r")
+    copied = load_model(raw, "v2")
+
+    # arrays are read-only views of the file, not private copies
+    ensemble = mapped.scorer.ensemble
+    for arr in (ensemble.feature, ensemble.threshold, ensemble.children, ensemble.value):
+        assert isinstance(arr.base, np.memmap) or isinstance(arr, np.memmap)
+        assert not arr.flags.writeable
+    assert not isinstance(copied.scorer.ensemble.threshold, np.memmap)
+
+    np.testing.assert_array_equal(mapped.scorer.predict_proba(payloads), copied.scorer.predict_proba(payloads))
+
+
+def test_stale_compiled_twin_is_ignored(xgb_model_data, tmp_path, caplog):
+    raw = tmp_path / "model_data_v2.joblib"
+    joblib.dump(xgb_model_data, raw)
+    export_compiled(xgb_model_data, tmp_path / "model_data_v2.compiled.joblib", source=raw)
+    assert isinstance(load_model(raw, "v2").scorer, TreeEnsembleScorer)
+
+    # the artifact is replaced (retrained model) without recompiling
+    joblib.dump(build_model_data(MinMaxScaler(), LogisticRegression()), raw)
+    model = load_model(raw, "v2")
+    assert model.info["model_type"] == "LogisticRegression"
+    assert "not built from the current model_data_v2.joblib" in caplog.text
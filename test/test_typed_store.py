@@ -0,0 +1,153 @@
+import json
+import sqlite3
+
+import numpy as np
+import pytest
+
+from api import db_sqlite
+from api.db_sqlite import (
+    INPUT_COLUMNS,
+    fetch_drift_window,
+    fetch_prediction_inputs,
+    insert_predictions,
+    read_conn,
+)
+
+
+def _rows(payloads):
+    return [
+        {
+            "created_at": "2026-01-01T00:00:00+00:00",
+            "payload": p,
+            "default_probability": 0.3,
+            "credit_score": 720,
+            "rating": "Good",
+        }
+        for p in payloads
+    ]
+
+
+def test_inputs_come_back_typed(payloads):
+    insert_predictions(_rows(payloads))
+
+    df = fetch_prediction_inputs(limit=50)
+    assert list(df.columns) == list(INPUT_COLUMNS)
+    assert len(df) == 50
+
+    # newest first, values identical to the request
+    newest = payloads[-1]
+    for col, value in newest.items():
+        assert df.iloc[0][col] == value
+    assert df["age"].dtype.kind == "i"
+    assert df["income"].dtype.kind == "f"
+    assert df.iloc[0]["loan_to_income"] == pytest.approx(newest["loan_amount"] / newest["income"])
+
+    only = fetch_prediction_inputs(limit=5, columns=["age", "residence_type"])
+    assert list(only.columns) == ["age", "residence_type"]
+    with pytest.raises(ValueError):
+        fetch_prediction_inputs(columns=["input_json"])
+
+
+def test_aggregates_run_in_sql(payloads):
+    insert_predictions(_rows(payloads))
+    with read_conn() as conn:
+        avg_age, avg_lti = conn.execute("SELECT AVG(age), AVG(loan_to_income) FROM predictions").fetchone()
+
+    assert avg_age == pytest.approx(np.mean([p["age"] for p in payloads]))
+    lti = [p["loan_amount"] / p["income"] if p["income"] > 0 else 0.0 for p in payloads]
+    assert avg_lti == pytest.approx(np.mean(lti))
+
+
+def test_legacy_rows_are_backfilled(payloads, tmp_path, monkeypatch):
+    # database from before the typed columns: only the JSON blob
+    legacy = tmp_path / "legacy.db"
+    conn = sqlite3.connect(legacy)
+    conn.execute(
+        """
+        CREATE TABLE predictions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_at TEXT NOT NULL,
+            input_json TEXT NOT NULL,
+            default_probability REAL NOT NULL,
+            credit_score INTEGER NOT NULL,
+            rating TEXT NOT NULL
+        )
+        """
+    )
+    conn.executemany(
+        "INSERT INTO predictions (created_at, input_json, default_probability, credit_score, rating) "
+        "VALUES (?, ?, 0.3, 720, 'Good')",
+        [("2026-01-01T00:00:00+00:00", json.dumps(p)) for p in payloads],
+    )
+    conn.commit()
+    conn.close()
+
+    db_sqlite.close_connections()
+    monkeypatch.setattr(db_sqlite, "DB_PATH", legacy)
+    db_sqlite.init_db()
+
+    df = fetch_prediction_inputs(limit=len(payloads))
+    assert not df.isna().any().any()
+    assert df.iloc[-1]["num_open_accounts"] == payloads[0]["num_open_accounts"]
+    assert df.iloc[-1]["loan_type"] == payloads[0]["loan_type"]
+
+    # the drift accumulator is rebuilt from the backfilled columns
+    stats = fetch_drift_window(last_n=len(payloads))
+    assert stats["count"] == len(payloads)
+    assert stats["mean"]["age"] == pytest.approx(np.mean([p["age"] for p in payloads]))
+
+
+def _legacy_db(path, input_jsons):
+    # database from before the typed columns, with the given input_json values
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE predictions (id INTEGER PRIMARY KEY AUTOINCREMENT, created_at TEXT NOT NULL, "
+        "input_json TEXT NOT NULL, default_probability REAL NOT NULL, credit_score INTEGER NOT NULL, "
+        "rating TEXT NOT NULL)"
+    )
+    conn.executemany(
+        "INSERT INTO predictions (created_at, input_json, default_probability, credit_score, rating) "
+        "VALUES ('2026-01-01T00:00:00+00:00', ?, 0.3, 720, 'Good')",
+        [(r,) for r in input_jsons],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_backfill_skips_malformed_json_and_runs_once(payloads, tmp_path, monkeypatch):
+    rows = [json.dumps(p) for p in payloads[:5]]
+    rows.insert(2, "{not json")
+
+    db_sqlite.close_connections()
+    monkeypatch.setattr(db_sqlite, "DB_PATH", _legacy_db(tmp_path / "legacy.db", rows))
+    db_sqlite.init_db()
+
+    with read_conn() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == db_sqlite.SCHEMA_VERSION
+        ages = [r[0] for r in conn.execute("SELECT age FROM predictions ORDER BY id")]
+    assert ages == [p["age"] for p in payloads[:2]] + [None] + [p["age"] for p in payloads[2:5]]
+
+    # migrated: later startups don't scan for rows to backfill
+    def fail(*args, **kwargs):
+        raise AssertionError("backfill ran again")
+
+    monkeypatch.setattr(db_sqlite, "backfill_input_columns", fail)
+    db_sqlite.init_db()
+
+
+def test_incomplete_legacy_rows_stay_out_of_drift_stats(payloads, tmp_path, monkeypatch):
+    missing = {k: v for k, v in payloads[1].items() if k != "loan_type"}
+    unknown = {**payloads[2], "residence_type": "Boat"}
+    rows = [json.dumps(payloads[0]), json.dumps(missing), json.dumps(unknown), json.dumps(payloads[3])]
+
+    db_sqlite.close_connections()
+    monkeypatch.setattr(db_sqlite, "DB_PATH", _legacy_db(tmp_path / "legacy.db", rows))
+    db_sqlite.init_db()  # used to fail with KeyError: 'loan_type_None'
+
+    with read_conn() as conn:
+        lti = [r[0] for r in conn.execute("SELECT loan_to_income FROM predictions ORDER BY id")]
+    assert [v is None for v in lti] == [False, True, True, False]
+    stats = fetch_drift_window(last_n=4)
+    assert stats["count"] == 2
+    assert stats["mean"]["age"] == pytest.approx((payloads[0]["age"] + payloads[3]["age"]) / 2)